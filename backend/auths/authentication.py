@@ -0,0 +1,75 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .token_cache import lookup_token_user, lookup_user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that loads the token's user through the token caches."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from None
+
+        user = lookup_user(user_id)
+        if user is None:
+            raise exceptions.AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        # The password hash is not cached, so this check loads it from the database
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                message = _("The user's password has been changed.")
+                raise exceptions.AuthenticationFailed(message, code="password_changed")
+
+        return user
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    DRF token and JWT authentication behind one scheme check.
+
+    The ``Authorization`` header's scheme picks the authenticator up front, so
+    a JWT no longer costs a failed token lookup first. Token -> user and
+    user id -> user are served from ``auths.token_cache``; other schemes are
+    left to the next authentication class.
+    """
+
+    jwt_authentication_class = CachedJWTAuthentication
+
+    def __init__(self):
+        self.jwt_authentication = self.jwt_authentication_class()
+        self.jwt_keywords = {keyword.lower().encode() for keyword in api_settings.AUTH_HEADER_TYPES}
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth:
+            return None
+
+        scheme = auth[0].lower()
+        if scheme == self.keyword.lower().encode():
+            return super().authenticate(request)
+        if scheme in self.jwt_keywords:
+            return self.jwt_authentication.authenticate(request)
+        return None
+
+    def authenticate_credentials(self, key):
+        user = lookup_token_user(key)
+        if user is None:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        # request.auth stays a Token, without loading the row again
+        return (user, Token(key=key, user=user))
@@ -1,37 +1,64 @@
 import logging
+from typing import Optional
 from urllib.parse import parse_qs
 
-import jwt
-from channels.db import database_sync_to_async
+from asgiref.sync import sync_to_async
 from channels.middleware import BaseMiddleware
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
-from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .token_cache import get_token_cache, lookup_token_user, lookup_user, user_key
 
 logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
 
-@database_sync_to_async
-def get_user(token_key: str) -> User:
-    # Try JWT token first
+async def user_from_jwt(token_key: str) -> Optional[User]:
+    """
+    Verify a JWT access token locally and return its user if they still exist and are active.
+
+    The user comes from the token caches, which drop it when it is saved or
+    deleted, so only the first socket of a user costs a query. Fields that are
+    not cached are deferred and fetched (``await user.arefresh_from_db()``)
+    only by code that needs them.
+    """
     try:
-        payload = jwt.decode(token_key, settings.SECRET_KEY, algorithms=[settings.SIMPLE_JWT["ALGORITHM"]])
+        token = AccessToken(token_key)
+    except TokenError:
+        return None
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return None
+    # Checked here first so a cached user needs no thread hop
+    user = get_token_cache().get(user_key(user_id))
+    if user is None:
+        user = await sync_to_async(lookup_user)(user_id)
+    return user if user is not None and user.is_active else None
+
 
-        user_id = payload.get("user_id")
-        if user_id:
-            return User.objects.get(id=user_id)
-    except (jwt.InvalidTokenError, User.DoesNotExist):
-        pass
+async def user_from_token(token_key: str) -> Optional[User]:
+    """Look up a DRF token, served from the token caches while they are fresh."""
+    # Checked here first so a cached token needs no thread hop
+    user = get_token_cache().get(token_key)
+    if user is None:
+        user = await sync_to_async(lookup_token_user)(token_key)
+    return user if user is not None and user.is_active else None
+
+
+async def get_user(token_key: str) -> User:
+    # Try JWT token first
+    user = await user_from_jwt(token_key)
+    if user is not None:
+        return user
 
     # Fallback to Token authentication
-    try:
-        token = Token.objects.get(key=token_key)
-        return token.user
-    except Token.DoesNotExist:
-        pass
+    user = await user_from_token(token_key)
+    if user is not None:
+        return user
 
     return AnonymousUser()
 
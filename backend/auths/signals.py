@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .token_cache import get_shared_token_cache, get_token_cache
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance: Token, **kwargs):
+    get_token_cache().invalidate(instance.key)
+    shared = get_shared_token_cache()
+    if shared is not None:
+        shared.invalidate(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance: User, created: bool = False, **kwargs):
+    # e.g. deactivated or a new password; cached copies must not outlive the change
+    if not created:
+        get_token_cache().invalidate_user(instance.pk)
+        shared = get_shared_token_cache()
+        if shared is not None:
+            shared.invalidate_user(instance.pk)
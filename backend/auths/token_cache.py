@@ -0,0 +1,229 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import router
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+User = get_user_model()
+
+# Fields of a cached user. The rest, the password hash included, are never cached;
+# they stay deferred and are loaded from the database only by code that reads them.
+CACHED_USER_FIELDS = ("id", "email", "first_name", "last_name", "is_active", "is_staff", "is_superuser")
+
+UserFields = Tuple
+
+
+def cached_attnames() -> List[str]:
+    """Attribute names of ``CACHED_USER_FIELDS`` in model order, as ``Model.from_db`` expects them."""
+    return [field.attname for field in User._meta.concrete_fields if field.name in CACHED_USER_FIELDS]
+
+
+def user_fields(user: User) -> UserFields:
+    """The values of ``CACHED_USER_FIELDS``, as stored in the caches."""
+    return tuple(getattr(user, attname) for attname in cached_attnames())
+
+
+def build_user(fields: UserFields) -> User:
+    """A new user with the cached fields set and every other field deferred."""
+    return User.from_db(router.db_for_read(User), cached_attnames(), list(fields))
+
+
+def user_key(user_id: Hashable) -> str:
+    """Cache key of a user looked up by primary key, e.g. for a JWT."""
+    return f"user:{user_id}"
+
+
+class TokenUserCache:
+    """
+    In-process LRU cache of token key -> user, with a TTL on every entry.
+
+    Users looked up by primary key are kept under ``user_key(pk)``. Only the
+    ``CACHED_USER_FIELDS`` values are stored and every ``get`` builds a new
+    user from them, so concurrent requests never share one instance.
+
+    Entries are dropped when the token is deleted or its user changes (see
+    ``auths.signals``). Those signals only reach this process, so the TTL
+    bounds how long another process may keep serving a revoked token.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_size = max_size if max_size is not None else settings.AUTH_TOKEN_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else settings.AUTH_TOKEN_CACHE_TTL
+        self._entries: "OrderedDict[str, Tuple[float, Hashable, UserFields]]" = OrderedDict()
+        self._keys_by_user: Dict[Hashable, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, _, fields = entry
+            if expires <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return build_user(fields)
+
+    def set(self, key: str, user: User) -> None:
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        fields = user_fields(user)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, user.pk, fields)
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_user(self, user_id: Hashable) -> None:
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[1]
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+class SharedTokenUserCache:
+    """
+    Token -> user in a Django cache shared by every process.
+
+    Tokens map to the user's primary key and users are stored once under
+    their own key, so deleting a token or saving a user is one cache delete
+    that every process sees at once. Users are stored as their
+    ``CACHED_USER_FIELDS`` values, never with the password hash.
+    """
+
+    def __init__(self, alias: str, ttl: float):
+        self.cache = caches[alias]
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[User]:
+        user_id = self.cache.get(f"auth:token:{key}")
+        if user_id is None:
+            return None
+        return self.get_user(user_id)
+
+    def get_user(self, user_id: Hashable) -> Optional[User]:
+        fields = self.cache.get(f"auth:user:{user_id}")
+        return build_user(fields) if fields is not None else None
+
+    def set(self, key: str, user: User) -> None:
+        self.cache.set_many({f"auth:token:{key}": user.pk, f"auth:user:{user.pk}": user_fields(user)}, self.ttl)
+
+    def set_user(self, user: User) -> None:
+        self.cache.set(f"auth:user:{user.pk}", user_fields(user), self.ttl)
+
+    def invalidate(self, key: str) -> None:
+        self.cache.delete(f"auth:token:{key}")
+
+    def invalidate_user(self, user_id: Hashable) -> None:
+        self.cache.delete(f"auth:user:{user_id}")
+
+
+_token_cache: Optional[TokenUserCache] = None
+_token_cache_lock = threading.Lock()
+
+
+_shared_token_cache: Optional[SharedTokenUserCache] = None
+
+
+def get_token_cache() -> TokenUserCache:
+    """Return the process-wide token cache configured from settings."""
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                _token_cache = TokenUserCache()
+    return _token_cache
+
+
+def get_shared_token_cache() -> Optional[SharedTokenUserCache]:
+    """Return the shared tier, or None when ``AUTH_TOKEN_SHARED_CACHE`` is not set."""
+    global _shared_token_cache
+    if _shared_token_cache is None and settings.AUTH_TOKEN_SHARED_CACHE:
+        _shared_token_cache = SharedTokenUserCache(
+            settings.AUTH_TOKEN_SHARED_CACHE, settings.AUTH_TOKEN_SHARED_CACHE_TTL
+        )
+    return _shared_token_cache
+
+
+def lookup_token_user(key: str) -> Optional[User]:
+    """Resolve a DRF token key to its user: this process's cache, then the shared cache, then the database."""
+    local = get_token_cache()
+    user = local.get(key)
+    if user is not None:
+        return user
+
+    shared = get_shared_token_cache()
+    user = shared.get(key) if shared is not None else None
+    if user is None:
+        token = Token.objects.select_related("user").filter(key=key).first()
+        if token is None:
+            return None
+        user = token.user
+        if shared is not None:
+            shared.set(key, user)
+    local.set(key, user)
+    return user
+
+
+def lookup_user(user_id: Hashable) -> Optional[User]:
+    """Resolve a user by primary key through the same tiers."""
+    local = get_token_cache()
+    user = local.get(user_key(user_id))
+    if user is not None:
+        return user
+
+    shared = get_shared_token_cache()
+    user = shared.get_user(user_id) if shared is not None else None
+    if user is None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+        if shared is not None:
+            shared.set_user(user)
+    local.set(user_key(user_id), user)
+    return user
+
+
+@receiver(setting_changed)
+def reset_token_cache(setting, **kwargs):
+    global _token_cache, _shared_token_cache
+    if setting in ("AUTH_TOKEN_CACHE_SIZE", "AUTH_TOKEN_CACHE_TTL"):
+        _token_cache = None
+    if setting in ("AUTH_TOKEN_SHARED_CACHE", "AUTH_TOKEN_SHARED_CACHE_TTL"):
+        _shared_token_cache = None
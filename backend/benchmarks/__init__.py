@@ -0,0 +1,12 @@
+# Benchmark suites run by `manage.py run_benchmarks`: module, then the keyword
+# arguments of its run() for a full run and for a quick (--quick) run.
+SUITES = {
+    "stream_parser": ("benchmarks.stream_parser", {}, {"pairs": 50, "repeat": 1}),
+    "rest_api": ("benchmarks.rest_api", {}, {"requests": 20, "faqs": 20}),
+    "job_api": ("benchmarks.job_api", {}, {"requests": 8, "llm_latency": 0.05}),
+    "websocket": ("benchmarks.websocket", {}, {"sockets": 4, "tokens_per_second": 2000, "ttft": 0.01}),
+    "idle_sockets": ("benchmarks.idle_sockets", {}, {"sockets": 200, "hold": 0.2}),
+    "ws_auth": ("benchmarks.ws_auth", {}, {"handshakes": 50, "concurrency": 10}),
+    "statistics": ("benchmarks.statistics_selector", {}, {"sizes": (100, 1000)}),
+    "documents": ("benchmarks.documents", {}, {"pages": (1, 10), "questions": (10,), "paragraphs": 50, "repeat": 1}),
+}
@@ -0,0 +1,79 @@
+"""
+Document handling: generate_faq_pdf, extract_text on 1/10/50-page PDFs, and
+scrape_and_summarize against a local HTML fixture server.
+
+Usage:
+    python -m benchmarks.documents [--pages 1,10,50] [--questions 10,50] [--paragraphs 200] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+from io import BytesIO
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from auths.models import User  # noqa: E402
+from benchmarks.utils import benchmark_database, build_pdf, measure_once, serve_html  # noqa: E402
+from faq.exceptions import ScrapeException  # noqa: E402
+from faq.models import FAQ, QuestionAnswer  # noqa: E402
+from faq.services import extract_text, generate_faq_pdf, scrape_and_summarize  # noqa: E402
+
+
+def fixture_html(paragraphs: int) -> str:
+    body = "".join(
+        f"<p>Paragraph {i} explains how SmartFAQ turns long documents into short questions and answers. "
+        f"It also covers topic {i % 17} in some detail so the summarizer has something to rank.</p>"
+        for i in range(paragraphs)
+    )
+    return f"<html><head><title>Fixture</title></head><body>{body}</body></html>"
+
+
+def run(pages=(1, 10, 50), questions=(10, 50), paragraphs: int = 200, repeat: int = 3) -> dict:
+    user = User.objects.create_user(email="bench-documents@example.com", password="bench")
+
+    pdf_generation = {}
+    for count in questions:
+        faq = FAQ.objects.create(user=user, title=f"FAQ with {count} questions", content="Benchmark content")
+        FAQ.objects.add_question_answers(
+            faq, [QuestionAnswer(question=f"Question {i}?", answer="An answer. " * 10) for i in range(count)]
+        )
+        pdf_generation[str(count)] = measure_once(lambda faq=faq: generate_faq_pdf(faq), repeat)
+
+    text_extraction = {}
+    for count in pages:
+        document = build_pdf(count)
+        text_extraction[str(count)] = {
+            "bytes": len(document),
+            **measure_once(lambda document=document: extract_text(BytesIO(document)), repeat),
+        }
+
+    scraping = {"paragraphs": paragraphs}
+    with serve_html(fixture_html(paragraphs)) as url:
+        try:
+            scraping.update(measure_once(lambda: scrape_and_summarize(url), repeat))
+        except ScrapeException as e:
+            # Typically missing NLTK data; keep the PDF results
+            scraping["error"] = str(e.__cause__ or e)
+
+    return {"pdf_generation": pdf_generation, "text_extraction": text_extraction, "scraping": scraping}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", default="1,10,50", help="Comma separated page counts")
+    parser.add_argument("--questions", default="10,50", help="Comma separated question counts")
+    parser.add_argument("--paragraphs", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    with benchmark_database():
+        result = run(
+            [int(count) for count in args.pages.split(",")],
+            [int(count) for count in args.questions.split(",")],
+            args.paragraphs,
+            args.repeat,
+        )
+        print(json.dumps(result, indent=2))
@@ -0,0 +1,134 @@
+"""
+Memory and event loop cost of N idle WebSockets.
+
+Opens N authenticated sockets with idle closing and heartbeats enabled, then
+holds them without traffic. Python allocations are traced while the sockets
+are opened, so ``memory_per_socket_kb`` is what one idle connection keeps
+alive (consumer, channel layer membership, ASGI queues and its idle manager
+entry). ``tasks_per_socket`` counts the asyncio tasks each one adds; the idle
+manager runs a single timer task however many sockets are open. While holding,
+the event loop's wake-up lag and the cost of recording a frame are measured.
+
+Connecting slows down as sockets accumulate because the in-memory channel
+layer sweeps every channel on each receive; a shared layer such as Redis does
+not, so ``connect_per_socket_ms`` only compares runs with the same layer.
+
+Usage:
+    python -m benchmarks.idle_sockets [--sockets 10000] [--hold 3]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from channels.routing import URLRouter  # noqa: E402
+from channels.testing import WebsocketCommunicator  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from auths.models import User  # noqa: E402
+from benchmarks.utils import benchmark_database, summarize  # noqa: E402
+from faq.helpers.idle_manager import get_idle_manager  # noqa: E402
+from faq.helpers.routing import websocket_urlpatterns  # noqa: E402
+
+
+async def measure_loop_lag(duration: float, interval: float = 0.01) -> list:
+    lags = []
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+    return lags
+
+
+def run(sockets: int = 10_000, hold: float = 3.0) -> dict:
+    user = User.objects.create_user(email="bench-idle@example.com", password="bench")
+    router = URLRouter(websocket_urlpatterns)
+
+    async def application(scope, receive, send):
+        # Stands in for TokenAuthMiddleware
+        return await router(dict(scope, user=user), receive, send)
+
+    async def open_socket():
+        communicator = WebsocketCommunicator(application, "/ws/faq/")
+        connected, _ = await communicator.connect()
+        assert connected, "WebSocket connection was refused"
+        return communicator
+
+    async def hold_sockets():
+        # Warm up imports and caches so they are not counted against the sockets
+        await (await open_socket()).disconnect()
+
+        gc.collect()
+        tasks_before = len(asyncio.all_tasks())
+        tracemalloc.start()
+        memory_before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        communicators = [await open_socket() for _ in range(sockets)]
+        connect_wall = time.perf_counter() - start
+        gc.collect()
+        memory_after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        tasks = len(asyncio.all_tasks()) - tasks_before
+
+        manager = get_idle_manager()
+        consumers = list(manager._entries.values())
+        start = time.perf_counter()
+        for entry in consumers:
+            manager.activity(entry.connection)
+        activity_ns = (time.perf_counter() - start) / max(len(consumers), 1) * 1e9
+
+        lags = await measure_loop_lag(hold)
+        tracked = len(manager)
+
+        start = time.perf_counter()
+        for communicator in communicators:
+            await communicator.disconnect()
+        disconnect_wall = time.perf_counter() - start
+
+        return {
+            "memory": memory_after - memory_before,
+            "tasks": tasks,
+            "tracked": tracked,
+            "activity_ns": activity_ns,
+            "lags": lags,
+            "connect_wall": connect_wall,
+            "disconnect_wall": disconnect_wall,
+        }
+
+    # Long enough that nothing is closed or pinged while holding
+    with override_settings(
+        INACTIVITY_TIME_ENABLED=True, INACTIVITY_TIME=600, FAQ_WS_HEARTBEAT_INTERVAL=300, FAQ_WS_RESUME_GRACE=0
+    ):
+        result = asyncio.run(hold_sockets())
+
+    return {
+        "sockets": sockets,
+        "hold_s": hold,
+        "memory_per_socket_kb": round(result["memory"] / sockets / 1024, 2),
+        "tasks_per_socket": round(result["tasks"] / sockets, 3),
+        "idle_manager_sockets": result["tracked"],
+        "activity_ns": round(result["activity_ns"], 1),
+        "connect_per_socket_ms": round(result["connect_wall"] / sockets * 1000, 3),
+        "disconnect_per_socket_ms": round(result["disconnect_wall"] / sockets * 1000, 3),
+        "loop_lag": summarize(result["lags"]),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sockets", type=int, default=10_000)
+    parser.add_argument("--hold", type=float, default=3.0, help="Seconds to hold the sockets open")
+    args = parser.parse_args()
+    with benchmark_database():
+        result = run(args.sockets, args.hold)
+        print(json.dumps(result, indent=2))
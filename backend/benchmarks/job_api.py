@@ -0,0 +1,79 @@
+"""
+Throughput of POST /api/v1/faq/ in synchronous mode vs. job mode (?mode=async).
+
+A fixed pool of request threads stands in for the WSGI/ASGI worker threads and
+the LLM is stubbed with a constant latency, so the numbers show how long
+workers are held, not model speed.
+
+Usage:
+    python -m benchmarks.job_api [--requests 40] [--workers 4] [--llm-latency 0.25]
+"""
+
+import argparse
+import json
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from auths.models import User  # noqa: E402
+from benchmarks.utils import benchmark_database, measure_concurrently, stub_llm  # noqa: E402
+from faq.models import GenerationJob  # noqa: E402
+
+
+def post_all(user, num_requests: int, workers: int, query: str = "") -> dict:
+    url = reverse("faq-list") + query
+
+    def post(index: int) -> None:
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.post(url, {"content": f"Benchmark content {index}", "number_of_faqs": 3}, format="json")
+        assert response.status_code in (201, 202), response.data
+
+    return measure_concurrently(post, num_requests, workers)
+
+
+def run(requests: int = 40, workers: int = 4, llm_latency: float = 0.25) -> dict:
+    # Identical payloads in both modes must not be served from the generation cache, and one
+    # user making every request must not be rate limited
+    with stub_llm(llm_latency), override_settings(FAQ_GENERATION_CACHE_ENABLED=False, FAQ_ADMISSION_USER_RATE=0):
+        user = User.objects.create_user(email="bench-jobs@example.com", password="bench")
+
+        sync_result = post_all(user, requests, workers)
+        async_result = post_all(user, requests, workers, query="?mode=async")
+
+        start = time.perf_counter()
+        call_command("faq_worker", "--once", "--concurrency", str(workers), stdout=open(os.devnull, "w"))
+        drain = time.perf_counter() - start
+        succeeded = GenerationJob.objects.filter(status=GenerationJob.SUCCEEDED).count()
+
+    async_result["worker"] = {
+        "jobs_succeeded": succeeded,
+        "wall_s": round(drain, 3),
+        "jobs_per_s": round(succeeded / drain, 2),
+    }
+    return {
+        "requests": requests,
+        "request_workers": workers,
+        "llm_latency_s": llm_latency,
+        "sync": sync_result,
+        "async": async_result,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.25)
+    args = parser.parse_args()
+    with benchmark_database():
+        print(json.dumps(run(args.requests, args.workers, args.llm_latency), indent=2))
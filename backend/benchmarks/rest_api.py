@@ -0,0 +1,131 @@
+"""
+Throughput and latency of the FAQ REST endpoints: create, list and detail.
+
+Creation runs against the FakeBackend with no model latency, so the numbers
+are the API's own overhead (validation, generation plumbing, persistence).
+``list_bytes`` is the size of a list page, plain and with
+``?expand=generated_faqs``. ``queries`` is the SQL per create, list and detail
+request, and ``list_queries`` the SQL per list request with each way of
+authenticating; the gap to ``force_authenticated`` is what authentication costs.
+
+Usage:
+    python -m benchmarks.rest_api [--requests 200] [--workers 4] [--faqs 100] [--content-size 20000]
+"""
+
+import argparse
+import json
+import os
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from auths.models import User  # noqa: E402
+from benchmarks.utils import benchmark_database, measure_concurrently, stub_llm  # noqa: E402
+from faq.models import FAQ, QuestionAnswer  # noqa: E402
+
+
+def seed_faqs(user, count: int, questions: int = 5, content_size: int = 0) -> list:
+    faqs = FAQ.objects.bulk_create(
+        FAQ(
+            user=user,
+            title=f"FAQ {i}",
+            content=f"Benchmark content {i}. ".ljust(content_size, "x"),
+            number_of_faqs=questions,
+        )
+        for i in range(count)
+    )
+    FAQ.objects.bulk_add_question_answers(
+        (faq, [QuestionAnswer(question=f"Question {j}?", answer=f"Answer {j}.") for j in range(questions)])
+        for faq in faqs
+    )
+    return faqs
+
+
+def queries_per_request(func, count: int) -> float:
+    with CaptureQueriesContext(connection) as queries:
+        for index in range(count):
+            func(index)
+    return round(len(queries) / count, 2)
+
+
+def run(requests: int = 200, workers: int = 4, faqs: int = 100, content_size: int = 20_000) -> dict:
+    user = User.objects.create_user(email="bench-rest@example.com", password="bench")
+    # Sources are whole documents; 20k characters is a few PDF pages
+    seeded = seed_faqs(user, faqs, content_size=content_size)
+
+    def client() -> APIClient:
+        api_client = APIClient()
+        api_client.force_authenticate(user=user)
+        return api_client
+
+    def create(index: int) -> None:
+        payload = {"content": f"Benchmark document {index}", "number_of_faqs": 5}
+        response = client().post(reverse("faq-list"), payload, format="json")
+        assert response.status_code == 201, response.data
+
+    def list_faqs(index: int, api_client: APIClient = None) -> None:
+        api_client = api_client or client()
+        response = api_client.get(reverse("faq-list"), {"page": index % max(faqs // 10, 1) + 1})
+        assert response.status_code == 200, response.data
+
+    def list_with(authorization: str):
+        def list_authenticated(index: int) -> None:
+            api_client = APIClient()
+            api_client.credentials(HTTP_AUTHORIZATION=authorization)
+            list_faqs(index, api_client)
+
+        return list_authenticated
+
+    def list_bytes(**params) -> int:
+        return len(client().get(reverse("faq-list"), params).content)
+
+    def detail(index: int) -> None:
+        response = client().get(reverse("faq-detail", kwargs={"pk": seeded[index % len(seeded)].id}))
+        assert response.status_code == 200, response.data
+
+    # Lists and details first, while the pages hold the seeded FAQs
+    result = {
+        "requests": requests,
+        "workers": workers,
+        "seeded_faqs": faqs,
+        "content_size": content_size,
+        "list": measure_concurrently(list_faqs, requests, workers),
+        "detail": measure_concurrently(detail, requests, workers),
+        "list_bytes": {"default": list_bytes(), "expand": list_bytes(expand="generated_faqs")},
+        "queries": {
+            "list": queries_per_request(list_faqs, requests),
+            "detail": queries_per_request(detail, requests),
+        },
+        "list_queries": {
+            "force_authenticated": queries_per_request(list_faqs, requests),
+            "jwt": queries_per_request(list_with(f"Bearer {AccessToken.for_user(user)}"), requests),
+            "token": queries_per_request(list_with(f"Token {Token.objects.create(user=user).key}"), requests),
+        },
+    }
+
+    # One user makes every request; do not rate limit it
+    with stub_llm(), override_settings(FAQ_GENERATION_CACHE_ENABLED=False, FAQ_ADMISSION_USER_RATE=0):
+        result["create"] = measure_concurrently(create, requests, workers)
+        result["queries"]["create"] = queries_per_request(create, min(requests, 20))
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--faqs", type=int, default=100)
+    parser.add_argument("--content-size", type=int, default=20_000)
+    args = parser.parse_args()
+    with benchmark_database():
+        print(json.dumps(run(args.requests, args.workers, args.faqs, args.content_size), indent=2))
@@ -0,0 +1,102 @@
+"""
+StatisticsSelector.get_statistics on one user's FAQs at increasing sizes.
+
+Reports the queries one uncached get_statistics call makes and its latency;
+the query count should not grow with the number of FAQs. ``rollup`` is
+get_user_statistics, which the dashboard calls, reading the daily rollups with
+the statistics cache cleared, and ``cached`` the same call once cached.
+
+Usage:
+    python -m benchmarks.statistics_selector [--sizes 1000,10000,100000] [--questions 3] [--repeat 1]
+"""
+
+import argparse
+import json
+import os
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from auths.models import User  # noqa: E402
+from benchmarks.utils import benchmark_database, measure_once  # noqa: E402
+from faq.models import FAQ, FAQDailyRollup, QuestionAnswer  # noqa: E402
+from faq.selectors.statistics_selector import StatisticsSelector  # noqa: E402
+
+BATCH_SIZE = 5000
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def seed(user, count: int, questions: int) -> None:
+    tones = ["neutral", "formal", "casual"]
+    for start in range(0, count, BATCH_SIZE):
+        faqs = FAQ.objects.bulk_create(
+            FAQ(user=user, title=f"FAQ {i}", content="Benchmark content", tone=tones[i % 3])
+            for i in range(start, min(start + BATCH_SIZE, count))
+        )
+        FAQ.objects.bulk_add_question_answers(
+            (faq, [QuestionAnswer(question=f"Question {j}?", answer="Answer.") for j in range(questions)])
+            for faq in faqs
+        )
+
+
+def run(sizes=(1000, 10_000, 100_000), questions: int = 3, repeat: int = 1) -> dict:
+    results = {}
+    for size in sizes:
+        user = User.objects.create_user(email=f"bench-stats-{size}@example.com", password="bench")
+        seed(user, size, questions)
+        # bulk_create sends no signals, so the FAQs are missing from the rollups
+        FAQDailyRollup.objects.rebuild([user.id])
+        queryset = FAQ.objects.filter(user=user).order_by("-created_at")
+
+        def get_statistics(queryset=queryset):
+            return StatisticsSelector.get_statistics(queryset)
+
+        def get_rollup_statistics(user=user):
+            cache.clear()
+            return StatisticsSelector.get_user_statistics(user)
+
+        def get_cached_statistics(user=user):
+            return StatisticsSelector.get_user_statistics(user)
+
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            stats = get_statistics()
+        assert stats["total_faqs"] == size
+        assert stats["total_questions"] == size * questions
+
+        rollup_counter = QueryCounter()
+        with connection.execute_wrapper(rollup_counter):
+            rollup_stats = get_rollup_statistics()
+        assert (rollup_stats["total_faqs"], rollup_stats["total_questions"]) == (size, size * questions)
+
+        results[str(size)] = {
+            "queries": counter.count,
+            **measure_once(get_statistics, repeat),
+            "rollup": {"queries": rollup_counter.count, **measure_once(get_rollup_statistics, max(repeat, 10))},
+            "cached": measure_once(get_cached_statistics, max(repeat, 100)),
+        }
+    return {"questions_per_faq": questions, "sizes": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma separated FAQ counts")
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    with benchmark_database():
+        print(json.dumps(run(sizes, args.questions, args.repeat), indent=2))
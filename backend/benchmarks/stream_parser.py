@@ -0,0 +1,82 @@
+"""
+Micro-benchmark: incremental FAQStreamParser vs. the previous regex-over-buffer loop.
+
+Usage:
+    python -m benchmarks.stream_parser [--pairs 200] [--token-size 4]
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from faq.helpers.stream_parser import FAQStreamParser  # noqa: E402
+
+REGEX_PATTERN = r'\{\s*"question"\s*:\s*"(.*?)",\s*"answer"\s*:\s*"(.*?)"\s*\}'
+
+
+def build_tokens(num_pairs: int, token_size: int, escaped: bool = False) -> list:
+    """Render a FAQSchema document and split it into model-sized tokens."""
+    answer = "This answer explains the feature in a few sentences. " * 6
+    if escaped:
+        answer += 'It mentions a "quoted" term\nand a second line.'
+    pairs = [{"question": f"Question number {i}?", "answer": answer} for i in range(num_pairs)]
+    text = json.dumps({"generated_faqs": pairs})
+    return [text[i : i + token_size] for i in range(0, len(text), token_size)]
+
+
+def run_regex(tokens: list) -> int:
+    """The loop previously used by generate_faqs_stream."""
+    buffer = ""
+    found = 0
+    for token in tokens:
+        buffer += token
+        match = re.search(REGEX_PATTERN, buffer)
+        if match:
+            found += 1
+            buffer = ""
+    return found
+
+
+def run_parser(tokens: list) -> int:
+    parser = FAQStreamParser()
+    return sum(len(parser.feed(token)) for token in tokens)
+
+
+def measure(func, tokens: list, repeat: int) -> dict:
+    best = float("inf")
+    found = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = func(tokens)
+        best = min(best, time.perf_counter() - start)
+    return {"seconds": round(best, 6), "pairs_found": found}
+
+
+def run(pairs: int = 200, token_size: int = 4, repeat: int = 3) -> dict:
+    results = {}
+    for escaped in (False, True):
+        tokens = build_tokens(pairs, token_size, escaped)
+        label = "escaped" if escaped else "plain"
+        results[label] = {
+            "pairs": pairs,
+            "tokens": len(tokens),
+            "regex": measure(run_regex, tokens, repeat),
+            "parser": measure(run_parser, tokens, repeat),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--token-size", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.pairs, args.token_size, args.repeat), indent=2))
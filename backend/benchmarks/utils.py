@@ -0,0 +1,138 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List
+
+
+@contextmanager
+def benchmark_database():
+    """Run the enclosed block against a freshly created, throwaway test database."""
+    from django.test.utils import setup_databases, teardown_databases
+
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+@contextmanager
+def stub_llm(latency: float = 0.0, **options):
+    """Generate with the deterministic FakeBackend, answering after ``latency`` seconds."""
+    from django.test import override_settings
+
+    backend = {
+        "BACKEND": "faq.helpers.llm_backends.FakeBackend",
+        "OPTIONS": {"time_to_first_token": latency, **options},
+    }
+    with override_settings(LLM_BACKEND=backend):
+        yield
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def measure_concurrently(func: Callable[[int], None], count: int, workers: int) -> dict:
+    """Call ``func(index)`` ``count`` times from ``workers`` threads; report throughput and latency."""
+    from django.db import connection
+
+    def timed(index: int) -> float:
+        start = time.perf_counter()
+        try:
+            func(index)
+        finally:
+            connection.close()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        latencies = list(executor.map(timed, range(count)))
+    wall = time.perf_counter() - start
+
+    return {"wall_s": round(wall, 3), "requests_per_s": round(count / wall, 2), "latency": summarize(latencies)}
+
+
+def measure_once(func: Callable[[], object], repeat: int = 1) -> dict:
+    """Best and mean wall time of ``repeat`` sequential calls, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "best_ms": round(min(samples) * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+    }
+
+
+def build_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """Build a text PDF with ``pages`` pages, without depending on a PDF writer."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        lines = [
+            f"({f'Page {page + 1} line {line + 1}: SmartFAQ turns documents into questions and answers.'}) Tj T*"
+            for line in range(lines_per_page)
+        ]
+        stream = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {content_id} 0 R "
+            "/Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode("latin-1")
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(output)
+
+
+@contextmanager
+def serve_html(html: str) -> Iterator[str]:
+    """Serve ``html`` from a local HTTP server and yield its URL."""
+    body = html.encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,136 @@
+"""
+WebSocket generation latency with N concurrent sockets.
+
+Each socket asks for its own document, so neither the generation cache nor
+request coalescing kicks in. The FakeBackend streams tokens at a fixed rate,
+which leaves consumer, scheduler and persistence overhead as the variable.
+Sockets beyond LLM_MAX_IN_FLIGHT wait in the scheduler queue, as in production.
+
+Question/answers are persisted and sent one at a time, so ``qa_interval`` (the
+gap between consecutive question/answers on a socket) is the model's emit
+interval plus the per-QA send latency; its tail is where sockets queueing on
+the database show up. ``--compact`` negotiates the compact protocol, which
+batches question/answers and leaves the FAQ out of the completion frame;
+compare ``bytes_per_socket``.
+
+Usage:
+    python -m benchmarks.websocket [--sockets 20] [--questions 5] [--tokens-per-second 200] [--ttft 0.05] [--compact]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from asgiref.sync import sync_to_async  # noqa: E402
+from channels.routing import URLRouter  # noqa: E402
+from channels.testing import WebsocketCommunicator  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from auths.models import User  # noqa: E402
+from benchmarks.utils import benchmark_database, stub_llm, summarize  # noqa: E402
+from faq.helpers.consumers import FAQConsumer  # noqa: E402
+from faq.helpers.routing import websocket_urlpatterns  # noqa: E402
+
+
+async def generate(application, index: int, questions: int, compact: bool = False) -> dict:
+    subprotocols = [FAQConsumer.COMPACT_PROTOCOL] if compact else None
+    communicator = WebsocketCommunicator(application, "/ws/faq/", subprotocols=subprotocols)
+    connected, _ = await communicator.connect()
+    assert connected, "WebSocket connection was refused"
+
+    start = time.perf_counter()
+    first_qa = None
+    last_qa = None
+    qa_intervals = []
+    received = 0
+    await communicator.send_json_to(
+        {"text": f"Benchmark document number {index}.", "num_questions": questions, "tone": "neutral"}
+    )
+    while True:
+        frame = await communicator.receive_from(timeout=120)
+        received += len(frame.encode("utf-8"))
+        message = json.loads(frame)
+        if message["type"] in ("faq", "faqs"):
+            now = time.perf_counter()
+            if first_qa is None:
+                first_qa = now - start
+            else:
+                qa_intervals.append(now - last_qa)
+            last_qa = now
+        elif message["type"] == "error":
+            raise RuntimeError(message["message"])
+        elif message.get("status") == "complete":
+            break
+    completed = time.perf_counter() - start
+
+    await communicator.disconnect()
+    return {"first_qa": first_qa, "completed": completed, "qa_intervals": qa_intervals, "bytes": received}
+
+
+def run(
+    sockets: int = 20, questions: int = 5, tokens_per_second: float = 200, ttft: float = 0.05, compact: bool = False
+) -> dict:
+    user = User.objects.create_user(email="bench-ws@example.com", password="bench")
+    router = URLRouter(websocket_urlpatterns)
+
+    async def application(scope, receive, send):
+        # Stands in for TokenAuthMiddleware
+        return await router(dict(scope, user=user), receive, send)
+
+    async def run_sockets():
+        try:
+            return await asyncio.gather(*(generate(application, index, questions, compact) for index in range(sockets)))
+        finally:
+            # The consumers' queries ran on the sync_to_async thread; release its connection
+            await sync_to_async(connections.close_all)()
+
+    # Every socket is admitted and gets a place in the LLM queue; rejections would end the run early
+    with (
+        stub_llm(ttft, tokens_per_second=tokens_per_second),
+        override_settings(
+            FAQ_GENERATION_CACHE_ENABLED=False,
+            FAQ_PERSIST_BATCH_SIZE=1,
+            LLM_MAX_QUEUE=max(sockets, settings.LLM_MAX_QUEUE),
+            FAQ_ADMISSION_USER_RATE=0,
+            FAQ_ADMISSION_MAX_QUEUE=0,
+            FAQ_ADMISSION_MAX_WAIT=0,
+        ),
+    ):
+        start = time.perf_counter()
+        results = asyncio.run(run_sockets())
+        wall = time.perf_counter() - start
+
+    return {
+        "sockets": sockets,
+        "questions": questions,
+        "tokens_per_second": tokens_per_second,
+        "time_to_first_token_s": ttft,
+        "compact": compact,
+        "wall_s": round(wall, 3),
+        "time_to_first_qa": summarize([result["first_qa"] for result in results if result["first_qa"] is not None]),
+        "qa_interval": summarize([interval for result in results for interval in result["qa_intervals"]]),
+        "time_to_completion": summarize([result["completed"] for result in results]),
+        "bytes_per_socket": round(sum(result["bytes"] for result in results) / len(results)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sockets", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--tokens-per-second", type=float, default=200)
+    parser.add_argument("--ttft", type=float, default=0.05)
+    parser.add_argument("--compact", action="store_true", help="Use the compact WebSocket protocol")
+    args = parser.parse_args()
+    with benchmark_database():
+        result = run(args.sockets, args.questions, args.tokens_per_second, args.ttft, args.compact)
+        print(json.dumps(result, indent=2))
@@ -0,0 +1,108 @@
+"""
+WebSocket handshake throughput through TokenAuthMiddleware.
+
+Simulates a reconnect storm: ``concurrency`` clients at a time open a socket
+with ``?token=...``, wait for it to be accepted and close it again, for
+``handshakes`` handshakes per token kind. JWT access tokens and DRF tokens are
+measured separately; ``queries_per_handshake`` counts the SQL the handshakes
+ran on the sync_to_async thread, where the consumer's queries run.
+
+Usage:
+    python -m benchmarks.ws_auth [--handshakes 2000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from asgiref.sync import sync_to_async  # noqa: E402
+from channels.routing import URLRouter  # noqa: E402
+from channels.testing import WebsocketCommunicator  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from auths.custom_ws_middleware import TokenAuthMiddleware  # noqa: E402
+from auths.models import User  # noqa: E402
+from benchmarks.utils import benchmark_database, summarize  # noqa: E402
+from faq.helpers.routing import websocket_urlpatterns  # noqa: E402
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def install_counter(counter: QueryCounter) -> None:
+    # Runs on the sync_to_async thread, so only queries made there are counted
+    connections["default"].execute_wrappers.append(counter)
+
+
+def remove_counter(counter: QueryCounter) -> None:
+    connections["default"].execute_wrappers.remove(counter)
+    connections.close_all()
+
+
+async def storm(application, token: str, handshakes: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def handshake() -> float:
+        async with semaphore:
+            start = time.perf_counter()
+            communicator = WebsocketCommunicator(application, f"/ws/faq/?token={token}")
+            connected, _ = await communicator.connect()
+            assert connected, "WebSocket connection was refused"
+            elapsed = time.perf_counter() - start
+            await communicator.disconnect()
+            return elapsed
+
+    counter = QueryCounter()
+    await sync_to_async(install_counter)(counter)
+    try:
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(handshake() for _ in range(handshakes)))
+        wall = time.perf_counter() - start
+    finally:
+        await sync_to_async(remove_counter)(counter)
+
+    return {
+        "handshakes_per_s": round(handshakes / wall, 1),
+        "queries_per_handshake": round(counter.count / handshakes, 2),
+        "latency": summarize(latencies),
+    }
+
+
+def run(handshakes: int = 2000, concurrency: int = 50) -> dict:
+    user = User.objects.create_user(email="bench-ws-auth@example.com", password="bench")
+    tokens = {"jwt": str(AccessToken.for_user(user)), "drf_token": Token.objects.create(user=user).key}
+    application = TokenAuthMiddleware(URLRouter(websocket_urlpatterns))
+
+    async def run_storms():
+        return {kind: await storm(application, token, handshakes, concurrency) for kind, token in tokens.items()}
+
+    with override_settings(FAQ_WS_RESUME_GRACE=0):
+        results = asyncio.run(run_storms())
+
+    return {"handshakes": handshakes, "concurrency": concurrency, **results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--handshakes", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    with benchmark_database():
+        result = run(args.handshakes, args.concurrency)
+        print(json.dumps(result, indent=2))
@@ -0,0 +1,42 @@
+"""
+Daphne with permessage-deflate enabled for WebSockets.
+
+Daphne does not expose Autobahn's compression options, so this server turns
+them on for the factory it builds. Run it like the ``daphne`` command:
+
+    python -m core.server -b 0.0.0.0 -p 8000 core.asgi:application
+"""
+
+from autobahn.websocket.compress import PerMessageDeflateOffer, PerMessageDeflateOfferAccept
+from daphne.cli import CommandLineInterface
+from daphne.server import Server
+
+
+def accept_permessage_deflate(offers):
+    """Accept the first permessage-deflate offer a client makes, if any."""
+    for offer in offers:
+        if isinstance(offer, PerMessageDeflateOffer):
+            return PerMessageDeflateOfferAccept(offer)
+    return None
+
+
+class CompressedServer(Server):
+    def run(self):
+        ready_callable = self.ready_callable
+
+        def ready():
+            # The WebSocket factory exists by now and no connection has been accepted yet
+            self.ws_factory.setProtocolOptions(perMessageCompressionAccept=accept_permessage_deflate)
+            if ready_callable:
+                ready_callable()
+
+        self.ready_callable = ready
+        super().run()
+
+
+class CompressedCommandLineInterface(CommandLineInterface):
+    server_class = CompressedServer
+
+
+if __name__ == "__main__":
+    CompressedCommandLineInterface.entrypoint()
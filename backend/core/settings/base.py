@@ -152,8 +152,8 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 ###############################################################################
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework.authentication.TokenAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # DRF tokens and JWTs, picked by the header's scheme and served from the token caches
+        "auths.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.BasicAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
@@ -163,6 +163,17 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 10,
 }
 
+# Users resolved from DRF tokens and JWT user ids are cached in-process for
+# AUTH_TOKEN_CACHE_TTL seconds, at most AUTH_TOKEN_CACHE_SIZE of them. Deleting a token
+# or saving its user drops the entry in the process that made the change; other
+# processes notice within the TTL.
+AUTH_TOKEN_CACHE_TTL = 60
+AUTH_TOKEN_CACHE_SIZE = 10_000
+# Optional second tier shared by every process: a CACHES alias (e.g. a Redis cache).
+# Invalidations reach it from any process, so its TTL can be longer.
+AUTH_TOKEN_SHARED_CACHE = None
+AUTH_TOKEN_SHARED_CACHE_TTL = 600
+
 ###############################################################################
 # CORS Settings
 ###############################################################################
@@ -204,6 +215,38 @@ REST_AUTH = {
 # Ollama AI Settings
 ###############################################################################
 OLLAMA_MODEL = "gemma"
+# None falls back to the OLLAMA_HOST environment variable, then localhost
+OLLAMA_HOST = None
+# Seconds; None waits as long as the model takes
+OLLAMA_TIMEOUT = None
+# Size of the shared keep-alive connection pool
+OLLAMA_MAX_CONNECTIONS = 10
+
+# Model backend used for generation. FakeBackend (faq.helpers.llm_backends) gives
+# deterministic output without a running model, for tests and benchmarks.
+LLM_BACKEND = {
+    "BACKEND": "faq.helpers.llm_backends.OllamaBackend",
+    "OPTIONS": {},
+}
+
+# Every generation takes a slot from the LLM scheduler. At most LLM_MAX_IN_FLIGHT
+# run at once, up to LLM_MAX_QUEUE more wait, and the rest are rejected.
+LLM_MAX_IN_FLIGHT = 4
+LLM_MAX_QUEUE = 100
+# Seconds a generation is assumed to hold a slot until the scheduler has measured some
+LLM_EXPECTED_HOLD = 30
+
+# Generations are admitted or turned away before they reach the scheduler. Each user
+# gets a token bucket of FAQ_ADMISSION_USER_BURST generations refilled at
+# FAQ_ADMISSION_USER_RATE per second, and nobody is admitted while
+# FAQ_ADMISSION_MAX_QUEUE generations wait or the estimated wait for a slot exceeds
+# FAQ_ADMISSION_MAX_WAIT seconds. Turned away requests get a 429 with Retry-After
+# (REST) or an error frame with retryAfter (WebSocket). 0 disables a check.
+# Generations the generation cache answers are always admitted and cost no token.
+FAQ_ADMISSION_USER_RATE = 10 / 60
+FAQ_ADMISSION_USER_BURST = 5
+FAQ_ADMISSION_MAX_QUEUE = 50
+FAQ_ADMISSION_MAX_WAIT = 60
 
 ###############################################################################
 # Logging Settings
@@ -273,6 +316,9 @@ LOGGING = {
 # ASGI Settings
 ###############################################################################
 ASGI_APPLICATION = "core.asgi.application"
+# The in-memory layer only reaches sockets of the same process. When serving with
+# several ASGI processes, point this at a shared layer (see secret_template.py) so
+# pushed FAQ events, resumes and stops reach every process.
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels.layers.InMemoryChannelLayer",
@@ -289,5 +335,62 @@ INTERNAL_IPS = [
 ###############################################################################
 # FAQ settings
 ###############################################################################
+# Close WebSockets with no frame in either direction for INACTIVITY_TIME seconds
 INACTIVITY_TIME_ENABLED = False
 INACTIVITY_TIME = 60
+# Sockets the client sent nothing on for FAQ_WS_HEARTBEAT_INTERVAL seconds get a
+# {"type": "ping"}; without a frame back within FAQ_WS_HEARTBEAT_TIMEOUT seconds the
+# peer is taken for dead and closed. 0 disables heartbeats. Idle and heartbeat
+# deadlines are checked every FAQ_WS_IDLE_TICK seconds.
+FAQ_WS_HEARTBEAT_INTERVAL = 30
+FAQ_WS_HEARTBEAT_TIMEOUT = 20
+FAQ_WS_IDLE_TICK = 1
+
+# Each WebSocket generation runs as its own task, tagged by the client's request_id;
+# it is cancelled when stopped, after FAQ_WS_GENERATION_TIMEOUT seconds or on disconnect.
+FAQ_WS_GENERATION_TIMEOUT = 120
+FAQ_WS_MAX_GENERATIONS = 4
+# Generations keep running this many seconds after their socket drops, so a client
+# that reconnects can resume them; 0 stops them on disconnect.
+FAQ_WS_RESUME_GRACE = 30
+# Clients requesting partial pairs get the text still being streamed at most this
+# many times per second; updates in between are coalesced.
+FAQ_WS_PARTIAL_FPS = 10
+
+# Generation cache: identical (text, number_of_faqs, tone, model, prompt) requests
+# reuse the stored question/answer pairs instead of calling Ollama again.
+FAQ_GENERATION_CACHE_ENABLED = True
+FAQ_GENERATION_CACHE_MAX_ENTRIES = 1000
+
+# Dashboard statistics are cached per user in the FAQ_STATISTICS_CACHE alias (use a
+# shared backend such as Redis with several processes) for up to
+# FAQ_STATISTICS_CACHE_TTL seconds. Changes to a user's FAQs or question/answers
+# mark them stale; one request recomputes them, holding a lock for at most
+# FAQ_STATISTICS_CACHE_LOCK_TTL seconds, while the others get the stale ones.
+FAQ_STATISTICS_CACHE = "default"
+FAQ_STATISTICS_CACHE_TTL = 3600
+FAQ_STATISTICS_CACHE_LOCK_TTL = 30
+
+# Long documents are split into chunks of at most FAQ_CHUNK_MAX_TOKENS estimated
+# tokens, generated in parallel (FAQ_CHUNK_CONCURRENCY at a time) and reduced.
+FAQ_CHUNK_MAX_TOKENS = 900
+FAQ_CHUNK_CONCURRENCY = 4
+
+# Streamed QuestionAnswers are saved in bulk every FAQ_PERSIST_BATCH_SIZE items
+# or FAQ_PERSIST_FLUSH_MS after the first unsaved item, whichever comes first.
+FAQ_PERSIST_BATCH_SIZE = 5
+FAQ_PERSIST_FLUSH_MS = 50
+
+# Asynchronous FAQ creation. POST /faq/?mode=async (or FAQ_CREATE_MODE = "async")
+# queues a GenerationJob that `manage.py faq_worker` processes.
+FAQ_CREATE_MODE = "sync"
+FAQ_JOB_MAX_ATTEMPTS = 3
+# Running jobs whose worker stopped sending heartbeats for this long are requeued
+FAQ_JOB_STALE_SECONDS = 300
+FAQ_JOB_HEARTBEAT_SECONDS = 15
+# A job turned away by a full LLM queue waits the estimated wait for a slot, and at least this long
+FAQ_JOB_BUSY_RETRY_SECONDS = 5
+
+# /metrics answers staff sessions, and scrapers sending "Authorization: Bearer <token>"
+# with this token. None leaves it to staff only.
+FAQ_METRICS_TOKEN = None
@@ -48,6 +48,23 @@ SIMPLE_JWT = {
 CSRF_TRUSTED_ORIGINS = ["http://localhost", "https://localhost", "http://127.0.0.1", "https://127.0.0.1"]
 
 # Optional Settings (uncomment if needed)
+# Shared channel layer for several ASGI processes (pip install channels-redis)
+# CHANNEL_LAYERS = {
+#     "default": {
+#         "BACKEND": "channels_redis.core.RedisChannelLayer",
+#         "CONFIG": {"hosts": [("<your-redis-host>", 6379)]},
+#     },
+# }
+# Cache shared by every process for the statistics and token caches (pip install redis)
+# CACHES = {
+#     "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+#     "shared": {
+#         "BACKEND": "django.core.cache.backends.redis.RedisCache",
+#         "LOCATION": "redis://<your-redis-host>:6379/1",
+#     },
+# }
+# FAQ_STATISTICS_CACHE = "shared"
+# AUTH_TOKEN_SHARED_CACHE = "shared"
 # ACCOUNT_EMAIL_CONFIRMATION_AUTHENTICATED_REDIRECT_URL = "<your-frontend-login-url>"
 # ACCOUNT_EMAIL_CONFIRMATION_ANONYMOUS_REDIRECT_URL = "<your-frontend-welcome-url>"
 
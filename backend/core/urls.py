@@ -2,7 +2,10 @@ from debug_toolbar.toolbar import debug_toolbar_urls
 from django.contrib import admin
 from django.urls import include, path
 
+from faq.views import metrics
+
 urlpatterns = [
     path("admin/", admin.site.urls),  # Django admin
     path("api/v1/", include("v1.urls")),  # API Version 1 routes
+    path("metrics", metrics),  # Prometheus scrape endpoint
 ] + debug_toolbar_urls()
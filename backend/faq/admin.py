@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import FAQ, QuestionAnswer
+from .models import FAQ, FAQDailyRollup, GenerationJob, GenerationSession, QuestionAnswer
 
 
 @admin.register(FAQ)
@@ -11,5 +11,25 @@ class FAQAdmin(admin.ModelAdmin):
 
 @admin.register(QuestionAnswer)
 class QuestionAnswerAdmin(admin.ModelAdmin):
-    list_display = ("question", "created_at")
+    list_display = ("question", "faq", "position", "created_at")
     search_fields = ("question", "answer")
+    list_select_related = ("faq",)
+    raw_id_fields = ("faq",)
+
+
+@admin.register(GenerationJob)
+class GenerationJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "status", "attempts", "created_at", "finished_at")
+    list_filter = ("status",)
+
+
+@admin.register(GenerationSession)
+class GenerationSessionAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "faq", "status", "created_at", "finished_at")
+    list_filter = ("status",)
+
+
+@admin.register(FAQDailyRollup)
+class FAQDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ("user", "day", "tone", "faq_count", "question_count")
+    list_filter = ("tone",)
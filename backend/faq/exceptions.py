@@ -1,5 +1,5 @@
 from rest_framework import status
-from rest_framework.exceptions import APIException
+from rest_framework.exceptions import APIException, Throttled
 
 
 class ScrapeException(APIException):
@@ -42,3 +42,14 @@ class FAQGenerationException(APIException):
     status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
     default_detail = "Failed to generate FAQs"
     default_code = "faqs_error"
+
+
+class GenerationBusyException(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many FAQs are being generated, please try again later"
+    default_code = "generation_busy"
+
+
+class GenerationRejectedException(Throttled):
+    default_detail = "FAQ generation is not available right now."
+    default_code = "generation_rejected"
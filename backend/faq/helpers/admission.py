@@ -0,0 +1,133 @@
+import logging
+import math
+import threading
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .llm_scheduler import LLMScheduler, get_scheduler
+from .metrics import ADMISSION_REJECTED
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a generation is turned away; ``retry_after`` is when trying again makes sense, in seconds."""
+
+    def __init__(self, message: str, reason: str, retry_after: float, estimated_wait: float):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.estimated_wait = estimated_wait
+
+
+class AdmissionController:
+    """
+    Decide up front whether a generation should start at all.
+
+    A generation is turned away when the scheduler already has ``max_queue``
+    waiters or its estimated wait exceeds ``max_wait`` seconds, and when the
+    user's token bucket (``burst`` generations, refilled at ``rate`` per
+    second) is empty. Turning it away right away is much cheaper than letting
+    it hold a worker until it times out. The global checks come first, so a
+    generation shed for load does not cost the user a token.
+    """
+
+    # Buckets kept before the full ones are dropped
+    MAX_BUCKETS = 10_000
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_queue: int,
+        max_wait: float,
+        scheduler: Optional[LLMScheduler] = None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._scheduler = scheduler
+        self._lock = threading.Lock()
+        # user -> (tokens, monotonic time they were counted)
+        self._buckets: Dict[Hashable, Tuple[float, float]] = {}
+
+    @property
+    def scheduler(self) -> LLMScheduler:
+        return self._scheduler or get_scheduler()
+
+    def estimated_wait(self) -> float:
+        return self.scheduler.estimated_wait()
+
+    def admit(self, user_key: Hashable) -> float:
+        """Take a token for ``user_key`` and return the estimated wait, or raise ``AdmissionRejected``."""
+        metrics = self.scheduler.metrics()
+        wait = metrics["estimated_wait_seconds"]
+        if self.max_queue and metrics["queue_depth"] >= self.max_queue:
+            self._reject(f"{metrics['queue_depth']} generations are already waiting.", "queue_depth", wait, wait)
+        if self.max_wait and wait > self.max_wait:
+            self._reject(f"The estimated wait is {wait:.0f} seconds.", "estimated_wait", wait, wait)
+
+        if self.rate > 0:
+            with self._lock:
+                now = time.monotonic()
+                tokens = self._tokens(user_key, now)
+                if tokens < 1:
+                    self._buckets[user_key] = (tokens, now)
+                    retry_after = (1 - tokens) / self.rate
+                else:
+                    self._buckets[user_key] = (tokens - 1, now)
+                    retry_after = None
+                    if len(self._buckets) > self.MAX_BUCKETS:
+                        self._prune(now)
+            if retry_after is not None:
+                self._reject("Too many generations requested.", "user_rate", retry_after, wait)
+        return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def _tokens(self, user_key: Hashable, now: float) -> float:
+        tokens, counted_at = self._buckets.get(user_key, (self.burst, now))
+        return min(self.burst, tokens + (now - counted_at) * self.rate)
+
+    def _prune(self, now: float) -> None:
+        # A full bucket is the same as no bucket
+        for user_key in [user_key for user_key in self._buckets if self._tokens(user_key, now) >= self.burst]:
+            del self._buckets[user_key]
+
+    def _reject(self, message: str, reason: str, retry_after: float, estimated_wait: float) -> None:
+        ADMISSION_REJECTED.inc(reason=reason)
+        logger.info(f"Generation rejected ({reason}): {message}")
+        raise AdmissionRejected(message, reason, retry_after, estimated_wait)
+
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide admission controller configured from settings."""
+    global _controller
+    if _controller is None:
+        with _controller_lock:
+            if _controller is None:
+                _controller = AdmissionController(
+                    settings.FAQ_ADMISSION_USER_RATE,
+                    settings.FAQ_ADMISSION_USER_BURST,
+                    settings.FAQ_ADMISSION_MAX_QUEUE,
+                    settings.FAQ_ADMISSION_MAX_WAIT,
+                )
+    return _controller
+
+
+@receiver(setting_changed)
+def reset_admission_controller(setting, **kwargs):
+    global _controller
+    if setting.startswith("FAQ_ADMISSION_"):
+        _controller = None
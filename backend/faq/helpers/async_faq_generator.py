@@ -1,29 +1,40 @@
+import asyncio
 import logging
-import re
+import time
+from contextlib import aclosing, asynccontextmanager
 from dataclasses import dataclass
-from typing import List
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional
 
-import ollama
 from asgiref.sync import sync_to_async
 from django.conf import settings
-from pydantic import BaseModel, Field
 
 from ..models import QuestionAnswer
+from .chunking import questions_per_chunk, reduce_question_answers, split_into_chunks
+from .generation_cache import GenerationCache
+from .llm_backends import LLMBackend, get_backend
+from .llm_scheduler import Priority, get_scheduler
+from .metrics import (
+    GENERATION_DURATION,
+    QUEUE_WAIT,
+    TIME_TO_FIRST_QA,
+    TIME_TO_FIRST_TOKEN,
+    generation_labels,
+    record_usage,
+)
+from .schemas import FAQSchema
+from .single_flight import stream_flights
+from .stream_parser import FAQStreamParser
 
 logger = logging.getLogger(__name__)
 
-
-class QuestionAnswerSchema(BaseModel):
-    question: str = Field(..., min_length=1)
-    answer: str = Field(..., min_length=1)
-
-
-class FAQSchema(BaseModel):
-    generated_faqs: List[QuestionAnswerSchema]
+# Called with the index of the pair being streamed and its text so far
+PartialCallback = Callable[[int, Dict[str, str]], Awaitable[None]]
 
 
 @dataclass
 class FAQPrompt:
+    # Bump whenever TEMPLATE changes so cached generations are not reused
+    VERSION = "stream-1"
     TEMPLATE = """
     Generate {num_questions} frequently asked questions and answers about the following text.
     Use a {tone} tone in both questions and answers.
@@ -33,12 +44,37 @@ class FAQPrompt:
 
 
 class FAQGenerator:
-    def __init__(self, model_name: str = settings.OLLAMA_MODEL):
-        self.model_name = model_name
-        self.client = ollama.AsyncClient()
-        logger.info(f"Initialized FAQGenerator with model: {model_name}")
+    def __init__(self, backend: Optional[LLMBackend] = None):
+        self.backend = backend or get_backend()
+        self.model_name = self.backend.model_name
+        logger.info(f"Initialized FAQGenerator with model: {self.model_name}")
+
+    async def is_cached(self, text: str, num_questions: int, tone: str) -> bool:
+        """Return whether generate_faqs_stream would replay a cached generation, without a model call."""
+        cache = GenerationCache()
+        key = GenerationCache.make_key(text, num_questions, tone, self.model_name, FAQPrompt.VERSION)
+        return cache.is_enabled() and await sync_to_async(cache.contains)(key)
 
-    async def generate_faqs_stream(self, text: str, num_questions: int = 5, tone: str = "neutral"):
+    async def generate_faqs_stream(
+        self,
+        text: str,
+        num_questions: int = 5,
+        tone: str = "neutral",
+        use_cache: bool = True,
+        on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+        user_id: Hashable = None,
+        priority: Priority = Priority.INTERACTIVE,
+        on_partial: Optional[PartialCallback] = None,
+    ):
+        """
+        Yield QuestionAnswers as the model completes them.
+
+        ``on_partial`` receives the text of the pair still being streamed after
+        every model token. It is not called for cached or chunked generations.
+        A request joining an identical generation already streaming gets its
+        progress and partial pairs from then on; neither callback is called
+        once the request stops.
+        """
         logger.info(f"Starting FAQ generation: questions={num_questions}, tone={tone}")
 
         if not text.strip():
@@ -49,35 +85,177 @@ class FAQGenerator:
             logger.warning(f"Invalid number of questions: {num_questions}")
             raise ValueError("Number of questions must be positive")
 
-        content = FAQPrompt.TEMPLATE.format(num_questions=num_questions, tone=tone, text=text)
-        if len(content) > 4096:
-            content = content[:4096]
-        logger.debug(f"Generated prompt with length: {len(content)}")
+        cache = GenerationCache()
+        cache_enabled = cache.is_enabled()
+        cache_key = GenerationCache.make_key(text, num_questions, tone, self.model_name, FAQPrompt.VERSION)
 
-        try:
-            logger.debug("Initiating chat stream")
-            stream = await self.client.chat(
-                model=self.model_name,
-                messages=[{"role": "user", "content": content}],
-                stream=True,
-                format=FAQSchema.model_json_schema(),
+        if use_cache and cache_enabled:
+            started = time.perf_counter()
+            pairs = await sync_to_async(cache.get)(cache_key)
+            if pairs is not None:
+                # Replay the cached generation as if it was streamed
+                for pair in pairs:
+                    yield QuestionAnswer(question=pair["question"], answer=pair["answer"])
+                GENERATION_DURATION.observe(
+                    time.perf_counter() - started,
+                    mode="stream",
+                    status="cached",
+                    **generation_labels(self.model_name, tone, num_questions),
+                )
+                return
+
+        # Progress and partial pairs go to every request still subscribed to the generation
+        def produce(notify):
+            async def progress(completed: int, total: int) -> None:
+                await notify("progress", completed, total)
+
+            async def partial(index: int, fields: Dict[str, str]) -> None:
+                await notify("partial", index, fields)
+
+            return self._stream_pairs(
+                text,
+                num_questions,
+                tone,
+                cache_key if cache_enabled else None,
+                progress,
+                user_id,
+                priority,
+                partial,
             )
 
-            buffer = ""
-            pattern = r'\{\s*"question"\s*:\s*"(.*?)",\s*"answer"\s*:\s*"(.*?)"\s*\}'
-            async for chunk in stream:
-                if "message" in chunk and "content" in chunk["message"]:
-                    buffer += chunk["message"]["content"]
-                    match = re.search(pattern, buffer)
-                    if match:
-                        logger.info("Creating new QuestionsAnswer from matched content")
-                        faq = await sync_to_async(QuestionAnswer.objects.create)(
-                            question=match.group(1), answer=match.group(2)
-                        )
-                        logger.debug(f"Created QuestionsAnswer with id: {faq.id}")
-                        buffer = ""
-                        yield faq
+        async def listener(event: str, *args) -> None:
+            callback = on_progress if event == "progress" else on_partial
+            if callback is not None:
+                await callback(*args)
+
+        try:
+            # Identical requests already streaming share that generation instead of starting another
+            async with aclosing(stream_flights.subscribe(cache_key, produce, listener)) as pairs:
+                async for pair in pairs:
+                    yield QuestionAnswer(question=pair["question"], answer=pair["answer"])
 
         except Exception as e:
             logger.error(f"Error in FAQ generation: {str(e)}", exc_info=True)
             raise
+
+    async def _stream_pairs(
+        self,
+        text: str,
+        num_questions: int,
+        tone: str,
+        cache_key: Optional[str],
+        on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+        user_id: Hashable = None,
+        priority: Priority = Priority.INTERACTIVE,
+        on_partial: Optional[PartialCallback] = None,
+    ) -> AsyncIterator[Dict[str, str]]:
+        """Generate question/answer pairs as they arrive and cache them once complete."""
+        chunks = split_into_chunks(text, settings.FAQ_CHUNK_MAX_TOKENS)
+        labels = generation_labels(self.model_name, tone, num_questions)
+        generated_pairs = []
+        started = time.perf_counter()
+        status = "error"
+
+        def first_qa_seen():
+            if not generated_pairs:
+                TIME_TO_FIRST_QA.observe(time.perf_counter() - started, **labels)
+
+        try:
+            if len(chunks) > 1:
+                pairs = await self._generate_chunked(chunks, num_questions, tone, on_progress, user_id, priority)
+                for pair in pairs:
+                    first_qa_seen()
+                    generated_pairs.append(pair)
+                    yield pair
+            else:
+                content = FAQPrompt.TEMPLATE.format(num_questions=num_questions, tone=tone, text=text)
+                logger.debug(f"Generated prompt with length: {len(content)}")
+
+                async with self._slot(user_id, priority):
+                    logger.debug("Initiating chat stream")
+                    parser = FAQStreamParser()
+                    requested = time.perf_counter()
+                    stream = self.backend.astream(
+                        [{"role": "user", "content": content}],
+                        format=FAQSchema.model_json_schema(),
+                        on_usage=lambda usage: record_usage(usage, **labels),
+                    )
+                    first_token = True
+                    # Stopping the generation closes the model's HTTP stream right away
+                    async with aclosing(stream):
+                        async for piece in stream:
+                            if first_token:
+                                TIME_TO_FIRST_TOKEN.observe(time.perf_counter() - requested, **labels)
+                                first_token = False
+                            for item in parser.feed(piece):
+                                logger.debug("Parsed new QuestionAnswer from stream")
+                                first_qa_seen()
+                                pair = item.model_dump()
+                                generated_pairs.append(pair)
+                                yield pair
+                            if on_partial is not None:
+                                fields = parser.partial()
+                                if fields:
+                                    await on_partial(len(generated_pairs), fields)
+
+            # Only complete generations reach this point; a stopped stream is never cached
+            if cache_key is not None:
+                await sync_to_async(GenerationCache().set)(cache_key, self.model_name, generated_pairs)
+            status = "generated"
+
+        except (asyncio.CancelledError, GeneratorExit):
+            status = "cancelled"
+            raise
+
+        finally:
+            GENERATION_DURATION.observe(time.perf_counter() - started, mode="stream", status=status, **labels)
+
+    @asynccontextmanager
+    async def _slot(self, user_id: Hashable, priority: Priority):
+        """Hold a scheduler slot, recording how long it took to get one."""
+        queued = time.perf_counter()
+        async with get_scheduler().aslot(user_id, priority):
+            QUEUE_WAIT.observe(time.perf_counter() - queued, model=self.model_name, priority=priority.name.lower())
+            yield
+
+    async def _generate_chunked(
+        self,
+        chunks: List[str],
+        num_questions: int,
+        tone: str,
+        on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+        user_id: Hashable = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> List[Dict[str, str]]:
+        """Generate candidates for every chunk concurrently and reduce them to num_questions."""
+        per_chunk = questions_per_chunk(num_questions, len(chunks))
+        semaphore = asyncio.Semaphore(settings.FAQ_CHUNK_CONCURRENCY)
+        labels = generation_labels(self.model_name, tone, num_questions)
+        completed = 0
+        logger.info(f"Generating FAQs over {len(chunks)} chunks, {per_chunk} candidates each")
+
+        async def generate_chunk(chunk: str) -> List[Dict[str, str]]:
+            nonlocal completed
+            async with semaphore, self._slot(user_id, priority):
+                content = FAQPrompt.TEMPLATE.format(num_questions=per_chunk, tone=tone, text=chunk)
+                response = await self.backend.achat(
+                    [{"role": "user", "content": content}],
+                    format=FAQSchema.model_json_schema(),
+                    on_usage=lambda usage: record_usage(usage, **labels),
+                )
+            result = FAQSchema.model_validate_json(response)
+            completed += 1
+            if on_progress:
+                await on_progress(completed, len(chunks))
+            return [faq.model_dump() for faq in result.generated_faqs]
+
+        tasks = [asyncio.ensure_future(generate_chunk(chunk)) for chunk in chunks]
+        try:
+            candidates = await asyncio.gather(*tasks)
+        except Exception:
+            # gather returns on the first failure; the other chunks must not keep holding or queueing for slots
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return reduce_question_answers(candidates, num_questions)
@@ -0,0 +1,111 @@
+import math
+import re
+from typing import Dict, List, Sequence
+
+# Rough average for English text with the tokenizers used by Ollama models
+CHARS_PER_TOKEN = 4
+
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"\w+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in ``text``."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text into chunks of at most ``max_tokens`` estimated tokens.
+
+    Paragraph boundaries are preferred, then sentence boundaries. A single
+    sentence longer than the budget is cut at whitespace.
+    """
+    budget = max_tokens * CHARS_PER_TOKEN
+    text = text.strip()
+    if len(text) <= budget:
+        return [text] if text else []
+
+    pieces: List[str] = []
+    for paragraph in _PARAGRAPH_SPLIT.split(text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        if len(paragraph) <= budget:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_SPLIT.split(paragraph):
+            pieces.extend(_split_long(sentence, budget))
+
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current}\n\n{piece}" if current else piece
+        if len(candidate) <= budget:
+            current = candidate
+        else:
+            chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def _split_long(sentence: str, budget: int) -> List[str]:
+    parts = []
+    while len(sentence) > budget:
+        cut = sentence.rfind(" ", 0, budget)
+        if cut <= 0:
+            cut = budget
+        parts.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        parts.append(sentence)
+    return parts
+
+
+def questions_per_chunk(num_questions: int, num_chunks: int) -> int:
+    """Number of candidates to request per chunk, with headroom for deduplication."""
+    return max(2, min(num_questions, math.ceil(num_questions * 1.5 / num_chunks)))
+
+
+def _question_terms(question: str) -> frozenset:
+    return frozenset(word.lower() for word in _WORD.findall(question))
+
+
+def _is_duplicate(terms: frozenset, seen: List[frozenset], threshold: float) -> bool:
+    for other in seen:
+        union = terms | other
+        if union and len(terms & other) / len(union) >= threshold:
+            return True
+    return False
+
+
+def reduce_question_answers(
+    candidates: Sequence[Sequence[Dict[str, str]]], num_questions: int, threshold: float = 0.8
+) -> List[Dict[str, str]]:
+    """
+    Pick ``num_questions`` pairs out of per-chunk candidates.
+
+    Chunks are visited round-robin so every part of the document is covered,
+    and questions whose word sets overlap an already picked one by at least
+    ``threshold`` (Jaccard) are dropped as duplicates.
+    """
+    selected: List[Dict[str, str]] = []
+    seen: List[frozenset] = []
+    queues = [list(chunk) for chunk in candidates]
+
+    while len(selected) < num_questions and any(queues):
+        for queue in queues:
+            if not queue or len(selected) >= num_questions:
+                continue
+            pair = queue.pop(0)
+            terms = _question_terms(pair["question"])
+            if _is_duplicate(terms, seen, threshold):
+                continue
+            seen.append(terms)
+            selected.append(pair)
+
+    return selected
@@ -1,17 +1,29 @@
 import asyncio
 import json
 import logging
+import time
+import uuid
+from contextlib import aclosing
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
-from asgiref.sync import sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.utils import timezone
 
-from ..models import FAQ, QuestionAnswer
+from ..models import FAQ, GenerationSession, QuestionAnswer
 from ..serializers import FAQSerializer, QuestionAnswerSerializer
+from .admission import AdmissionRejected, get_admission_controller
 from .async_faq_generator import FAQGenerator
+from .frame_throttle import FrameThrottle
+from .idle_manager import IdleManager, get_idle_manager
+from .llm_scheduler import Priority
+from .metrics import WEBSOCKET_BYTES, WEBSOCKET_GENERATION_BYTES, generation_labels
+from .persistence import QuestionAnswerBatchWriter
+from .user_events import user_group
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -27,18 +39,15 @@ class FAQManager:
     def __init__(self, user: User):
         self.user = user
 
-    @sync_to_async
-    def get_or_create_faq(self, faq_id: Optional[int] = None) -> FAQ:
+    async def get_or_create_faq(self, faq_id: Optional[int] = None) -> FAQ:
         if faq_id:
-            return FAQ.objects.get(id=faq_id, user=self.user)
-        return FAQ.objects.create(title="Generated FAQ", content="", user=self.user)
+            return await FAQ.objects.aget(id=faq_id, user=self.user)
+        return await FAQ.objects.acreate(title="Generated FAQ", content="", user=self.user)
 
-    @sync_to_async
-    def clear_existing_faqs(self, faq: FAQ) -> None:
-        faq.generated_faqs.all().delete()
+    async def clear_existing_faqs(self, faq: FAQ) -> None:
+        await faq.generated_faqs.all().adelete()
 
-    @sync_to_async
-    def update_faq(self, faq: FAQ, content: str, num_questions: int, tone: str) -> None:
+    async def update_faq(self, faq: FAQ, content: str, num_questions: int, tone: str) -> None:
         # Generate title from first 25 chars of content
         title = content[:25].strip()
         if len(content) > 25:
@@ -47,26 +56,123 @@ class FAQManager:
         faq.content = content
         faq.number_of_faqs = num_questions
         faq.tone = tone
-        faq.save()
+        await faq.asave()
 
-    @sync_to_async
-    def add_generated_faq(self, faq: FAQ, qa: QuestionAnswer) -> None:
-        faq.generated_faqs.add(qa)
+
+class GenerationSessionManager:
+    def __init__(self, user: User):
+        self.user = user
+
+    async def create(self, faq: FAQ, request_id: Optional[str], owner_channel: str) -> GenerationSession:
+        return await GenerationSession.objects.acreate(
+            user=self.user, faq=faq, request_id=request_id or "", owner_channel=owner_channel
+        )
+
+    async def get(self, session_id: str) -> GenerationSession:
+        try:
+            return await GenerationSession.objects.aget(id=session_id, user=self.user)
+        except ValidationError:
+            # Not a UUID
+            raise GenerationSession.DoesNotExist from None
+
+    async def finish(self, session_id: uuid.UUID, status: str, error: str = "") -> None:
+        await GenerationSession.objects.filter(id=session_id).aupdate(
+            status=status, error=error, finished_at=timezone.now(), updated_at=timezone.now()
+        )
+
+    async def resumed_since(self, session_id: uuid.UUID, since: datetime) -> bool:
+        return await GenerationSession.objects.filter(id=session_id, resumed_at__gte=since).aexists()
+
+    async def resume(self, session_id: uuid.UUID, after: int) -> Tuple[GenerationSession, List[QuestionAnswer]]:
+        """Mark the session resumed; return it with the question/answers streamed after sequence ``after``."""
+        await GenerationSession.objects.filter(id=session_id).aupdate(resumed_at=timezone.now())
+        session = await GenerationSession.objects.select_related("faq").aget(id=session_id)
+        # Positions count from 0 and sequences from 1
+        question_answers = [qa async for qa in session.faq.generated_faqs.filter(position__gte=after)]
+        return session, question_answers
+
+
+@dataclass
+class Generation:
+    request_id: Optional[str]
+    session_id: uuid.UUID
+    task: Optional[asyncio.Task] = None
 
 
 class FAQConsumer(AsyncWebsocketConsumer):
-    @sync_to_async
+    """
+    Streams FAQ generations over a WebSocket.
+
+    Every generation runs in its own task, keyed by the ``request_id`` the
+    client sends along (optional when only one generation runs at a time), so
+    the socket keeps reading frames while it streams: ``{"type": "stop"}``
+    cancels one generation by ``request_id`` or ``session_id``, or all of them
+    without either. Messages about a generation carry its ``requestId`` and
+    ``sessionId``, and question/answers their ``sequence`` number.
+
+    A generation outlives its socket for ``FAQ_WS_RESUME_GRACE`` seconds. A
+    client reconnecting to any worker sends ``{"type": "resume", "session_id":
+    ..., "last_sequence": n}`` to get the question/answers after ``n`` replayed
+    from the database, then follows the live stream through the channel layer
+    group of the session.
+
+    Clients that offer the ``COMPACT_PROTOCOL`` subprotocol get compact frames:
+    question/answers saved together arrive in one ``{"type": "faqs", "items":
+    [...]}`` frame, and completion carries ids, the count and the duration
+    instead of the whole serialized FAQ. Other clients get one ``faq`` frame
+    per question/answer and the FAQ on completion.
+
+    Sockets are watched by the process's ``IdleManager``: the server sends
+    ``{"type": "ping"}`` when the client has been quiet for a while and
+    expects any frame, normally ``{"type": "pong"}``, back.
+
+    Every socket also joins the ``user_<id>`` group, so changes to the user's
+    FAQs and statistics made by any process arrive as small ``faq.created``,
+    ``faq.updated``, ``faq.deleted``, ``faq.question_answers_added`` and
+    ``statistics.changed`` frames.
+
+    Requests with ``"partial": true`` also get ``{"type": "partial",
+    "sequence": n, "question": ..., "answer": ...}`` frames with the text of
+    the question/answer still being streamed, at most ``FAQ_WS_PARTIAL_FPS``
+    per second. The saved question/answer with the same ``sequence`` replaces
+    it; no partial frame follows it.
+
+    Generations pass the process's ``AdmissionController`` first. One it turns
+    away gets ``{"type": "error", "code": "generation_rejected", "retryAfter":
+    seconds, "estimatedWait": seconds}``; one it admits reports its
+    ``estimatedWait`` for a model slot in the ``started`` status.
+    """
+
+    COMPACT_PROTOCOL = "faq.compact.v1"
+
+    # Bytes sent over this connection, for the telemetry
+    bytes_sent = 0
+    # Set once the socket is accepted, when idle or heartbeat checks are on
+    idle_manager: Optional[IdleManager] = None
+
     def serialize_question_answer(self, qa: QuestionAnswer) -> dict:
+        # Plain fields only, so no database access (and no thread hop) is needed
         serializer = QuestionAnswerSerializer(qa)
         return serializer.data
 
-    @sync_to_async
-    def serialize_faq(self, faq: FAQ) -> dict:
+    async def serialize_faq(self, faq_id: int) -> dict:
+        # Load the question/answers up front; the serializer then runs without touching the database
+        faq = await FAQ.objects.prefetch_related("generated_faqs").aget(id=faq_id)
         serializer = FAQSerializer(faq)
         return serializer.data
 
+    @staticmethod
+    def session_group(session_id) -> str:
+        return f"generation_{session_id}"
+
     async def connect(self):
         logger.info(f"New WebSocket connection: {self.channel_name}")
+        self.generations: Dict[Optional[str], Generation] = {}
+        # Resumed sessions owned by other connections -> last sequence sent to this client
+        self.followed: Dict[str, int] = {}
+        self.attached = True
+        self.background_tasks = set()
+        self.compact = self.COMPACT_PROTOCOL in self.scope.get("subprotocols", [])
         try:
             self.user = self.scope["user"]
             if not self.user.is_authenticated:
@@ -75,56 +181,356 @@ class FAQConsumer(AsyncWebsocketConsumer):
                 return
 
             self.faq_manager = FAQManager(self.user)
-            self.faq = None
-            if settings.INACTIVITY_TIME_ENABLED:
-                self.inactive_task = asyncio.create_task(self.close_on_inactivity())
-            await self.accept()
+            self.session_manager = GenerationSessionManager(self.user)
+            await self.channel_layer.group_add(user_group(self.user.id), self.channel_name)
+            await self.accept(self.COMPACT_PROTOCOL if self.compact else None)
+            if settings.INACTIVITY_TIME_ENABLED or settings.FAQ_WS_HEARTBEAT_INTERVAL > 0:
+                self.idle_manager = get_idle_manager()
+                self.idle_manager.register(self)
 
         except Exception as e:
             logger.error(f"Connection error: {str(e)}", exc_info=True)
             await self.close()
 
-    async def close_on_inactivity(self):
-        """Closes WebSocket after a period of inactivity."""
+    async def disconnect(self, code):
+        self.attached = False
+        if getattr(self, "user", None) is not None and self.user.is_authenticated:
+            await self.channel_layer.group_discard(user_group(self.user.id), self.channel_name)
+        for session_id in list(self.followed):
+            await self.unfollow(session_id)
+        if self.idle_manager is not None:
+            self.idle_manager.unregister(self)
+
+        if settings.FAQ_WS_RESUME_GRACE <= 0:
+            # Nobody can come back for them; free the model slots
+            await self.stop_generations(list(self.generations))
+            return
+        detached_at = timezone.now()
+        for generation in self.generations.values():
+            task = asyncio.create_task(self.expire_detached(generation, detached_at))
+            self.background_tasks.add(task)
+            task.add_done_callback(self.background_tasks.discard)
+
+    async def user_event(self, event: Dict[str, Any]) -> None:
+        """Forward a change to the user's FAQs or statistics, made from any process."""
+        await self.send(json.dumps(event["message"]))
+
+    async def expire_detached(self, generation: Generation, detached_at: datetime) -> None:
+        """Stop a generation whose socket dropped unless a client resumed it within the grace period."""
+        await asyncio.sleep(settings.FAQ_WS_RESUME_GRACE)
+        if generation.task.done():
+            return
+        if not await self.session_manager.resumed_since(generation.session_id, detached_at):
+            logger.info(f"Stopping generation session {generation.session_id}: not resumed")
+            generation.task.cancel()
+
+    async def send_ping(self) -> None:
+        await self.send(json.dumps({"type": "ping"}), heartbeat=True)
+
+    async def close_idle(self, reason: str) -> None:
+        await self.send_error(reason)
+        await self.close()
+
+    async def send(self, text_data=None, bytes_data=None, close=False, heartbeat=False):
+        size = len(text_data.encode("utf-8")) if text_data is not None else len(bytes_data or b"")
+        self.bytes_sent += size
+        WEBSOCKET_BYTES.inc(size)
+        if self.idle_manager is not None and not heartbeat:
+            self.idle_manager.activity(self)
+        await super().send(text_data=text_data, bytes_data=bytes_data, close=close)
+
+    async def start_generation(
+        self,
+        request_id: Optional[str],
+        faq: FAQ,
+        text: str,
+        num_questions: int,
+        tone: str,
+        use_cache: bool = True,
+        partial: bool = False,
+        estimated_wait: float = 0.0,
+    ) -> None:
+        # Stop requests for this generation from other connections arrive on its own channel
+        owner_channel = await self.channel_layer.new_channel()
+        session = await self.session_manager.create(faq, request_id, owner_channel)
+        generation = Generation(request_id, session.id)
+        self.generations[request_id] = generation
+        await self.publish(
+            generation, {"type": "status", "status": "started", "estimatedWait": round(estimated_wait, 1)}
+        )
+        generation.task = asyncio.create_task(
+            self.run_generation(generation, owner_channel, faq, text, num_questions, tone, use_cache, partial)
+        )
+
+    async def run_generation(
+        self,
+        generation: Generation,
+        owner_channel: str,
+        faq: FAQ,
+        text: str,
+        num_questions: int,
+        tone: str,
+        use_cache: bool = True,
+        partial: bool = False,
+    ) -> None:
+        listener = asyncio.create_task(self.listen_for_stop(owner_channel, asyncio.current_task()))
+        started = time.perf_counter()
         try:
-            await asyncio.sleep(settings.INACTIVITY_TIME)
-            logger.info("Closing WebSocket due to inactivity")
-            await self.send_error("Connection closed due to inactivity.")
-            await self.close()
+            count = await asyncio.wait_for(
+                self.handle_faq_generation(generation, faq, text, num_questions, tone, use_cache, partial),
+                timeout=settings.FAQ_WS_GENERATION_TIMEOUT,
+            )
         except asyncio.CancelledError:
-            pass
+            await self.finish_generation(generation, GenerationSession.STOPPED, {"type": "status", "status": "stopped"})
+            raise
+        except asyncio.TimeoutError:
+            logger.error("FAQ generation timed out")
+            message = "FAQ generation took too long and was stopped."
+            await self.finish_generation(generation, GenerationSession.FAILED, {"type": "error", "message": message})
+        except Exception as e:
+            logger.error(f"Generation error: {str(e)}", exc_info=True)
+            await self.finish_generation(generation, GenerationSession.FAILED, {"type": "error", "message": str(e)})
+        else:
+            duration_ms = round((time.perf_counter() - started) * 1000)
+            message = {
+                "type": "status",
+                "status": "complete",
+                "faqId": faq.id,
+                "count": count,
+                "durationMs": duration_ms,
+            }
+            await self.finish_generation(generation, GenerationSession.COMPLETE, message)
+        finally:
+            listener.cancel()
+            self.generations.pop(generation.request_id, None)
+
+    async def listen_for_stop(self, channel: str, task: asyncio.Task) -> None:
+        await self.channel_layer.receive(channel)
+        logger.info(f"Stop requested for generation on {channel}")
+        task.cancel()
+
+    async def finish_generation(self, generation: Generation, status: str, message: Dict[str, Any]) -> None:
+        # Record the outcome before announcing it, so a client resuming in between still learns it
+        await self.session_manager.finish(generation.session_id, status, message.get("message", ""))
+        await self.publish(generation, message)
+
+    async def handle_faq_generation(
+        self,
+        generation: Generation,
+        faq: FAQ,
+        text: str,
+        num_questions: int,
+        tone: str,
+        use_cache: bool = True,
+        partial: bool = False,
+    ) -> int:
+        """Stream one generation into ``faq``; return the number of question/answers saved."""
+        generator = FAQGenerator()
+        labels = generation_labels(generator.model_name, tone, num_questions)
+        bytes_before = self.bytes_sent
+        sequence = 0
+        # Question/answers the model completed; their partial frames are stale
+        completed = 0
+
+        async def send_faq_updates(question_answers: List[QuestionAnswer]) -> None:
+            nonlocal sequence
+            items = []
+            for question_answer in question_answers:
+                sequence += 1
+                items.append({**self.serialize_question_answer(question_answer), "sequence": sequence})
+            # Everything saved in one flush goes out together
+            await self.publish(generation, {"type": "faqs", "faqId": faq.id, "items": items})
+
+        async def send_progress(completed: int, total: int) -> None:
+            await self.publish(
+                generation, {"type": "status", "status": "progress", "completed": completed, "total": total}
+            )
 
-    async def handle_faq_generation(self, text: str, num_questions: int, tone: str) -> None:
-        try:
-            self.is_generating = True
-            self.generator = FAQGenerator()
-            generated_faqs = []
+        async def send_partial(update: Tuple[int, Dict[str, str]]) -> None:
+            index, fields = update
+            if index >= completed:
+                await self.publish(generation, {"type": "partial", "faqId": faq.id, "sequence": index + 1, **fields})
 
-            async for faq in self.generator.generate_faqs_stream(text, num_questions, tone):
-                if not self.is_generating:
-                    break
-                generated_faqs.append(faq)
-                await self.faq_manager.add_generated_faq(self.faq, faq)
-                await self.send_faq_update(faq)
+        throttle = FrameThrottle(send_partial) if partial else None
 
-            await self.send_completion_message(generated_faqs)
+        async def update_partial(index: int, fields: Dict[str, str]) -> None:
+            await throttle.update((index, fields))
+
+        try:
+            writer = QuestionAnswerBatchWriter(faq, on_flush=send_faq_updates)
+            stream = generator.generate_faqs_stream(
+                text,
+                num_questions,
+                tone,
+                use_cache=use_cache,
+                on_progress=send_progress,
+                user_id=self.user.id,
+                priority=Priority.INTERACTIVE,
+                on_partial=update_partial if partial else None,
+            )
+
+            try:
+                # Closing the stream on stop cancels the model call instead of leaving it to the garbage collector
+                async with aclosing(stream):
+                    async for question_answer in stream:
+                        completed += 1
+                        await writer.add(question_answer)
+            finally:
+                if throttle is not None:
+                    throttle.close()
+                # Persist whatever was generated, even if the stream failed or was stopped
+                await writer.close()
+            return sequence
 
-        except Exception as e:
-            logger.error(f"Generation error: {str(e)}", exc_info=True)
-            await self.send_error(str(e))
         finally:
-            self.is_generating = False
-            self.generator = None
+            WEBSOCKET_GENERATION_BYTES.observe(self.bytes_sent - bytes_before, **labels)
+
+    async def publish(self, generation: Generation, message: Dict[str, Any]) -> None:
+        """Send a message about a generation to this client and to every client that resumed it."""
+        message["sessionId"] = str(generation.session_id)
+        if generation.request_id is not None:
+            message["requestId"] = generation.request_id
+        if self.attached:
+            await self.deliver(message)
+        await self.channel_layer.group_send(
+            self.session_group(generation.session_id), {"type": "generation.message", "message": message}
+        )
+
+    async def deliver(self, message: Dict[str, Any]) -> None:
+        """Send a generation message to this client in the protocol it negotiated."""
+        if self.compact:
+            await self.send(json.dumps(message))
+            return
+
+        tags = {key: message[key] for key in ("sessionId", "requestId") if key in message}
+        if message["type"] == "faqs":
+            for item in message["items"]:
+                sequence = item["sequence"]
+                fields = {key: value for key, value in item.items() if key != "sequence"}
+                await self.send(
+                    json.dumps(
+                        {
+                            "type": "faq",
+                            "faqId": message["faqId"],
+                            **fields,
+                            "status": "generating",
+                            "sequence": sequence,
+                            **tags,
+                        }
+                    )
+                )
+        elif message.get("status") == "complete":
+            serialized_faq = await self.serialize_faq(message["faqId"])
+            await self.send(json.dumps({"type": "status", "status": "complete", "faq": serialized_faq, **tags}))
+        else:
+            await self.send(json.dumps(message))
+
+    async def generation_message(self, event: Dict[str, Any]) -> None:
+        """Forward the live stream of a resumed generation, skipping what the replay already sent."""
+        message = event["message"]
+        session_id = message["sessionId"]
+        if session_id not in self.followed:
+            return
+        if message["type"] == "faqs":
+            items = [item for item in message["items"] if item["sequence"] > self.followed[session_id]]
+            if not items:
+                return
+            self.followed[session_id] = items[-1]["sequence"]
+            message = {**message, "items": items}
+        if message["type"] == "error" or message.get("status") in ("complete", "stopped"):
+            await self.unfollow(session_id)
+        await self.deliver(message)
+
+    async def resume_generation(self, session_id: str, last_sequence: int) -> None:
+        session = await self.session_manager.get(session_id)
+        session_id = str(session.id)
+
+        # Join the live stream before reading the replay, so nothing falls in between
+        await self.channel_layer.group_add(self.session_group(session_id), self.channel_name)
+        self.followed[session_id] = last_sequence
+        session, question_answers = await self.session_manager.resume(session.id, last_sequence)
+
+        tags = {"sessionId": session_id}
+        if session.request_id:
+            tags["requestId"] = session.request_id
+        if question_answers:
+            items = [
+                {**self.serialize_question_answer(question_answer), "sequence": sequence}
+                for sequence, question_answer in enumerate(question_answers, start=last_sequence + 1)
+            ]
+            await self.deliver({"type": "faqs", "faqId": session.faq_id, "items": items, **tags})
+            self.followed[session_id] = items[-1]["sequence"]
+
+        if session.status == GenerationSession.RUNNING:
+            await self.deliver({"type": "status", "status": "resumed", **tags})
+            return
+
+        # Finished while the client was away
+        await self.unfollow(session_id)
+        if session.status == GenerationSession.COMPLETE:
+            count = last_sequence + len(question_answers)
+            duration_ms = round((session.finished_at - session.created_at).total_seconds() * 1000)
+            message = {"type": "status", "status": "complete", "faqId": session.faq_id, "count": count}
+            await self.deliver({**message, "durationMs": duration_ms, **tags})
+        elif session.status == GenerationSession.STOPPED:
+            await self.deliver({"type": "status", "status": "stopped", **tags})
+        else:
+            await self.deliver({"type": "error", "message": session.error, **tags})
+
+    async def unfollow(self, session_id: str) -> None:
+        self.followed.pop(session_id, None)
+        await self.channel_layer.group_discard(self.session_group(session_id), self.channel_name)
+
+    async def stop_generations(self, request_ids: List[Optional[str]]) -> int:
+        """Cancel the given generations, wait until they have unwound and return how many there were."""
+        tasks = [self.generations[request_id].task for request_id in request_ids if request_id in self.generations]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return len(tasks)
+
+    async def stop_session(self, session_id: str) -> None:
+        for request_id, generation in list(self.generations.items()):
+            if str(generation.session_id) == session_id:
+                await self.stop_generations([request_id])
+                return
+        # Owned by another connection, possibly in another worker
+        session = await self.session_manager.get(session_id)
+        if session.status == GenerationSession.RUNNING:
+            await self.channel_layer.send(session.owner_channel, {"type": "generation.stop"})
 
     async def receive(self, text_data: str) -> None:
+        request_id = None
         try:
             data = json.loads(text_data)
+            request_id = data.get("request_id")
+            if self.idle_manager is not None:
+                self.idle_manager.received(self, heartbeat=data.get("type") == "pong")
+
+            if data.get("type") == "pong":
+                return
 
             if data.get("type") == "stop":
-                self.is_generating = False
-                if self.generator:
-                    await self.generator.stop()
-                await self.send_json({"type": "status", "status": "stopped"})
+                if data.get("session_id"):
+                    await self.stop_session(str(data["session_id"]))
+                else:
+                    # Without a request_id, stop everything this socket is generating
+                    request_ids = [request_id] if request_id is not None else list(self.generations)
+                    if not await self.stop_generations(request_ids):
+                        # Unknown or already finished; the client is still waiting for an answer
+                        await self.send_message({"type": "status", "status": "stopped"}, request_id)
+                return
+
+            if data.get("type") == "resume":
+                await self.resume_generation(str(data.get("session_id")), int(data.get("last_sequence", 0)))
+                return
+
+            if request_id in self.generations:
+                await self.send_error(f"A generation with request_id {request_id!r} is already running.", request_id)
+                return
+
+            if len(self.generations) >= settings.FAQ_WS_MAX_GENERATIONS:
+                await self.send_error("Too many generations running on this connection.", request_id)
                 return
 
             # Validate input using serializer
@@ -137,43 +543,68 @@ class FAQConsumer(AsyncWebsocketConsumer):
             )
 
             if not serializer.is_valid():
-                await self.send_error(str(serializer.errors))
+                await self.send_error(str(serializer.errors), request_id)
                 return
 
             validated_data = serializer.validated_data
-            self.faq = await self.faq_manager.get_or_create_faq(data.get("faq_id"))
+            use_cache = not data.get("regenerate", False)
+            try:
+                estimated_wait = await self.admit(validated_data, use_cache)
+            except AdmissionRejected as e:
+                await self.send_rejection(e, request_id)
+                return
+
+            faq = await self.faq_manager.get_or_create_faq(data.get("faq_id"))
 
             if data.get("faq_id"):
-                await self.faq_manager.clear_existing_faqs(self.faq)
+                await self.faq_manager.clear_existing_faqs(faq)
 
             await self.faq_manager.update_faq(
-                self.faq, validated_data["content"], validated_data["number_of_faqs"], validated_data["tone"]
+                faq, validated_data["content"], validated_data["number_of_faqs"], validated_data["tone"]
             )
 
-            # Add timeout to handle_faq_generation
-            try:
-                timeout_seconds = 120
-                await asyncio.wait_for(
-                    self.handle_faq_generation(
-                        validated_data["content"], validated_data["number_of_faqs"], validated_data["tone"]
-                    ),
-                    timeout=timeout_seconds,
-                )
-            except asyncio.TimeoutError:
-                logger.error("FAQ generation timed out")
-                await self.send_error("FAQ generation took too long and was stopped.")
+            # Generate in the background so stop and further requests are read meanwhile
+            await self.start_generation(
+                request_id,
+                faq,
+                validated_data["content"],
+                validated_data["number_of_faqs"],
+                validated_data["tone"],
+                use_cache=use_cache,
+                partial=bool(data.get("partial", False)),
+                estimated_wait=estimated_wait,
+            )
+
+        except GenerationSession.DoesNotExist:
+            await self.send_error("Unknown generation session.", request_id)
 
         except Exception as e:
             logger.error(f"Error in receive: {str(e)}", exc_info=True)
-            await self.send_error(str(e))
-
-    async def send_faq_update(self, faq: QuestionAnswer) -> None:
-        serialized_data = await self.serialize_question_answer(faq)
-        await self.send(json.dumps({"type": "faq", "faqId": self.faq.id, **serialized_data, "status": "generating"}))
-
-    async def send_completion_message(self, generated_faqs: List[QuestionAnswer]) -> None:
-        serialized_data = await self.serialize_faq(self.faq)
-        await self.send(json.dumps({"type": "status", "status": "complete", "faq": serialized_data}))
-
-    async def send_error(self, message: str) -> None:
-        await self.send(json.dumps({"type": "error", "message": message}))
+            await self.send_error(str(e), request_id)
+
+    async def admit(self, validated_data: Dict[str, Any], use_cache: bool) -> float:
+        """Return the estimated wait of an admitted generation, or raise ``AdmissionRejected``."""
+        # Replayed from the cache without a model call, so it costs the user nothing
+        if use_cache and await FAQGenerator().is_cached(
+            validated_data["content"], validated_data["number_of_faqs"], validated_data["tone"]
+        ):
+            return 0.0
+        return get_admission_controller().admit(self.user.id)
+
+    async def send_message(self, message: Dict[str, Any], request_id: Optional[str] = None) -> None:
+        if request_id is not None:
+            message["requestId"] = request_id
+        await self.send(json.dumps(message))
+
+    async def send_error(self, message: str, request_id: Optional[str] = None) -> None:
+        await self.send_message({"type": "error", "message": message}, request_id)
+
+    async def send_rejection(self, rejection: AdmissionRejected, request_id: Optional[str] = None) -> None:
+        message = {
+            "type": "error",
+            "code": "generation_rejected",
+            "message": f"{rejection} Try again in {rejection.retry_after} seconds.",
+            "retryAfter": rejection.retry_after,
+            "estimatedWait": round(rejection.estimated_wait, 1),
+        }
+        await self.send_message(message, request_id)
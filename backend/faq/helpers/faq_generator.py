@@ -1,28 +1,28 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from threading import Lock
-from typing import List
+from typing import Dict, Hashable, List
 
-import ollama
 from django.conf import settings
-from pydantic import BaseModel, Field
 
 from ..models import QuestionAnswer
+from .chunking import questions_per_chunk, reduce_question_answers, split_into_chunks
+from .generation_cache import GenerationCache
+from .llm_backends import get_backend
+from .llm_scheduler import Priority, get_scheduler
+from .metrics import GENERATION_DURATION, QUEUE_WAIT, generation_labels, record_usage
+from .schemas import FAQSchema
+from .single_flight import generation_flights
 
 logger = logging.getLogger(__name__)
 
 
-class QuestionAnswerSchema(BaseModel):
-    question: str = Field(..., min_length=1)
-    answer: str = Field(..., min_length=1)
-
-
-class FAQ(BaseModel):
-    generated_faqs: List[QuestionAnswerSchema]
-
-
 @dataclass
 class FAQPrompt:
+    # Bump whenever TEMPLATE changes so cached generations are not reused
+    VERSION = "json-1"
     TEMPLATE = """
     Generate {num_questions} frequently asked questions and answers about the following text.
     Use a {tone} tone in both questions and answers.
@@ -54,8 +54,6 @@ class FAQGenerator:
 
     def _initialize(self):
         """Initialize expensive resources once."""
-        # Initialize AI model or other expensive resources
-        self._model = settings.OLLAMA_MODEL
         self._is_initialized = False
 
     def __init__(self):
@@ -63,7 +61,21 @@ class FAQGenerator:
         if not getattr(self, "_is_initialized", False):
             self._is_initialized = True
 
-    def generate_faqs(self, text: str, num_questions: int = 5, tone: str = "neutral") -> List[QuestionAnswer]:
+    def is_cached(self, text: str, num_questions: int, tone: str) -> bool:
+        """Return whether generate_faqs would be answered from the generation cache, without a model call."""
+        cache = GenerationCache()
+        key = GenerationCache.make_key(text, num_questions, tone, get_backend().model_name, FAQPrompt.VERSION)
+        return cache.is_enabled() and cache.contains(key)
+
+    def generate_faqs(
+        self,
+        text: str,
+        num_questions: int = 5,
+        tone: str = "neutral",
+        use_cache: bool = True,
+        user_id: Hashable = None,
+        priority: Priority = Priority.BATCH,
+    ) -> List[QuestionAnswer]:
         """
         Generate FAQs from input text using Ollama.
 
@@ -71,12 +83,16 @@ class FAQGenerator:
             text: Input text to generate FAQs from
             num_questions: Number of FAQs to generate
             tone: Tone of the FAQs (e.g., 'neutral', 'friendly', 'professional')
+            use_cache: Reuse a previous generation for identical input; pass False to force regeneration
+            user_id: Requesting user, used by the LLM scheduler to share capacity fairly
+            priority: Scheduling class of the request
 
         Returns:
-            List of QuestionAnswer objects
+            List of unsaved QuestionAnswer objects, see FAQManager.add_question_answers
 
         Raises:
             ValueError: If input parameters are invalid
+            SchedulerQueueFull: If too many generations are already waiting for the LLM
         """
         if not text.strip():
             raise ValueError("Input text cannot be empty")
@@ -84,23 +100,73 @@ class FAQGenerator:
         if num_questions < 1:
             raise ValueError("Number of questions must be positive")
 
-        faqs: List[QuestionAnswer] = []
+        backend = get_backend()
+        cache = GenerationCache()
+        cache_enabled = cache.is_enabled()
+        cache_key = GenerationCache.make_key(text, num_questions, tone, backend.model_name, FAQPrompt.VERSION)
+
+        labels = generation_labels(backend.model_name, tone, num_questions)
+        started = time.perf_counter()
+        status = "cached"
 
         try:
-            content = FAQPrompt.TEMPLATE.format(num_questions=num_questions, tone=tone, text=text)
+            pairs = cache.get(cache_key) if use_cache and cache_enabled else None
 
-            response = ollama.chat(
-                model=self._model, messages=[{"role": "user", "content": content}], format=FAQ.model_json_schema()
-            )
+            if pairs is None:
+                status = "generated"
 
-            question_answer = FAQ.model_validate_json(response.message.content)
+                def generate():
+                    generated = self._generate_pairs(text, num_questions, tone, user_id, priority)
+                    if cache_enabled:
+                        cache.set(cache_key, backend.model_name, generated)
+                    return generated
 
-            for faq in question_answer.generated_faqs:
-                qa = QuestionAnswer.objects.create(question=faq.question, answer=faq.answer)
-                faqs.append(qa)
+                # Identical requests already running share that generation instead of starting another
+                pairs = generation_flights.do(cache_key, generate)
 
-            return faqs
+            # Every caller gets its own unsaved instances, even when the pairs are shared
+            return [QuestionAnswer(question=pair["question"], answer=pair["answer"]) for pair in pairs]
 
         except Exception as e:
+            status = "error"
             logger.error(f"Error generating FAQs: {str(e)}")
             raise
+
+        finally:
+            GENERATION_DURATION.observe(time.perf_counter() - started, mode="sync", status=status, **labels)
+
+    def _generate_pairs(
+        self, text: str, num_questions: int, tone: str, user_id: Hashable = None, priority: Priority = Priority.BATCH
+    ) -> List[Dict[str, str]]:
+        """Generate pairs in one call, or map-reduce over chunks for long documents."""
+        chunks = split_into_chunks(text, settings.FAQ_CHUNK_MAX_TOKENS)
+        if len(chunks) <= 1:
+            return self._chat(text, num_questions, tone, user_id, priority)
+
+        per_chunk = questions_per_chunk(num_questions, len(chunks))
+        logger.info(f"Generating FAQs over {len(chunks)} chunks, {per_chunk} candidates each")
+
+        with ThreadPoolExecutor(max_workers=settings.FAQ_CHUNK_CONCURRENCY) as executor:
+            candidates = list(executor.map(lambda chunk: self._chat(chunk, per_chunk, tone, user_id, priority), chunks))
+
+        return reduce_question_answers(candidates, num_questions)
+
+    def _chat(
+        self, text: str, num_questions: int, tone: str, user_id: Hashable = None, priority: Priority = Priority.BATCH
+    ) -> List[Dict[str, str]]:
+        content = FAQPrompt.TEMPLATE.format(num_questions=num_questions, tone=tone, text=text)
+
+        backend = get_backend()
+        labels = generation_labels(backend.model_name, tone, num_questions)
+
+        queued = time.perf_counter()
+        with get_scheduler().slot(user_id, priority):
+            QUEUE_WAIT.observe(time.perf_counter() - queued, model=backend.model_name, priority=priority.name.lower())
+            response = backend.chat(
+                [{"role": "user", "content": content}],
+                format=FAQSchema.model_json_schema(),
+                on_usage=lambda usage: record_usage(usage, **labels),
+            )
+
+        question_answer = FAQSchema.model_validate_json(response)
+        return [faq.model_dump() for faq in question_answer.generated_faqs]
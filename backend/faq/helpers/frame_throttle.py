@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FrameThrottle:
+    """
+    Coalesce a rapidly changing value into at most ``fps`` sends per second.
+
+    ``update`` replaces the pending value. It is sent right away when the last
+    send is at least one frame old, otherwise once the frame is over; values
+    replaced in between are never sent. ``close`` drops whatever is pending.
+    """
+
+    def __init__(self, send: Callable[[Any], Awaitable[None]], fps: Optional[float] = None):
+        self.send = send
+        self.interval = 1 / (fps or settings.FAQ_WS_PARTIAL_FPS)
+        self._pending: Any = None
+        self._last_sent = float("-inf")
+        self._timer: Optional[asyncio.Task] = None
+
+    async def update(self, value: Any) -> None:
+        self._pending = value
+        if self._timer is not None:
+            return
+        wait = self._last_sent + self.interval - time.monotonic()
+        if wait <= 0:
+            await self._send_pending()
+        else:
+            self._timer = asyncio.create_task(self._send_later(wait))
+
+    def close(self) -> None:
+        self._pending = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def _send_pending(self) -> None:
+        value, self._pending = self._pending, None
+        if value is None:
+            return
+        self._last_sent = time.monotonic()
+        await self.send(value)
+
+    async def _send_later(self, wait: float) -> None:
+        await asyncio.sleep(wait)
+        # Detach first so close() does not cancel the task running the send
+        self._timer = None
+        try:
+            await self._send_pending()
+        except Exception as e:
+            logger.error(f"Error sending throttled frame: {str(e)}", exc_info=True)
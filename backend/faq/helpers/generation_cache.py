@@ -0,0 +1,111 @@
+import hashlib
+import json
+import logging
+from threading import Lock
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import GenerationCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationCache:
+    """
+    Persistent, size-bounded cache of generated question/answer pairs.
+
+    Entries are keyed by a SHA-256 of the normalized input text and every other
+    parameter that changes the model output. The least recently used entries
+    are evicted once the table grows past ``FAQ_GENERATION_CACHE_MAX_ENTRIES``.
+    """
+
+    _hits = 0
+    _misses = 0
+    _stats_lock = Lock()
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.FAQ_GENERATION_CACHE_MAX_ENTRIES
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return getattr(settings, "FAQ_GENERATION_CACHE_ENABLED", True)
+
+    @staticmethod
+    def make_key(text: str, num_questions: int, tone: str, model_name: str, prompt_version: str) -> str:
+        """Build the content-addressed key for a generation request."""
+        normalized_text = " ".join(text.split())
+        payload = json.dumps(
+            [normalized_text, num_questions, tone, model_name, prompt_version],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict[str, str]]]:
+        """Return cached question/answer pairs for ``key`` or ``None`` on a miss."""
+        entry = GenerationCacheEntry.objects.filter(key=key).only("question_answers").first()
+
+        if entry is None:
+            self._record(hit=False)
+            logger.debug(f"Generation cache miss: {key}")
+            return None
+
+        # Touching updated_at keeps recently used entries out of eviction
+        GenerationCacheEntry.objects.filter(key=key).update(hits=F("hits") + 1, updated_at=timezone.now())
+        self._record(hit=True)
+        logger.info(f"Generation cache hit: {key}")
+        return entry.question_answers
+
+    def contains(self, key: str) -> bool:
+        """Return whether ``key`` is cached, without counting a hit or a miss."""
+        return GenerationCacheEntry.objects.filter(key=key).exists()
+
+    def set(self, key: str, model_name: str, question_answers: List[Dict[str, str]]) -> None:
+        """Store generated pairs under ``key`` and evict entries above the size bound."""
+        if not question_answers:
+            return
+
+        try:
+            with transaction.atomic():
+                GenerationCacheEntry.objects.update_or_create(
+                    key=key,
+                    defaults={"model_name": model_name, "question_answers": question_answers},
+                )
+        except IntegrityError:
+            # A concurrent request stored the same key first
+            logger.debug(f"Generation cache entry already stored: {key}")
+            return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        stale_ids = GenerationCacheEntry.objects.order_by("-updated_at").values_list("id", flat=True)[
+            self.max_entries :
+        ]
+        stale_ids = list(stale_ids)
+        if stale_ids:
+            GenerationCacheEntry.objects.filter(id__in=stale_ids).delete()
+            logger.info(f"Evicted {len(stale_ids)} generation cache entries")
+
+    @classmethod
+    def _record(cls, hit: bool) -> None:
+        with cls._stats_lock:
+            if hit:
+                cls._hits += 1
+            else:
+                cls._misses += 1
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Return the hit/miss counters of the current process."""
+        with cls._stats_lock:
+            return {"hits": cls._hits, "misses": cls._misses}
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        with cls._stats_lock:
+            cls._hits = 0
+            cls._misses = 0
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import math
+import time
+import weakref
+from typing import Dict, List, Optional, Protocol, Set
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class IdleConnection(Protocol):
+    async def send_ping(self) -> None: ...
+
+    async def close_idle(self, reason: str) -> None: ...
+
+
+class _Entry:
+    __slots__ = ("connection", "last_activity", "last_received", "ping_sent_at", "slot")
+
+    def __init__(self, connection: IdleConnection, now: float):
+        self.connection = connection
+        self.last_activity = now
+        self.last_received = now
+        self.ping_sent_at: Optional[float] = None
+        self.slot: Optional[int] = None
+
+
+class IdleManager:
+    """
+    Close idle WebSockets and detect dead peers with one timer wheel per event loop.
+
+    Activity is recorded by writing a timestamp, so the hot path costs the
+    same however many sockets are open. The wheel holds every connection in
+    the slot of its next deadline. A single task advances it every ``tick``
+    seconds; a connection whose deadline moved since it was filed is simply
+    filed again, so activity never touches the wheel itself.
+
+    A connection with no frame either way for ``INACTIVITY_TIME`` seconds is
+    closed when ``INACTIVITY_TIME_ENABLED``. One that sent nothing for
+    ``FAQ_WS_HEARTBEAT_INTERVAL`` seconds is pinged, and closed if nothing
+    arrives within ``FAQ_WS_HEARTBEAT_TIMEOUT`` seconds. Heartbeats prove the
+    peer is alive but are not activity.
+    """
+
+    def __init__(self, tick: Optional[float] = None, slots: int = 512):
+        self.tick = tick or settings.FAQ_WS_IDLE_TICK
+        self._wheel: List[Set[_Entry]] = [set() for _ in range(slots)]
+        self._ticks = 0
+        self._entries: Dict[int, _Entry] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._started = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def register(self, connection: IdleConnection) -> None:
+        now = time.monotonic()
+        if self._task is None:
+            # Line the wheel's ticks up with now; it is empty while no task runs
+            self._started = now - self._ticks * self.tick
+            self._task = asyncio.create_task(self._run())
+        entry = _Entry(connection, now)
+        self._entries[id(connection)] = entry
+        self._file(entry, now)
+
+    def unregister(self, connection: IdleConnection) -> None:
+        entry = self._entries.pop(id(connection), None)
+        if entry is not None and entry.slot is not None:
+            self._wheel[entry.slot].discard(entry)
+        if not self._entries and self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+            # The next register starts a new task rather than waiting on this one to unwind
+            self._task = None
+
+    def activity(self, connection: IdleConnection) -> None:
+        """Record a frame sent or received, resetting the idle timer."""
+        entry = self._entries.get(id(connection))
+        if entry is not None:
+            entry.last_activity = time.monotonic()
+
+    def received(self, connection: IdleConnection, heartbeat: bool = False) -> None:
+        """Record a frame from the peer; heartbeats only prove it is alive."""
+        entry = self._entries.get(id(connection))
+        if entry is not None:
+            now = time.monotonic()
+            entry.last_received = now
+            entry.ping_sent_at = None
+            if not heartbeat:
+                entry.last_activity = now
+
+    def _file(self, entry: _Entry, now: float) -> None:
+        deadline = self._next_deadline(entry)
+        if deadline is None:
+            entry.slot = None
+            return
+        # Deadlines past the end of the wheel are filed in its last slot and looked at again then
+        ticks = min(max(math.ceil((deadline - now) / self.tick), 1), len(self._wheel) - 1)
+        entry.slot = (self._ticks + ticks) % len(self._wheel)
+        self._wheel[entry.slot].add(entry)
+
+    def _next_deadline(self, entry: _Entry) -> Optional[float]:
+        deadlines = []
+        if settings.INACTIVITY_TIME_ENABLED:
+            deadlines.append(entry.last_activity + settings.INACTIVITY_TIME)
+        if settings.FAQ_WS_HEARTBEAT_INTERVAL > 0:
+            if entry.ping_sent_at is not None:
+                deadlines.append(entry.ping_sent_at + settings.FAQ_WS_HEARTBEAT_TIMEOUT)
+            else:
+                deadlines.append(entry.last_received + settings.FAQ_WS_HEARTBEAT_INTERVAL)
+        return min(deadlines, default=None)
+
+    async def _run(self) -> None:
+        try:
+            while self._entries:
+                # Sleep to the next tick boundary so a slow tick does not push the others back
+                await asyncio.sleep(max(self._started + (self._ticks + 1) * self.tick - time.monotonic(), 0))
+                self._ticks += 1
+                slot = self._ticks % len(self._wheel)
+                due, self._wheel[slot] = self._wheel[slot], set()
+                for entry in due:
+                    await self._expire(entry)
+        finally:
+            # When cancelled by unregister, a newer task may already have taken its place
+            if self._task is asyncio.current_task():
+                self._task = None
+
+    async def _expire(self, entry: _Entry) -> None:
+        now = time.monotonic()
+        entry.slot = None
+        try:
+            if settings.INACTIVITY_TIME_ENABLED and now >= entry.last_activity + settings.INACTIVITY_TIME:
+                logger.info("Closing WebSocket due to inactivity")
+                self.unregister(entry.connection)
+                await entry.connection.close_idle("Connection closed due to inactivity.")
+                return
+            if settings.FAQ_WS_HEARTBEAT_INTERVAL > 0:
+                if entry.ping_sent_at is not None and now >= entry.ping_sent_at + settings.FAQ_WS_HEARTBEAT_TIMEOUT:
+                    logger.info("Closing WebSocket: no pong from peer")
+                    self.unregister(entry.connection)
+                    await entry.connection.close_idle("Connection closed: no heartbeat from client.")
+                    return
+                if entry.ping_sent_at is None and now >= entry.last_received + settings.FAQ_WS_HEARTBEAT_INTERVAL:
+                    entry.ping_sent_at = now
+                    await entry.connection.send_ping()
+        except Exception as e:
+            logger.error(f"Error expiring idle WebSocket: {str(e)}", exc_info=True)
+        if self._entries.get(id(entry.connection)) is entry:
+            self._file(entry, now)
+
+
+_managers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, IdleManager]" = weakref.WeakKeyDictionary()
+
+
+def get_idle_manager() -> IdleManager:
+    """The idle manager of the running event loop."""
+    loop = asyncio.get_running_loop()
+    manager = _managers.get(loop)
+    if manager is None:
+        manager = _managers[loop] = IdleManager()
+    return manager
@@ -0,0 +1,126 @@
+import logging
+from datetime import timedelta
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..exceptions import GenerationBusyException
+from ..models import FAQ, GenerationJob
+from ..services import generate_faq, make_title
+from .llm_scheduler import Priority, get_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """
+    Database-backed queue of FAQ generation jobs.
+
+    Jobs are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` so any number of
+    workers can share the table, and running jobs whose worker stopped sending
+    heartbeats are put back in the queue, so nothing is lost on restarts.
+    """
+
+    @staticmethod
+    def enqueue(user, content: str, number_of_faqs: int, tone: str, use_cache: bool = True) -> GenerationJob:
+        job = GenerationJob.objects.create(
+            user=user, content=content, number_of_faqs=number_of_faqs, tone=tone, use_cache=use_cache
+        )
+        logger.info(f"Queued generation job {job.id} for user {user.id}")
+        return job
+
+    @staticmethod
+    def claim_next() -> Optional[GenerationJob]:
+        """Mark the oldest pending job that is due as running and return it."""
+        now = timezone.now()
+        with transaction.atomic():
+            job = (
+                GenerationJob.objects.select_for_update(skip_locked=True)
+                .filter(Q(run_after__isnull=True) | Q(run_after__lte=now), status=GenerationJob.PENDING)
+                .order_by("created_at")
+                .first()
+            )
+            if job is None:
+                return None
+
+            job.status = GenerationJob.RUNNING
+            job.attempts += 1
+            job.started_at = now
+            job.heartbeat_at = now
+            job.save(update_fields=["status", "attempts", "started_at", "heartbeat_at", "updated_at"])
+
+        return job
+
+    @staticmethod
+    def heartbeat(job_ids: Iterable[int]) -> None:
+        job_ids = list(job_ids)
+        if job_ids:
+            GenerationJob.objects.filter(id__in=job_ids, status=GenerationJob.RUNNING).update(
+                heartbeat_at=timezone.now()
+            )
+
+    @staticmethod
+    def requeue_stale() -> int:
+        """Return abandoned running jobs to the queue, or fail them after too many attempts."""
+        cutoff = timezone.now() - timedelta(seconds=settings.FAQ_JOB_STALE_SECONDS)
+        stale = GenerationJob.objects.filter(status=GenerationJob.RUNNING, heartbeat_at__lt=cutoff)
+
+        failed = stale.filter(attempts__gte=settings.FAQ_JOB_MAX_ATTEMPTS).update(
+            status=GenerationJob.FAILED, error="Worker stopped responding", finished_at=timezone.now()
+        )
+        requeued = stale.update(status=GenerationJob.PENDING)
+
+        if failed or requeued:
+            logger.warning(f"Requeued {requeued} and failed {failed} stale generation jobs")
+        return requeued
+
+    @staticmethod
+    def run(job: GenerationJob) -> GenerationJob:
+        """Generate the FAQ for a claimed job and record the outcome."""
+        try:
+            generated_faqs = generate_faq(
+                job.content,
+                job.number_of_faqs,
+                job.tone,
+                use_cache=job.use_cache,
+                user_id=job.user_id,
+                priority=Priority.BACKGROUND,
+            )
+
+            with transaction.atomic():
+                faq = FAQ.objects.create(
+                    user_id=job.user_id,
+                    title=make_title(job.content),
+                    content=job.content,
+                    number_of_faqs=job.number_of_faqs,
+                    tone=job.tone,
+                )
+                FAQ.objects.add_question_answers(faq, generated_faqs)
+                job.faq = faq
+                job.status = GenerationJob.SUCCEEDED
+                job.error = ""
+                job.finished_at = timezone.now()
+                job.save(update_fields=["faq", "status", "error", "finished_at", "updated_at"])
+
+            logger.info(f"Generation job {job.id} succeeded with FAQ {faq.id}")
+
+        except GenerationBusyException:
+            # The LLM queue is full; give the attempt back and retry once a slot is likely free
+            delay = max(settings.FAQ_JOB_BUSY_RETRY_SECONDS, get_scheduler().estimated_wait())
+            logger.warning(f"Generation job {job.id} requeued for {delay:.0f}s, LLM queue is full")
+            job.status = GenerationJob.PENDING
+            job.attempts -= 1
+            job.run_after = timezone.now() + timedelta(seconds=delay)
+            job.save(update_fields=["status", "attempts", "run_after", "updated_at"])
+
+        except Exception as e:
+            logger.error(f"Generation job {job.id} failed: {str(e)}")
+            job.status = GenerationJob.FAILED
+            job.error = str(e.__cause__ or e)
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+
+        return job
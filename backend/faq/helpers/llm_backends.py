@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .chunking import CHARS_PER_TOKEN
+from .ollama_client import get_async_client, get_client
+
+logger = logging.getLogger(__name__)
+
+Messages = List[Dict[str, str]]
+
+
+@dataclass
+class LLMUsage:
+    """Token accounting reported by the model for one call; durations in seconds."""
+
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    eval_duration: Optional[float] = None
+
+
+UsageCallback = Optional[Callable[[LLMUsage], None]]
+
+
+class LLMBackendError(Exception):
+    """Raised by backends when the model call fails."""
+
+
+class LLMBackend:
+    """
+    Interface between the FAQ generators and a language model.
+
+    ``format`` is a JSON schema the output must follow (structured output).
+    ``chat`` and ``achat`` return the full message content; ``astream`` yields
+    it in pieces as the model produces them. ``on_usage`` is called with the
+    call's token counts once the model reports them.
+    """
+
+    model_name: str = ""
+
+    def chat(self, messages: Messages, format: Optional[Dict[str, Any]] = None, on_usage: UsageCallback = None) -> str:
+        raise NotImplementedError
+
+    async def achat(
+        self, messages: Messages, format: Optional[Dict[str, Any]] = None, on_usage: UsageCallback = None
+    ) -> str:
+        return "".join([piece async for piece in self.astream(messages, format, on_usage)])
+
+    async def astream(
+        self, messages: Messages, format: Optional[Dict[str, Any]] = None, on_usage: UsageCallback = None
+    ) -> AsyncIterator[str]:
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+
+class OllamaBackend(LLMBackend):
+    """Backend talking to Ollama through the process-wide pooled clients."""
+
+    def __init__(self, model: Optional[str] = None):
+        self.model_name = model or settings.OLLAMA_MODEL
+
+    def chat(self, messages: Messages, format: Optional[Dict[str, Any]] = None, on_usage: UsageCallback = None) -> str:
+        response = get_client().chat(model=self.model_name, messages=messages, format=format)
+        self._report_usage(response, on_usage)
+        return response.message.content
+
+    async def achat(
+        self, messages: Messages, format: Optional[Dict[str, Any]] = None, on_usage: UsageCallback = None
+    ) -> str:
+        response = await get_async_client().chat(model=self.model_name, messages=messages, format=format)
+        self._report_usage(response, on_usage)
+        return response["message"]["content"]
+
+    async def astream(
+        self, messages: Messages, format: Optional[Dict[str, Any]] = None, on_usage: UsageCallback = None
+    ) -> AsyncIterator[str]:
+        stream = await get_async_client().chat(model=self.model_name, messages=messages, stream=True, format=format)
+        # Closing the stream closes the HTTP response, which makes Ollama stop generating
+        async with aclosing(stream):
+            async for chunk in stream:
+                if "message" in chunk and "content" in chunk["message"]:
+                    yield chunk["message"]["content"]
+                # The final chunk carries the counters
+                if chunk.get("done"):
+                    self._report_usage(chunk, on_usage)
+
+    @staticmethod
+    def _report_usage(response, on_usage: UsageCallback) -> None:
+        if on_usage is None:
+            return
+
+        def field(name):
+            # Responses are subscriptable models, stream chunks may be plain mappings
+            try:
+                return response[name]
+            except (KeyError, TypeError):
+                return getattr(response, name, None)
+
+        eval_duration = field("eval_duration")
+        on_usage(
+            LLMUsage(
+                prompt_tokens=field("prompt_eval_count"),
+                completion_tokens=field("eval_count"),
+                # Ollama reports durations in nanoseconds
+                eval_duration=eval_duration / 1e9 if eval_duration else None,
+            )
+        )
+
+
+class FakeBackend(LLMBackend):
+    """
+    Deterministic stand-in for a model, for tests and benchmarks.
+
+    Answers with ``{"generated_faqs": [...]}`` holding the number of questions
+    the prompt asks for. Questions are derived from a digest of the prompt, so
+    the same prompt always gets the same output and different chunks of a
+    document get different questions. Output is emitted in tokens of
+    ``CHARS_PER_TOKEN`` characters at ``tokens_per_second`` (unlimited when
+    None) after ``time_to_first_token`` seconds.
+
+    Errors: ``error_rate`` fails that fraction of calls, drawn from a generator
+    seeded with ``seed``; ``fail_after_tokens`` breaks every stream after that
+    many tokens.
+    """
+
+    DEFAULT_QUESTIONS = 5
+
+    def __init__(
+        self,
+        question_answers: Optional[List[Dict[str, str]]] = None,
+        tokens_per_second: Optional[float] = None,
+        time_to_first_token: float = 0.0,
+        error_rate: float = 0.0,
+        fail_after_tokens: Optional[int] = None,
+        seed: int = 0,
+        model: str = "fake",
+    ):
+        self.model_name = model
+        self.question_answers = question_answers
+        self.tokens_per_second = tokens_per_second
+        self.time_to_first_token = time_to_first_token
+        self.error_rate = error_rate
+        self.fail_after_tokens = fail_after_tokens
+        self._random = random.Random(seed)
+        self._random_lock = Lock()
+        self.calls = 0
+
+    def chat(self, messages: Messages, format: Optional[Dict[str, Any]] = None, on_usage: UsageCallback = None) -> str:
+        tokens = self._start(messages)
+        time.sleep(self.time_to_first_token + self._token_delay() * max(len(tokens) - 1, 0))
+        content = "".join(self._check_tokens(tokens))
+        self._report_usage(messages, tokens, on_usage)
+        return content
+
+    async def astream(
+        self, messages: Messages, format: Optional[Dict[str, Any]] = None, on_usage: UsageCallback = None
+    ) -> AsyncIterator[str]:
+        tokens = self._start(messages)
+        await asyncio.sleep(self.time_to_first_token)
+        for index, token in enumerate(self._check_tokens(tokens)):
+            if index:
+                await asyncio.sleep(self._token_delay())
+            yield token
+        self._report_usage(messages, tokens, on_usage)
+
+    def render(self, messages: Messages) -> str:
+        """Return the full response content for ``messages``."""
+        prompt = messages[-1]["content"]
+        if self.question_answers is not None:
+            pairs = self.question_answers
+        else:
+            match = re.search(r"Generate (\d+)", prompt)
+            count = int(match.group(1)) if match else self.DEFAULT_QUESTIONS
+            digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+            pairs = [
+                {"question": f"Question {i + 1} about {digest}?", "answer": f"Answer {i + 1} about {digest}."}
+                for i in range(count)
+            ]
+        return json.dumps({"generated_faqs": pairs})
+
+    def _start(self, messages: Messages) -> List[str]:
+        with self._random_lock:
+            self.calls += 1
+            failed = self.error_rate and self._random.random() < self.error_rate
+        if failed:
+            raise LLMBackendError("Fake backend injected error")
+
+        content = self.render(messages)
+        return [content[i : i + CHARS_PER_TOKEN] for i in range(0, len(content), CHARS_PER_TOKEN)]
+
+    def _check_tokens(self, tokens: List[str]) -> Iterator[str]:
+        for index, token in enumerate(tokens):
+            if self.fail_after_tokens is not None and index >= self.fail_after_tokens:
+                raise LLMBackendError(f"Fake backend stream broken after {index} tokens")
+            yield token
+
+    def _report_usage(self, messages: Messages, tokens: List[str], on_usage: UsageCallback) -> None:
+        if on_usage is not None:
+            on_usage(
+                LLMUsage(
+                    prompt_tokens=sum(len(message["content"]) for message in messages) // CHARS_PER_TOKEN,
+                    completion_tokens=len(tokens),
+                    eval_duration=len(tokens) * self._token_delay() or None,
+                )
+            )
+
+    def _token_delay(self) -> float:
+        return 1 / self.tokens_per_second if self.tokens_per_second else 0.0
+
+
+_backend: Optional[LLMBackend] = None
+_backend_lock = Lock()
+
+
+def get_backend() -> LLMBackend:
+    """Return the process-wide backend configured by the ``LLM_BACKEND`` setting."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                config = settings.LLM_BACKEND
+                backend_class = import_string(config["BACKEND"])
+                _backend = backend_class(**config.get("OPTIONS", {}))
+                logger.info(f"Using LLM backend {config['BACKEND']} ({_backend.model_name})")
+    return _backend
+
+
+@receiver(setting_changed)
+def reset_backend(setting, **kwargs):
+    global _backend
+    if setting in ("LLM_BACKEND", "OLLAMA_MODEL"):
+        _backend = None
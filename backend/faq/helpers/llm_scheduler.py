@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Callable, Deque, Dict, Hashable, List, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Priority classes, served strictly in this order."""
+
+    INTERACTIVE = 0  # WebSocket generations a user is watching
+    BATCH = 1  # Synchronous REST requests
+    BACKGROUND = 2  # Queued generation jobs
+
+
+class SchedulerQueueFull(Exception):
+    """Raised when the wait queue is at capacity."""
+
+
+@dataclass(eq=False)
+class _Waiter:
+    user_key: Hashable
+    priority: Priority
+    wake: Callable[[], None]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    granted: bool = False
+
+
+class LLMScheduler:
+    """
+    Admission gate in front of the LLM.
+
+    At most ``max_in_flight`` generations run at once; everything else waits in
+    a bounded queue. Waiters are served by priority class, and round-robin
+    across users within a class, so one user's burst cannot starve others.
+    Usable from threads (``slot``) and coroutines (``aslot``) alike, sharing
+    the same limits.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, expected_hold: float = 30.0):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        # Seconds a slot is assumed to be held until holds have been measured
+        self.expected_hold = expected_hold
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiting = 0
+        # priority -> user -> waiters; OrderedDict order is the round-robin order
+        self._queues: Dict[Priority, "OrderedDict[Hashable, Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self._granted = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent_waits: Deque[float] = deque(maxlen=256)
+        self._recent_holds: Deque[float] = deque(maxlen=256)
+
+    @contextmanager
+    def slot(self, user_key: Hashable = None, priority: Priority = Priority.BATCH):
+        """Block the calling thread until a slot is free and hold it for the block."""
+        event = threading.Event()
+        waiter = self._enqueue(user_key, priority, event.set)
+        if waiter is not None:
+            event.wait()
+        held_since = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - held_since)
+
+    @asynccontextmanager
+    async def aslot(self, user_key: Hashable = None, priority: Priority = Priority.INTERACTIVE):
+        """Wait without blocking the event loop until a slot is free and hold it for the block."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        waiter = self._enqueue(user_key, priority, wake)
+        if waiter is not None:
+            try:
+                await future
+            except asyncio.CancelledError:
+                self._cancel(waiter)
+                raise
+        held_since = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - held_since)
+
+    def estimated_wait(self) -> float:
+        """Seconds a generation arriving now would wait for a slot, from the queue and the mean hold time."""
+        with self._lock:
+            return self._estimated_wait()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            recent = sorted(self._recent_waits)
+            return {
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self._in_flight,
+                "queue_depth": self._waiting,
+                "queue_depth_by_priority": {
+                    priority.name.lower(): sum(len(waiters) for waiters in self._queues[priority].values())
+                    for priority in Priority
+                },
+                "granted": self._granted,
+                "rejected": self._rejected,
+                "wait_seconds_total": round(self._wait_total, 6),
+                "wait_seconds_max": round(self._wait_max, 6),
+                "wait_seconds_p50": round(recent[len(recent) // 2], 6) if recent else 0.0,
+                "hold_seconds_mean": round(self._mean_hold(), 6),
+                "estimated_wait_seconds": round(self._estimated_wait(), 6),
+            }
+
+    def _mean_hold(self) -> float:
+        if not self._recent_holds:
+            return self.expected_hold
+        return sum(self._recent_holds) / len(self._recent_holds)
+
+    def _estimated_wait(self) -> float:
+        if self._in_flight < self.max_in_flight and self._waiting == 0:
+            return 0.0
+        # Slots free up max_in_flight times per mean hold; everyone queued goes first
+        return (self._waiting + 1) * self._mean_hold() / self.max_in_flight
+
+    def _enqueue(self, user_key: Hashable, priority: Priority, wake: Callable[[], None]) -> Optional[_Waiter]:
+        """Take a slot immediately (returns None) or queue a waiter that ``wake`` will notify."""
+        with self._lock:
+            if self._in_flight < self.max_in_flight and self._waiting == 0:
+                self._in_flight += 1
+                self._record_wait(0.0)
+                return None
+
+            if self._waiting >= self.max_queue:
+                self._rejected += 1
+                raise SchedulerQueueFull(f"LLM queue is full ({self._waiting} waiting)")
+
+            waiter = _Waiter(user_key=user_key, priority=priority, wake=wake)
+            self._queues[priority].setdefault(user_key, deque()).append(waiter)
+            self._waiting += 1
+            return waiter
+
+    def _release(self, held: Optional[float] = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if held is not None:
+                self._recent_holds.append(held)
+            woken = self._dispatch()
+        for waiter in woken:
+            waiter.wake()
+
+    def _cancel(self, waiter: _Waiter) -> None:
+        with self._lock:
+            if not waiter.granted:
+                waiters = self._queues[waiter.priority].get(waiter.user_key)
+                if waiters is not None and waiter in waiters:
+                    waiters.remove(waiter)
+                    self._waiting -= 1
+                    if not waiters:
+                        del self._queues[waiter.priority][waiter.user_key]
+                return
+        # The slot was handed over while we were being cancelled; pass it on
+        self._release()
+
+    def _dispatch(self) -> List[_Waiter]:
+        woken = []
+        while self._in_flight < self.max_in_flight:
+            waiter = self._pop_next()
+            if waiter is None:
+                break
+            waiter.granted = True
+            self._in_flight += 1
+            self._record_wait(time.monotonic() - waiter.enqueued_at)
+            woken.append(waiter)
+        return woken
+
+    def _pop_next(self) -> Optional[_Waiter]:
+        for priority in Priority:
+            users = self._queues[priority]
+            if not users:
+                continue
+            user_key, waiters = next(iter(users.items()))
+            waiter = waiters.popleft()
+            # Rotate the user to the back of the round-robin order
+            del users[user_key]
+            if waiters:
+                users[user_key] = waiters
+            self._waiting -= 1
+            return waiter
+        return None
+
+    def _record_wait(self, seconds: float) -> None:
+        self._granted += 1
+        self._wait_total += seconds
+        self._wait_max = max(self._wait_max, seconds)
+        self._recent_waits.append(seconds)
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """Return the process-wide scheduler configured from settings."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler(
+                    settings.LLM_MAX_IN_FLIGHT, settings.LLM_MAX_QUEUE, settings.LLM_EXPECTED_HOLD
+                )
+    return _scheduler
+
+
+@receiver(setting_changed)
+def reset_scheduler(setting, **kwargs):
+    global _scheduler
+    if setting in ("LLM_MAX_IN_FLIGHT", "LLM_MAX_QUEUE", "LLM_EXPECTED_HOLD"):
+        _scheduler = None
@@ -0,0 +1,278 @@
+import math
+from bisect import bisect_left
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+RATE_BUCKETS = (1, 2.5, 5, 10, 20, 40, 80, 160, 320)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(labelnames, values, strict=True))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}", *self._samples()]
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [per-bucket counts, sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+
+
+class Collector(_Metric):
+    """Values read from ``collect()`` at scrape time, for state kept elsewhere."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Dict[Tuple[str, ...], float]],
+        labelnames: Sequence[str] = (),
+        type: str = "gauge",
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+        self.type = type
+
+    def _samples(self) -> Iterable[str]:
+        for key, value in sorted(self.collect().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+GENERATION_LABELS = ("model", "tone", "number_of_faqs")
+
+QUEUE_WAIT = REGISTRY.register(
+    Histogram("faq_llm_queue_wait_seconds", "Time spent waiting for an LLM scheduler slot.", ("model", "priority"))
+)
+TIME_TO_FIRST_TOKEN = REGISTRY.register(
+    Histogram(
+        "faq_generation_time_to_first_token_seconds",
+        "Time from the LLM call to the first streamed token.",
+        GENERATION_LABELS,
+    )
+)
+TIME_TO_FIRST_QA = REGISTRY.register(
+    Histogram(
+        "faq_generation_time_to_first_qa_seconds",
+        "Time from the start of a generation to its first complete question/answer.",
+        GENERATION_LABELS,
+    )
+)
+GENERATION_DURATION = REGISTRY.register(
+    Histogram(
+        "faq_generation_duration_seconds",
+        "Total duration of a generation, queue wait included.",
+        (*GENERATION_LABELS, "mode", "status"),
+    )
+)
+PROMPT_TOKENS = REGISTRY.register(
+    Histogram(
+        "faq_llm_prompt_tokens", "Prompt tokens per LLM call (prompt_eval_count).", GENERATION_LABELS, TOKEN_BUCKETS
+    )
+)
+COMPLETION_TOKENS = REGISTRY.register(
+    Histogram(
+        "faq_llm_completion_tokens", "Generated tokens per LLM call (eval_count).", GENERATION_LABELS, TOKEN_BUCKETS
+    )
+)
+EVAL_DURATION = REGISTRY.register(
+    Histogram("faq_llm_eval_duration_seconds", "Model time spent generating tokens (eval_duration).", GENERATION_LABELS)
+)
+TOKENS_PER_SECOND = REGISTRY.register(
+    Histogram(
+        "faq_llm_tokens_per_second",
+        "Generation speed per LLM call (eval_count / eval_duration).",
+        GENERATION_LABELS,
+        RATE_BUCKETS,
+    )
+)
+WEBSOCKET_BYTES = REGISTRY.register(Counter("faq_websocket_sent_bytes_total", "Bytes sent to FAQ WebSocket clients."))
+WEBSOCKET_GENERATION_BYTES = REGISTRY.register(
+    Histogram(
+        "faq_websocket_generation_bytes", "Bytes sent to the socket per generation.", GENERATION_LABELS, BYTES_BUCKETS
+    )
+)
+
+ADMISSION_REJECTED = REGISTRY.register(
+    Counter(
+        "faq_admission_rejected_total",
+        "Generations turned away before reaching the LLM scheduler.",
+        ("reason",),
+    )
+)
+
+
+def generation_labels(model: str, tone: str, number_of_faqs: int) -> Dict[str, str]:
+    return {"model": model, "tone": tone, "number_of_faqs": str(number_of_faqs)}
+
+
+def record_usage(usage, **labels) -> None:
+    """Record the token counts an LLM call reported."""
+    if usage.prompt_tokens is not None:
+        PROMPT_TOKENS.observe(usage.prompt_tokens, **labels)
+    if usage.completion_tokens is not None:
+        COMPLETION_TOKENS.observe(usage.completion_tokens, **labels)
+    if usage.eval_duration:
+        EVAL_DURATION.observe(usage.eval_duration, **labels)
+        if usage.completion_tokens:
+            TOKENS_PER_SECOND.observe(usage.completion_tokens / usage.eval_duration, **labels)
+
+
+def _scheduler_gauges() -> Dict[Tuple[str, ...], float]:
+    from .llm_scheduler import get_scheduler
+
+    metrics = get_scheduler().metrics()
+    return {(name,): value for name, value in metrics["queue_depth_by_priority"].items()}
+
+
+def _scheduler_in_flight() -> Dict[Tuple[str, ...], float]:
+    from .llm_scheduler import get_scheduler
+
+    return {(): get_scheduler().metrics()["in_flight"]}
+
+
+def _scheduler_estimated_wait() -> Dict[Tuple[str, ...], float]:
+    from .llm_scheduler import get_scheduler
+
+    return {(): get_scheduler().estimated_wait()}
+
+
+def _cache_counters() -> Dict[Tuple[str, ...], float]:
+    from .generation_cache import GenerationCache
+
+    return {(result,): value for result, value in GenerationCache.stats().items()}
+
+
+REGISTRY.register(
+    Collector("faq_llm_queue_depth", "Generations waiting for an LLM slot.", _scheduler_gauges, ("priority",))
+)
+REGISTRY.register(Collector("faq_llm_in_flight", "Generations holding an LLM slot.", _scheduler_in_flight))
+REGISTRY.register(
+    Collector(
+        "faq_llm_estimated_wait_seconds",
+        "Estimated wait for an LLM slot of a generation arriving now.",
+        _scheduler_estimated_wait,
+    )
+)
+REGISTRY.register(
+    Collector(
+        "faq_generation_cache_lookups_total",
+        "Generation cache lookups since process start.",
+        _cache_counters,
+        ("result",),
+        type="counter",
+    )
+)
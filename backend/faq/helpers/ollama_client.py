@@ -0,0 +1,49 @@
+import asyncio
+import logging
+import weakref
+from threading import Lock
+from typing import Optional
+
+import httpx
+import ollama
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = Lock()
+_client: Optional[ollama.Client] = None
+# httpx async clients are bound to the event loop that created them
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ollama.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _client_options() -> dict:
+    return {
+        "host": settings.OLLAMA_HOST,
+        "timeout": settings.OLLAMA_TIMEOUT,
+        "limits": httpx.Limits(
+            max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OLLAMA_MAX_CONNECTIONS,
+        ),
+    }
+
+
+def get_client() -> ollama.Client:
+    """Return the process-wide Ollama client; its keep-alive pool is shared by all threads."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = ollama.Client(**_client_options())
+                logger.info("Created shared Ollama client")
+    return _client
+
+
+def get_async_client() -> ollama.AsyncClient:
+    """Return the Ollama async client shared by every coroutine on the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = ollama.AsyncClient(**_client_options())
+        _async_clients[loop] = client
+        logger.info("Created shared Ollama async client")
+    return client
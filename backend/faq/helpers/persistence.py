@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from ..models import FAQ, QuestionAnswer
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionAnswerBatchWriter:
+    """
+    Persist streamed QuestionAnswers for one FAQ in micro-batches.
+
+    Items are flushed with a single bulk insert once ``batch_size`` are
+    buffered or ``flush_interval`` seconds after the first buffered item,
+    whichever comes first. ``on_flush`` receives every saved batch in order.
+    """
+
+    def __init__(
+        self,
+        faq: FAQ,
+        on_flush: Callable[[List[QuestionAnswer]], Awaitable[None]],
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self.faq = faq
+        self.on_flush = on_flush
+        self.batch_size = batch_size or settings.FAQ_PERSIST_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else settings.FAQ_PERSIST_FLUSH_MS / 1000
+        self.saved: List[QuestionAnswer] = []
+        self._buffer: List[QuestionAnswer] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    async def add(self, question_answer: QuestionAnswer) -> None:
+        self._buffer.append(question_answer)
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Save everything buffered so far."""
+        async with self._lock:
+            self._cancel_timer()
+            batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+
+            saved = await sync_to_async(FAQ.objects.add_question_answers)(self.faq, batch)
+            logger.debug(f"Flushed {len(saved)} QuestionAnswers for FAQ {self.faq.id}")
+            self.saved.extend(saved)
+            await self.on_flush(saved)
+
+    async def close(self) -> None:
+        await self.flush()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        # Detach first so flush() does not cancel the task running it
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing QuestionAnswers: {str(e)}", exc_info=True)
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
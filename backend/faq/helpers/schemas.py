@@ -0,0 +1,12 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class QuestionAnswerSchema(BaseModel):
+    question: str = Field(..., min_length=1)
+    answer: str = Field(..., min_length=1)
+
+
+class FAQSchema(BaseModel):
+    generated_faqs: List[QuestionAnswerSchema]
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import weakref
+from concurrent.futures import Future
+from contextlib import aclosing
+from threading import Lock
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Receives the events a producer sends besides its items, e.g. progress
+Listener = Callable[..., Awaitable[Any]]
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running block until it finishes and get the same result (or
+    exception). Nothing is kept once the call returns, so this only covers the
+    window a result cache cannot.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls: Dict[str, Future] = {}
+        self._executed = 0
+        self._joined = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self._executed += 1
+            else:
+                self._joined += 1
+
+        if not leader:
+            logger.info(f"Joined in-flight generation: {key}")
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"executed": self._executed, "joined": self._joined, "in_flight": len(self._calls)}
+
+
+class _Flight(Generic[T]):
+    def __init__(self):
+        self.items: List[T] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.listeners: List[Listener] = []
+        self.changed = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+
+
+class AsyncSingleFlight(Generic[T]):
+    """
+    Fan one async stream out to every concurrent subscriber with the same key.
+
+    The first subscriber starts the producer in a background task. Later
+    subscribers first replay the items produced so far, then follow the live
+    stream. When the last subscriber leaves before the stream is finished the
+    producer is cancelled.
+
+    ``produce`` is called with a ``notify`` coroutine function; the arguments
+    it is awaited with are passed to the ``listener`` of every subscriber
+    still subscribed at that moment, not replayed to later ones.
+    """
+
+    def __init__(self):
+        # asyncio primitives belong to one event loop, so flights are kept per loop
+        self._flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _Flight[T]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._executed = 0
+        self._joined = 0
+
+    async def subscribe(
+        self,
+        key: str,
+        produce: Callable[[Callable[..., Awaitable[None]]], AsyncIterator[T]],
+        listener: Optional[Listener] = None,
+    ) -> AsyncIterator[T]:
+        flights = self._flights.setdefault(asyncio.get_running_loop(), {})
+        flight = flights.get(key)
+        if flight is None:
+            flight = flights[key] = _Flight()
+            flight.task = asyncio.create_task(self._run(flights, key, flight, produce))
+            self._executed += 1
+        else:
+            logger.info(f"Joined in-flight generation stream: {key}")
+            self._joined += 1
+
+        flight.subscribers += 1
+        if listener is not None:
+            flight.listeners.append(listener)
+        position = 0
+        try:
+            while True:
+                async with flight.changed:
+                    await flight.changed.wait_for(lambda seen=position: seen < len(flight.items) or flight.done)
+                    items = flight.items[position:]
+                position += len(items)
+                for item in items:
+                    yield item
+                if not items and flight.done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+        finally:
+            if listener is not None:
+                flight.listeners.remove(listener)
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                if flights.get(key) is flight:
+                    del flights[key]
+                flight.task.cancel()
+
+    async def _run(self, flights: Dict[str, _Flight[T]], key: str, flight: _Flight[T], produce) -> None:
+        async def notify(*args) -> None:
+            for listener in list(flight.listeners):
+                # Skip subscribers that left while an earlier one was notified
+                if listener not in flight.listeners:
+                    continue
+                try:
+                    await listener(*args)
+                except Exception as e:
+                    # One subscriber's failure must not stop the stream for the others
+                    logger.warning(f"Flight listener failed for {key}: {str(e)}", exc_info=True)
+
+        try:
+            # Closed explicitly so cancelling the flight also closes the producer's model stream
+            async with aclosing(produce(notify)) as items:
+                async for item in items:
+                    async with flight.changed:
+                        flight.items.append(item)
+                        flight.changed.notify_all()
+        except asyncio.CancelledError:
+            flight.error = asyncio.CancelledError()
+        except Exception as e:
+            flight.error = e
+        finally:
+            # Late arrivals must start a new flight rather than join a finished one
+            if flights.get(key) is flight:
+                del flights[key]
+            async with flight.changed:
+                flight.done = True
+                flight.changed.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "executed": self._executed,
+            "joined": self._joined,
+            "in_flight": sum(len(flights) for flights in list(self._flights.values())),
+        }
+
+
+generation_flights: SingleFlight = SingleFlight()
+stream_flights: AsyncSingleFlight = AsyncSingleFlight()
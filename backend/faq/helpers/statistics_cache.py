@@ -0,0 +1,103 @@
+import logging
+import threading
+import uuid
+from typing import Callable, Hashable, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+class StatisticsCache:
+    """
+    Per-user FAQ statistics in a Django cache.
+
+    Every user has a version token stored next to their statistics.
+    ``invalidate`` replaces the token, which makes the stored statistics stale
+    without deleting them: the first request to see that recomputes them
+    under a short lock, while concurrent requests keep getting the stale
+    statistics instead of all recomputing at once. Only a user with nothing
+    stored yet is computed without the lock.
+    """
+
+    def __init__(self, alias: str, ttl: Optional[float], lock_ttl: float):
+        self.cache = caches[alias]
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+
+    def get(self, user_id: Hashable, compute: Callable[[], dict]) -> dict:
+        entry_key, version_key = f"faq:stats:{user_id}", f"faq:stats:version:{user_id}"
+        values = self.cache.get_many([entry_key, version_key])
+        entry = values.get(entry_key)
+        version = values.get(version_key)
+        if version is None:
+            # Never invalidated, or evicted; statistics stored under an older token are stale
+            version = uuid.uuid4().hex
+            if not self.cache.add(version_key, version, None):
+                version = self.cache.get(version_key, version)
+
+        if entry is not None and entry["version"] == version:
+            return entry["stats"]
+
+        lock_key = f"faq:stats:lock:{user_id}"
+        locked = entry is not None
+        if locked and not self.cache.add(lock_key, 1, self.lock_ttl):
+            # Someone else is recomputing them
+            return entry["stats"]
+
+        try:
+            stats = compute()
+            self.cache.set(entry_key, {"version": version, "stats": stats}, self.ttl)
+        finally:
+            if locked:
+                self.cache.delete(lock_key)
+        return stats
+
+    def invalidate(self, user_id: Hashable) -> None:
+        self.cache.set(f"faq:stats:version:{user_id}", uuid.uuid4().hex, None)
+
+
+_statistics_cache: Optional[StatisticsCache] = None
+_statistics_cache_lock = threading.Lock()
+
+
+def get_statistics_cache() -> StatisticsCache:
+    """Return the process-wide statistics cache configured from settings."""
+    global _statistics_cache
+    if _statistics_cache is None:
+        with _statistics_cache_lock:
+            if _statistics_cache is None:
+                _statistics_cache = StatisticsCache(
+                    settings.FAQ_STATISTICS_CACHE,
+                    settings.FAQ_STATISTICS_CACHE_TTL,
+                    settings.FAQ_STATISTICS_CACHE_LOCK_TTL,
+                )
+    return _statistics_cache
+
+
+def invalidate_statistics(user_ids: Iterable[Hashable]) -> None:
+    """Mark the users' statistics stale once the current transaction commits."""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+
+    def invalidate():
+        statistics_cache = get_statistics_cache()
+        for user_id in user_ids:
+            try:
+                statistics_cache.invalidate(user_id)
+            except Exception as e:
+                logger.error(f"Failed to invalidate statistics of user {user_id}: {str(e)}", exc_info=True)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(setting_changed)
+def reset_statistics_cache(setting, **kwargs):
+    global _statistics_cache
+    if setting.startswith("FAQ_STATISTICS_CACHE") or setting == "CACHES":
+        _statistics_cache = None
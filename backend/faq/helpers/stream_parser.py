@@ -0,0 +1,162 @@
+import logging
+import re
+from typing import Dict, List, Optional
+
+from pydantic import ValidationError
+
+from .schemas import QuestionAnswerSchema
+
+logger = logging.getLogger(__name__)
+
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SIMPLE_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class FAQStreamParser:
+    """
+    Incremental, resumable JSON tokenizer for streamed ``FAQSchema`` output.
+
+    Every chunk passed to ``feed`` is scanned exactly once; state is kept
+    between calls so tokens may be split anywhere, including inside escape
+    sequences. Each object whose parent is an array is treated as a
+    question/answer pair and returned as soon as its closing brace arrives;
+    ``partial`` shows the pair still being streamed.
+    """
+
+    FIELDS = ("question", "answer")
+
+    def __init__(self):
+        # One [container, last_key] entry per open object or array
+        self._stack: List[list] = []
+        self._expect_key = False
+        self._in_string = False
+        self._string_is_key = False
+        self._chars: List[str] = []
+        # None outside an escape, "" right after a backslash, "u..." while reading \uXXXX
+        self._escape: Optional[str] = None
+        self._has_surrogates = False
+        self._current: Optional[dict] = None
+        self._current_depth = 0
+
+    def feed(self, text: str) -> List[QuestionAnswerSchema]:
+        """Consume the next chunk of model output and return the pairs it completed."""
+        completed: List[QuestionAnswerSchema] = []
+        index, length = 0, len(text)
+
+        while index < length:
+            if self._in_string:
+                index = self._consume_string(text, index)
+                continue
+
+            char = text[index]
+            if char == '"':
+                self._in_string = True
+                self._string_is_key = self._expect_key and bool(self._stack) and self._stack[-1][0] == "{"
+                self._chars = []
+            elif char == "{":
+                if self._current is None and self._stack and self._stack[-1][0] == "[":
+                    self._current = {}
+                    self._current_depth = len(self._stack) + 1
+                self._stack.append(["{", None])
+                self._expect_key = True
+            elif char == "[":
+                self._stack.append(["[", None])
+                self._expect_key = False
+            elif char in "}]":
+                if char == "}" and self._current is not None and len(self._stack) == self._current_depth:
+                    item = self._build_item(self._current)
+                    if item is not None:
+                        completed.append(item)
+                    self._current = None
+                if self._stack:
+                    self._stack.pop()
+                self._expect_key = False
+            elif char == ":":
+                self._expect_key = False
+            elif char == ",":
+                self._expect_key = bool(self._stack) and self._stack[-1][0] == "{"
+            index += 1
+
+        return completed
+
+    def partial(self) -> Optional[Dict[str, str]]:
+        """Return the question/answer text read so far of the pair being streamed, if any."""
+        if self._current is None:
+            return None
+        fields = {key: value for key, value in self._current.items() if key in self.FIELDS}
+        if self._in_string and not self._string_is_key and len(self._stack) == self._current_depth:
+            key = self._stack[-1][1]
+            if key in self.FIELDS:
+                value = "".join(self._chars)
+                # Keep the joined text so the next call only joins what arrived since
+                self._chars = [value]
+                fields[key] = self._decode(value) if self._has_surrogates else value
+        return fields
+
+    def _consume_string(self, text: str, index: int) -> int:
+        if self._escape is not None:
+            return self._consume_escape(text, index)
+
+        match = _STRING_SPECIAL.search(text, index)
+        if match is None:
+            self._chars.append(text[index:])
+            return len(text)
+
+        end = match.start()
+        if end > index:
+            self._chars.append(text[index:end])
+
+        if match.group() == "\\":
+            self._escape = ""
+        else:
+            self._finish_string()
+        return end + 1
+
+    def _consume_escape(self, text: str, index: int) -> int:
+        if self._escape == "":
+            char = text[index]
+            if char == "u":
+                self._escape = "u"
+            else:
+                self._chars.append(_SIMPLE_ESCAPES.get(char, char))
+                self._escape = None
+            return index + 1
+
+        # Collect the four hex digits of a \uXXXX escape, possibly across chunks
+        needed = 5 - len(self._escape)
+        self._escape += text[index : index + needed]
+        index += min(needed, len(text) - index)
+        if len(self._escape) == 5:
+            code = int(self._escape[1:], 16)
+            self._has_surrogates = self._has_surrogates or 0xD800 <= code <= 0xDFFF
+            self._chars.append(chr(code))
+            self._escape = None
+        return index
+
+    def _finish_string(self) -> None:
+        value = "".join(self._chars)
+        if self._has_surrogates:
+            value = self._decode(value)
+            self._has_surrogates = False
+        self._in_string = False
+        self._chars = []
+
+        if self._string_is_key:
+            self._stack[-1][1] = value
+        elif self._current is not None and len(self._stack) == self._current_depth:
+            key = self._stack[-1][1]
+            if key is not None:
+                self._current[key] = value
+
+    @staticmethod
+    def _decode(value: str) -> str:
+        # Recombine escaped surrogate pairs (e.g. emoji) into single characters
+        return value.encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+
+    @staticmethod
+    def _build_item(fields: dict) -> Optional[QuestionAnswerSchema]:
+        try:
+            return QuestionAnswerSchema(question=fields.get("question", ""), answer=fields.get("answer", ""))
+        except ValidationError:
+            logger.warning(f"Skipping incomplete question/answer object: {fields}")
+            return None
@@ -0,0 +1,29 @@
+import logging
+from typing import Any, Dict
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def user_group(user_id) -> str:
+    """Channel layer group every WebSocket of the user joins."""
+    return f"user_{user_id}"
+
+
+def send_user_event(user_id, message: Dict[str, Any]) -> None:
+    """Push ``message`` to every socket of the user once the current transaction commits."""
+    transaction.on_commit(lambda: _group_send(user_id, message))
+
+
+def _group_send(user_id, message: Dict[str, Any]) -> None:
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(user_group(user_id), {"type": "user.event", "message": message})
+    except Exception as e:
+        # Clients fall back to refetching; the write itself must not fail over a push
+        logger.error(f"Error pushing event to user {user_id}: {str(e)}", exc_info=True)
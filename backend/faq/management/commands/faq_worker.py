@@ -0,0 +1,100 @@
+import logging
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from faq.helpers.job_queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Process queued FAQ generation jobs.
+
+    Runs a pool of worker threads that claim jobs from the database, plus a
+    heartbeat thread that keeps running jobs alive and requeues jobs left
+    behind by workers that died.
+    """
+
+    help = "Process queued FAQ generation jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", "-n", type=int, default=4, help="Number of worker threads")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument(
+            "--once", action="store_true", default=False, help="Exit once the queue is empty instead of polling"
+        )
+
+    def handle(self, *args, **options):
+        self.stop_event = threading.Event()
+        self.running_jobs = set()
+        self.running_lock = threading.Lock()
+        self.processed = 0
+
+        previous_handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                previous_handlers[signum] = signal.signal(signum, self.request_stop)
+
+        try:
+            JobQueue.requeue_stale()
+
+            heartbeat = threading.Thread(target=self.heartbeat_loop, daemon=True)
+            heartbeat.start()
+
+            workers = [
+                threading.Thread(target=self.work_loop, args=(options["poll_interval"], options["once"]))
+                for _ in range(options["concurrency"])
+            ]
+            self.stdout.write(f"Starting {len(workers)} generation workers")
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            self.stop_event.set()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+        self.stdout.write(self.style.SUCCESS(f"Worker stopped after processing {self.processed} jobs"))
+
+    def request_stop(self, *_args):
+        self.stdout.write("Stopping after the running jobs finish...")
+        self.stop_event.set()
+
+    def work_loop(self, poll_interval: float, once: bool):
+        try:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                job = JobQueue.claim_next()
+                if job is None:
+                    if once:
+                        return
+                    self.stop_event.wait(poll_interval)
+                    continue
+
+                with self.running_lock:
+                    self.running_jobs.add(job.id)
+                try:
+                    JobQueue.run(job)
+                finally:
+                    with self.running_lock:
+                        self.running_jobs.discard(job.id)
+                        self.processed += 1
+        finally:
+            connection.close()
+
+    def heartbeat_loop(self):
+        while not self.stop_event.wait(settings.FAQ_JOB_HEARTBEAT_SECONDS):
+            try:
+                close_old_connections()
+                with self.running_lock:
+                    job_ids = list(self.running_jobs)
+                JobQueue.heartbeat(job_ids)
+                JobQueue.requeue_stale()
+            except Exception as e:
+                logger.error(f"Heartbeat failed: {str(e)}")
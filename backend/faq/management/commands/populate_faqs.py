@@ -3,7 +3,8 @@ from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
-from faq.models import FAQ, QuestionAnswer
+from faq.helpers.statistics_cache import invalidate_statistics
+from faq.models import FAQ, FAQDailyRollup, QuestionAnswer
 
 User = get_user_model()
 
@@ -80,23 +81,23 @@ class Command(BaseCommand):
                 ('Can I share FAQs?', 'Yes, FAQs can be shared with others.')
             ]
 
-            # Create FAQs and their Q&As
-            for _ in range(quantity):
-                faq = FAQ.objects.create(
+            # Create FAQs and their Q&As in bulk
+            faqs = FAQ.objects.bulk_create(
+                FAQ(
                     title=titles[_ % len(titles)],
                     content=contents[_ % len(contents)],
                     tone=FAQ.TONE_CHOICES[_ % len(FAQ.TONE_CHOICES)][0],
                     user=user
                 )
-                
-                # Create Q&As for each FAQ
-                for question, answer in qa_pairs:
-                    qa = QuestionAnswer.objects.create(
-                        question=question,
-                        answer=answer
-                    )
-                    
-                    faq.generated_faqs.add(qa)
+                for _ in range(quantity)
+            )
+            FAQ.objects.bulk_add_question_answers(
+                (faq, [QuestionAnswer(question=question, answer=answer) for question, answer in qa_pairs])
+                for faq in faqs
+            )
+            # bulk_create sends no post_save, so the new FAQs are missing from the rollups
+            FAQDailyRollup.objects.rebuild([user.id])
+            invalidate_statistics([user.id])
 
             # Handle transaction
             if commit:
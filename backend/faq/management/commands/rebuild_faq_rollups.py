@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from faq.helpers.statistics_cache import invalidate_statistics
+from faq.models import FAQDailyRollup
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Recount the daily FAQ rollups from the FAQs.
+
+    The rollups are kept up to date as FAQs change and are filled in by their
+    migration; this repairs them after changes that bypass model signals, such
+    as ``QuerySet.update`` or raw SQL. Users are checked in batches and only
+    those whose rollups are wrong are rewritten.
+    """
+
+    help = "Recount the daily FAQ rollups used by the statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", "-u", type=int, action="append", dest="users", help="Only this user id")
+        parser.add_argument("--batch-size", type=int, default=500, help="Users checked per transaction")
+        parser.add_argument(
+            "--dry-run", action="store_true", default=False, help="Report the users with wrong rollups only"
+        )
+
+    def handle(self, *args, **options):
+        user_ids = options["users"] or list(User.objects.order_by("id").values_list("id", flat=True))
+        batch_size = options["batch_size"]
+
+        wrong = []
+        for start in range(0, len(user_ids), batch_size):
+            wrong += FAQDailyRollup.objects.rebuild(user_ids[start : start + batch_size], dry_run=options["dry_run"])
+        if not options["dry_run"]:
+            invalidate_statistics(wrong)
+
+        verb = "Would rebuild" if options["dry_run"] else "Rebuilt"
+        self.stdout.write(f"{verb} the rollups of {len(wrong)} of {len(user_ids)} users")
+        if wrong and options["verbosity"] > 1:
+            self.stdout.write("User ids: " + ", ".join(str(user_id) for user_id in wrong))
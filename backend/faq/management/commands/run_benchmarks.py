@@ -0,0 +1,93 @@
+import importlib
+import json
+import logging
+import platform
+import subprocess
+import time
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from benchmarks import SUITES
+from benchmarks.utils import benchmark_database
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Run the performance benchmark suites and write the results as JSON.
+
+    Every suite runs against a throwaway test database, flushed between
+    suites, and the FakeBackend where a model is involved, so results can be
+    diffed between releases.
+    """
+
+    help = "Run the performance benchmarks and write the results as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--suite",
+            "-s",
+            action="append",
+            choices=sorted(SUITES),
+            help="Suite to run, may be repeated (default: all)",
+        )
+        parser.add_argument(
+            "--quick", action="store_true", default=False, help="Run small sizes, e.g. as a smoke test on CI"
+        )
+        parser.add_argument("--output", "-o", help="File to write the JSON results to (default: stdout)")
+
+    def handle(self, *args, **options):
+        suites = options["suite"] or list(SUITES)
+        report = {"meta": self.metadata(options["quick"]), "results": {}}
+        failed = []
+
+        with benchmark_database():
+            for name in suites:
+                module_name, full_options, quick_options = SUITES[name]
+                self.stderr.write(f"Running {name}...")
+                start = time.perf_counter()
+                try:
+                    module = importlib.import_module(module_name)
+                    result = module.run(**(quick_options if options["quick"] else full_options))
+                except Exception as e:
+                    logger.exception(f"Benchmark {name} failed")
+                    result = {"error": f"{type(e).__name__}: {e}"}
+                    failed.append(name)
+                finally:
+                    call_command("flush", interactive=False, verbosity=0)
+                report["results"][name] = {"duration_s": round(time.perf_counter() - start, 3), **result}
+
+        output = json.dumps(report, indent=2, default=str)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+            self.stderr.write(self.style.SUCCESS(f"Wrote results to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        if failed:
+            raise CommandError(f"Benchmarks failed: {', '.join(failed)}")
+
+    def metadata(self, quick: bool) -> dict:
+        try:
+            revision = subprocess.run(
+                ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            revision = None
+
+        return {
+            "timestamp": timezone.now().isoformat(),
+            "revision": revision,
+            "quick": quick,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "llm_backend": settings.LLM_BACKEND["BACKEND"],
+        }
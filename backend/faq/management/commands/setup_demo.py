@@ -38,8 +38,9 @@ class Command(BaseCommand):
                     },
                 ]
 
-                for q in questions:
-                    QuestionAnswer.objects.create(faq=faq, question=q["question"], answer=q["answer"])
+                FAQ.objects.add_question_answers(
+                    faq, [QuestionAnswer(question=q["question"], answer=q["answer"]) for q in questions]
+                )
 
                 self.stdout.write("Created demo FAQ with sample questions")
 
@@ -1,8 +1,12 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
 
-from django.db import models
-from django.db.models import Count
-from django.db.models.functions import TruncDate, TruncMonth
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .signals import question_answers_added
 
 
 class FAQManager(models.Manager):
@@ -10,33 +14,236 @@ class FAQManager(models.Manager):
         """Get FAQs for a specific user."""
         return self.filter(user=user).order_by("-created_at").prefetch_related("generated_faqs")
 
-    def get_monthly_trends(self, queryset=None) -> models.QuerySet:
-        """Get monthly trends for the last 6 months."""
+    def get_user_faq_list(self, user, with_question_answers: bool = False) -> models.QuerySet:
+        """
+        Get FAQs of a user for listing: without their content, with the number
+        of question/answers as ``question_count`` and, if asked for, the
+        question/answers themselves.
+        """
+        faqs = (
+            self.filter(user=user)
+            .order_by("-created_at")
+            .defer("content")
+            .annotate(question_count=Coalesce(Subquery(self._question_counts()), 0))
+        )
+        return faqs.prefetch_related("generated_faqs") if with_question_answers else faqs
+
+    def add_question_answers(self, faq, question_answers: Sequence) -> List:
+        """Save unsaved QuestionAnswers to ``faq`` in bulk, after the ones it already has."""
+        return self.bulk_add_question_answers([(faq, question_answers)])
+
+    def bulk_add_question_answers(self, items: Iterable[Tuple[models.Model, Sequence]]) -> List:
+        """
+        Save unsaved QuestionAnswers for many FAQs with one INSERT.
+
+        They are numbered after each FAQ's existing question/answers in input
+        order; the FAQ rows stay locked until the transaction ends, so
+        concurrent adds to the same FAQ are numbered one after the other.
+        Returns the created QuestionAnswers in input order, with primary keys
+        set.
+        """
+        items = [(faq, list(question_answers)) for faq, question_answers in items]
+        question_answers = [qa for _, faq_question_answers in items for qa in faq_question_answers]
+        if not question_answers:
+            return []
+
+        question_answer_model = self.model.generated_faqs.field.model
+
+        faq_ids = {faq.id for faq, _ in items}
+        with transaction.atomic(using=self.db):
+            # Locked in id order, so adds to overlapping FAQs cannot deadlock
+            list(self.filter(pk__in=faq_ids).order_by("pk").select_for_update().values_list("pk", flat=True))
+            positions = dict(
+                question_answer_model.objects.filter(faq_id__in=faq_ids)
+                .order_by()
+                .values("faq_id")
+                .annotate(next_position=Max("position") + 1)
+                .values_list("faq_id", "next_position")
+            )
+            for faq, faq_question_answers in items:
+                position = positions.get(faq.id, 0)
+                for qa in faq_question_answers:
+                    qa.faq = faq
+                    qa.position = position
+                    position += 1
+                positions[faq.id] = position
+            created = question_answer_model.objects.bulk_create(question_answers)
+
+            for faq, faq_question_answers in items:
+                if faq_question_answers:
+                    question_answers_added.send(sender=self.model, faq=faq, question_answers=faq_question_answers)
+
+        return created
+
+    def get_statistics(self, queryset=None, now: Optional[datetime] = None) -> dict:
+        """
+        Count FAQs and their question/answers, per month for the last 6 months,
+        per day for the last 7 days and per tone, in one aggregate query.
+
+        Months and days are ``(start, count)`` pairs in the current time zone
+        and tones ``(tone, count)`` pairs, most used first; empty ones are left out.
+        """
         qs = queryset if queryset is not None else self.all()
-        six_months_ago = datetime.now() - timedelta(days=180)
+        now = timezone.localtime(now)
+        months_since = now - timedelta(days=180)
+        days_since = now - timedelta(days=7)
+        months = _buckets(months_since, _start_of_day(months_since).replace(day=1), now, _next_month)
+        days = _buckets(days_since, _start_of_day(days_since), now, _next_day)
+        tones = [tone for tone, _ in self.model.TONE_CHOICES]
+
+        aggregates = {
+            "total_faqs": Count("id"),
+            "total_questions": Coalesce(Sum(Subquery(self._question_counts())), 0),
+        }
+        for prefix, buckets in (("month", months), ("day", days)):
+            for index, (lower, upper) in enumerate(buckets):
+                aggregates[f"{prefix}_{index}"] = Count("id", filter=Q(created_at__gte=lower, created_at__lt=upper))
+        for tone in tones:
+            aggregates[f"tone_{tone}"] = Count("id", filter=Q(tone=tone))
+
+        counts = qs.aggregate(**aggregates)
+
+        tone_counts = [(tone, counts[f"tone_{tone}"]) for tone in tones]
+        # Tones outside the choices, e.g. from before they were introduced
+        tone_counts.append(("", counts["total_faqs"] - sum(count for _, count in tone_counts)))
+        return {
+            "total_faqs": counts["total_faqs"],
+            "total_questions": counts["total_questions"],
+            "months": _non_empty(months, counts, "month"),
+            "days": _non_empty(days, counts, "day"),
+            "tones": _most_used(tone_counts),
+        }
 
+    def _question_counts(self) -> models.QuerySet:
+        """Subquery counting the question/answers of the outer FAQ, from the (faq, position) index."""
+        question_answer_model = self.model.generated_faqs.field.model
         return (
-            qs.filter(created_at__gte=six_months_ago)
-            .annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(count=Count("id"))
-            .order_by("month")
+            question_answer_model.objects.filter(faq_id=OuterRef("pk"))
+            .order_by()
+            .values("faq_id")
+            .annotate(count=Count("*"))
+            .values("count")
         )
 
-    def get_daily_trends(self, queryset=None) -> models.QuerySet:
-        """Get daily trends for the last 7 days."""
-        qs = queryset if queryset is not None else self.all()
-        seven_days_ago = datetime.now() - timedelta(days=7)
 
-        return (
-            qs.filter(created_at__gte=seven_days_ago)
-            .annotate(day=TruncDate("created_at"))
+class FAQDailyRollupManager(models.Manager):
+    def add(self, user_id: Hashable, day: date, tone: str, faqs: int = 0, questions: int = 0) -> None:
+        """Add to the counts of one user, day and tone; negative amounts subtract."""
+        if not faqs and not questions:
+            return
+        rows = self.filter(user_id=user_id, day=day, tone=tone)
+        changes = {"faq_count": F("faq_count") + faqs, "question_count": F("question_count") + questions}
+        if rows.update(**changes) or faqs < 0 or questions < 0:
+            # Nothing to subtract from when the rollups are deleted along with their user
+            return
+        try:
+            with transaction.atomic(using=self.db):
+                self.create(user_id=user_id, day=day, tone=tone, faq_count=faqs, question_count=questions)
+        except IntegrityError:
+            # Created by a concurrent transaction in the meantime
+            rows.update(**changes)
+
+    def add_for_faq(self, faq, faqs: int = 0, questions: int = 0) -> None:
+        """Count ``faqs`` and ``questions`` under the user, creation day and tone of ``faq``."""
+        self.add(faq.user_id, timezone.localdate(faq.created_at), faq.tone, faqs, questions)
+
+    def get_statistics(self, user, now: Optional[datetime] = None) -> dict:
+        """
+        The same figures as ``FAQManager.get_statistics`` for all of the user's
+        FAQs, read from the rollups: the cost grows with the days, not the FAQs.
+
+        Months and days are whole calendar days here, so the first day of each
+        window counts in full.
+        """
+        now = timezone.localtime(now)
+        rows = self.filter(user=user).order_by()
+        tones = list(rows.values("tone").annotate(faqs=Sum("faq_count"), questions=Sum("question_count")))
+        per_day = list(
+            rows.filter(day__gte=(now - timedelta(days=180)).date())
             .values("day")
-            .annotate(count=Count("id"))
+            .annotate(faqs=Sum("faq_count"))
             .order_by("day")
         )
 
-    def get_tone_distribution(self, queryset=None) -> models.QuerySet:
-        """Get tone distribution statistics."""
-        qs = queryset if queryset is not None else self.all()
-        return qs.values("tone").annotate(value=Count("id")).order_by("-value")
+        months: Dict[date, int] = {}
+        for row in per_day:
+            month = row["day"].replace(day=1)
+            months[month] = months.get(month, 0) + row["faqs"]
+        days_since = (now - timedelta(days=7)).date()
+        return {
+            "total_faqs": sum(row["faqs"] for row in tones),
+            "total_questions": sum(row["questions"] for row in tones),
+            "months": [(month, count) for month, count in months.items() if count],
+            "days": [(row["day"], row["faqs"]) for row in per_day if row["day"] >= days_since and row["faqs"]],
+            "tones": _most_used((row["tone"], row["faqs"]) for row in tones),
+        }
+
+    def rebuild(self, user_ids: Iterable[Hashable], dry_run: bool = False) -> List[Hashable]:
+        """Recount the users' rollups from their FAQs; return the users whose rollups were wrong."""
+        from .models import FAQ
+
+        user_ids = list(user_ids)
+        with transaction.atomic(using=self.db):
+            actual: Dict[Hashable, dict] = {}
+            rows = self.select_for_update().filter(user_id__in=user_ids)
+            for user_id, day, tone, faq_count, question_count in rows.values_list(
+                "user_id", "day", "tone", "faq_count", "question_count"
+            ):
+                if faq_count or question_count:
+                    actual.setdefault(user_id, {})[(day, tone)] = (faq_count, question_count)
+
+            expected: Dict[Hashable, dict] = {}
+            counts = (
+                FAQ.objects.filter(user_id__in=user_ids)
+                .annotate(day=TruncDate("created_at"))
+                .values("user_id", "day", "tone")
+                .annotate(faq_count=Count("id", distinct=True), question_count=Count("generated_faqs"))
+                .order_by()
+            )
+            for row in counts:
+                expected.setdefault(row["user_id"], {})[(row["day"], row["tone"])] = (
+                    row["faq_count"],
+                    row["question_count"],
+                )
+
+            wrong = [user_id for user_id in user_ids if actual.get(user_id, {}) != expected.get(user_id, {})]
+            if wrong and not dry_run:
+                self.filter(user_id__in=wrong).delete()
+                self.bulk_create(
+                    self.model(user_id=user_id, day=day, tone=tone, faq_count=faq_count, question_count=question_count)
+                    for user_id in wrong
+                    for (day, tone), (faq_count, question_count) in expected.get(user_id, {}).items()
+                )
+        return wrong
+
+
+def _most_used(counts: Iterable[Tuple[str, int]]) -> List[Tuple[str, int]]:
+    return sorted(((key, count) for key, count in counts if count), key=lambda item: (-item[1], item[0]))
+
+
+def _start_of_day(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_day(start: datetime) -> datetime:
+    return start + timedelta(days=1)
+
+
+def _next_month(start: datetime) -> datetime:
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def _buckets(since: datetime, start: datetime, now: datetime, step) -> List[Tuple[datetime, datetime]]:
+    """(lower, upper) bounds of the calendar buckets from ``start`` up to ``now``, the first one cut at ``since``."""
+    buckets = []
+    while start <= now:
+        end = step(start)
+        buckets.append((max(start, since), end))
+        start = end
+    return buckets
+
+
+def _non_empty(buckets, counts: dict, prefix: str) -> List[Tuple[datetime, int]]:
+    return [
+        (lower, counts[f"{prefix}_{index}"]) for index, (lower, _) in enumerate(buckets) if counts[f"{prefix}_{index}"]
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.5 on 2026-10-18 20:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    FAQ = apps.get_model("faq", "FAQ")
+    FAQDailyRollup = apps.get_model("faq", "FAQDailyRollup")
+    db = schema_editor.connection.alias
+    counts = (
+        FAQ.objects.using(db)
+        .annotate(day=TruncDate("created_at"))
+        .values("user_id", "day", "tone")
+        .annotate(faq_count=Count("id", distinct=True), question_count=Count("generated_faqs"))
+        .order_by()
+    )
+    FAQDailyRollup.objects.using(db).bulk_create((FAQDailyRollup(**row) for row in counts), batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faq', '0008_generationsession'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FAQDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('tone', models.CharField()),
+                ('faq_count', models.IntegerField(default=0)),
+                ('question_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='faq',
+            index=models.Index(fields=['user', '-created_at'], name='faq_user_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='faqdailyrollup',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='faq_daily_rollups', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='faqdailyrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'day', 'tone'), name='faq_daily_rollup_unique'),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.5 on 2026-10-18 20:34
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the index without blocking writes to the question/answers
+    atomic = False
+
+    dependencies = [
+        ('faq', '0009_faqdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='questionanswer',
+            options={'ordering': ['position', 'id']},
+        ),
+        # Nullable until 0011 fills it in; named once FAQ.generated_faqs is gone in 0012
+        migrations.AddField(
+            model_name='questionanswer',
+            name='faq',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='faq.faq'),
+        ),
+        migrations.AddField(
+            model_name='questionanswer',
+            name='position',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        AddIndexConcurrently(
+            model_name='questionanswer',
+            index=models.Index(fields=['faq', 'position'], name='faq_qa_position_idx'),
+        ),
+    ]
@@ -0,0 +1,105 @@
+from django.db import migrations, transaction
+
+# FAQs (with all of their question/answers) moved per transaction
+BATCH_SIZE = 500
+
+
+def link_question_answers(apps, schema_editor):
+    """
+    Point every question/answer at its FAQ, numbered in the order it was linked.
+
+    Runs in batches of FAQs, each in its own transaction, and can be rerun
+    after a failure. A question/answer linked to several FAQs is copied for
+    each one after the first; those linked to none are deleted.
+    """
+    FAQ = apps.get_model("faq", "FAQ")
+    QuestionAnswer = apps.get_model("faq", "QuestionAnswer")
+    Link = FAQ.generated_faqs.through
+    db = schema_editor.connection.alias
+
+    last_id = 0
+    while True:
+        faq_ids = list(
+            FAQ.objects.using(db).filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:BATCH_SIZE]
+        )
+        if not faq_ids:
+            break
+        last_id = faq_ids[-1]
+
+        with transaction.atomic(using=db):
+            links = list(
+                Link.objects.using(db)
+                .filter(faq_id__in=faq_ids)
+                .order_by("faq_id", "id")
+                .values_list("id", "faq_id", "questionanswer_id")
+            )
+            question_answers = (
+                QuestionAnswer.objects.using(db)
+                .only("faq_id", "position")
+                .in_bulk({question_answer_id for _, _, question_answer_id in links})
+            )
+            positions = {}
+            linked = []
+            for link_id, faq_id, question_answer_id in links:
+                position = positions.get(faq_id, 0)
+                positions[faq_id] = position + 1
+                question_answer = question_answers[question_answer_id]
+                if question_answer.faq_id in (None, faq_id):
+                    question_answer.faq_id = faq_id
+                    question_answer.position = position
+                    linked.append(question_answer)
+                else:
+                    # Already taken by another FAQ; relinking to the copy makes a rerun skip it
+                    copy = QuestionAnswer.objects.using(db).create(
+                        faq_id=faq_id,
+                        position=position,
+                        question=question_answer.question,
+                        answer=question_answer.answer,
+                    )
+                    Link.objects.using(db).filter(id=link_id).update(questionanswer_id=copy.id)
+            QuestionAnswer.objects.using(db).bulk_update(linked, ["faq", "position"], batch_size=1000)
+
+    # Orphans: nothing shows them, and the column becomes required in 0012
+    while True:
+        orphan_ids = list(
+            QuestionAnswer.objects.using(db).filter(faq__isnull=True).values_list("id", flat=True)[: BATCH_SIZE * 10]
+        )
+        if not orphan_ids:
+            break
+        QuestionAnswer.objects.using(db).filter(id__in=orphan_ids).delete()
+
+
+def unlink_question_answers(apps, schema_editor):
+    FAQ = apps.get_model("faq", "FAQ")
+    QuestionAnswer = apps.get_model("faq", "QuestionAnswer")
+    Link = FAQ.generated_faqs.through
+    db = schema_editor.connection.alias
+
+    last_id = 0
+    while True:
+        rows = list(
+            QuestionAnswer.objects.using(db)
+            .filter(id__gt=last_id, faq__isnull=False)
+            .order_by("id")
+            .values_list("id", "faq_id")[: BATCH_SIZE * 10]
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        Link.objects.using(db).bulk_create(
+            [Link(faq_id=faq_id, questionanswer_id=question_answer_id) for question_answer_id, faq_id in rows],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+    # Every batch commits on its own
+    atomic = False
+
+    dependencies = [
+        ("faq", "0010_questionanswer_faq"),
+    ]
+
+    operations = [
+        migrations.RunPython(link_question_answers, unlink_question_answers),
+    ]
@@ -0,0 +1,37 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Each step commits on its own, so ADD CONSTRAINT's exclusive lock is released
+    # before VALIDATE scans the table under a lock that lets writes through
+    atomic = False
+
+    dependencies = [
+        ('faq', '0011_link_question_answers'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='faq',
+            name='generated_faqs',
+        ),
+        # A validated check lets SET NOT NULL skip scanning the table under its exclusive lock
+        migrations.RunSQL(
+            'ALTER TABLE faq_questionanswer ADD CONSTRAINT faq_qa_faq_not_null CHECK (faq_id IS NOT NULL) NOT VALID',
+            'ALTER TABLE faq_questionanswer DROP CONSTRAINT faq_qa_faq_not_null',
+        ),
+        migrations.RunSQL(
+            'ALTER TABLE faq_questionanswer VALIDATE CONSTRAINT faq_qa_faq_not_null',
+            migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name='questionanswer',
+            name='faq',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='generated_faqs', to='faq.faq'),
+        ),
+        migrations.RunSQL(
+            'ALTER TABLE faq_questionanswer DROP CONSTRAINT faq_qa_faq_not_null',
+            'ALTER TABLE faq_questionanswer ADD CONSTRAINT faq_qa_faq_not_null CHECK (faq_id IS NOT NULL) NOT VALID',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 20:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faq', '0012_remove_faq_generated_faqs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationjob',
+            name='run_after',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,8 +1,10 @@
 # faq/models.py
+import uuid
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 
-from .managers import FAQManager
+from .managers import FAQDailyRollupManager, FAQManager
 
 User = get_user_model()
 
@@ -16,12 +18,25 @@ class ModelBase(models.Model):
 
 
 class QuestionAnswer(ModelBase):
+    # Indexed together with the position below
+    faq = models.ForeignKey("FAQ", on_delete=models.CASCADE, related_name="generated_faqs", db_index=False)
+    # Order the question/answer was generated in within its FAQ, from 0
+    position = models.PositiveIntegerField(default=0)
     question = models.CharField(max_length=255)
     answer = models.TextField()
 
+    class Meta:
+        ordering = ["position", "id"]
+        indexes = [models.Index(fields=["faq", "position"], name="faq_qa_position_idx")]
+
     def __str__(self):
         return self.question
 
+    def save(self, *args, **kwargs):
+        # The daily rollups are updated from the save signals; commit them together
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
 
 class FAQ(ModelBase):
     TONE_CHOICES = [
@@ -32,12 +47,139 @@ class FAQ(ModelBase):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="faqs")
     title = models.CharField(max_length=255)
     content = models.TextField()
-    generated_faqs = models.ManyToManyField(QuestionAnswer, blank=True)
     number_of_faqs = models.PositiveIntegerField(default=3)
     tone = models.CharField(choices=TONE_CHOICES, default="neutral")
     category = models.CharField(max_length=255, default="General")
 
     objects = FAQManager()
 
+    class Meta:
+        # The user's FAQs newest first: the list and the last FAQ in the statistics
+        indexes = [models.Index(fields=["user", "-created_at"], name="faq_user_created_idx")]
+
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the rollup receivers tell without a query whether a save moves the FAQ to another user or tone
+        loaded = dict(zip(field_names, values, strict=True))
+        if "user_id" in loaded and "tone" in loaded:
+            instance._loaded_rollup_key = (loaded["user_id"], loaded["tone"])
+        return instance
+
+    def save(self, *args, **kwargs):
+        # The daily rollups are updated from the save signals; commit them together
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
+
+class FAQDailyRollup(models.Model):
+    """
+    FAQs and their question/answers per user, creation day and tone.
+
+    Kept up to date by the FAQ and question/answer signals in ``faq.receivers``,
+    in the same transaction as the change, so statistics read a few rows per
+    day instead of every FAQ. ``manage.py rebuild_faq_rollups`` recounts them.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="faq_daily_rollups")
+    day = models.DateField()
+    # Same column as FAQ.tone, so tones outside the choices are counted too
+    tone = models.CharField()
+    faq_count = models.IntegerField(default=0)
+    question_count = models.IntegerField(default=0)
+
+    objects = FAQDailyRollupManager()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "day", "tone"], name="faq_daily_rollup_unique")]
+
+    def __str__(self):
+        return f"{self.user_id} {self.day} {self.tone}"
+
+
+class GenerationCacheEntry(ModelBase):
+    """Generated question/answer pairs keyed by a hash of the generation inputs."""
+
+    key = models.CharField(max_length=64, unique=True)
+    model_name = models.CharField(max_length=255)
+    question_answers = models.JSONField()
+    hits = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"])]
+
+    def __str__(self):
+        return self.key
+
+
+class GenerationJob(ModelBase):
+    """Queued FAQ generation processed by the ``faq_worker`` management command."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="generation_jobs")
+    faq = models.ForeignKey(FAQ, on_delete=models.SET_NULL, null=True, blank=True, related_name="generation_jobs")
+    content = models.TextField()
+    number_of_faqs = models.PositiveIntegerField(default=5)
+    tone = models.CharField(choices=FAQ.TONE_CHOICES, default="neutral")
+    use_cache = models.BooleanField(default=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    # Not claimed before this time, e.g. after the LLM queue was full
+    run_after = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"Job {self.pk} ({self.status})"
+
+
+class GenerationSession(ModelBase):
+    """
+    One WebSocket FAQ generation, kept so a client that lost its socket can resume it.
+
+    Question/answers are numbered in the order they were streamed, which is the
+    order they were saved to ``faq``; ``owner_channel`` is the channel the
+    generating consumer listens on for stop requests from other connections.
+    """
+
+    RUNNING = "running"
+    COMPLETE = "complete"
+    STOPPED = "stopped"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (RUNNING, "Running"),
+        (COMPLETE, "Complete"),
+        (STOPPED, "Stopped"),
+        (FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="generation_sessions")
+    faq = models.ForeignKey(FAQ, on_delete=models.CASCADE, related_name="generation_sessions")
+    request_id = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=RUNNING)
+    error = models.TextField(blank=True)
+    owner_channel = models.CharField(max_length=255, blank=True)
+    resumed_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Session {self.pk} ({self.status})"
@@ -0,0 +1,122 @@
+from typing import Dict, Hashable
+
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .helpers.statistics_cache import invalidate_statistics
+from .helpers.user_events import send_user_event
+from .models import FAQ, FAQDailyRollup, QuestionAnswer
+from .serializers import FAQEventSerializer
+from .signals import question_answers_added
+
+
+def send_statistics_changed(user_id, total_faqs: int = 0, total_questions: int = 0) -> None:
+    send_user_event(user_id, {"type": "statistics.changed", "totalFaqs": total_faqs, "totalQuestions": total_questions})
+
+
+@receiver(post_save, sender=FAQ)
+def faq_saved(sender, instance: FAQ, created: bool, **kwargs):
+    event = "faq.created" if created else "faq.updated"
+    send_user_event(instance.user_id, {"type": event, "faq": FAQEventSerializer(instance).data})
+    if created:
+        send_statistics_changed(instance.user_id, total_faqs=1)
+
+
+@receiver(pre_delete, sender=FAQ)
+def faq_deleting(sender, instance: FAQ, **kwargs):
+    # The question/answers are deleted along with it by post_delete
+    instance._question_count = instance.generated_faqs.count()
+
+
+@receiver(post_delete, sender=FAQ)
+def faq_deleted(sender, instance: FAQ, **kwargs):
+    send_user_event(instance.user_id, {"type": "faq.deleted", "faqId": instance.id})
+    send_statistics_changed(instance.user_id, total_faqs=-1, total_questions=-getattr(instance, "_question_count", 0))
+
+
+@receiver(question_answers_added, sender=FAQ)
+def faq_question_answers_added(sender, faq: FAQ, question_answers, **kwargs):
+    count = len(question_answers)
+    send_user_event(faq.user_id, {"type": "faq.question_answers_added", "faqId": faq.id, "count": count})
+    send_statistics_changed(faq.user_id, total_questions=count)
+
+
+# Cached statistics count a user's FAQs and question/answers by day and tone, so
+# creating, deleting or moving them makes theirs stale. The daily rollups are
+# updated in the transaction making the change.
+
+
+@receiver(pre_save, sender=FAQ)
+def faq_rollup_moving(sender, instance: FAQ, raw: bool, **kwargs):
+    if raw or instance._state.adding:
+        return
+    # Loaded from the database with the same user and tone: nothing to move
+    if getattr(instance, "_loaded_rollup_key", None) == (instance.user_id, instance.tone):
+        return
+    previous = FAQ.objects.filter(pk=instance.pk).values("user_id", "tone", "created_at").first()
+    if previous is None or (previous["user_id"], previous["tone"]) == (instance.user_id, instance.tone):
+        return
+    # Move the FAQ and its question/answers to the rollup of its new tone (or user)
+    questions = instance.generated_faqs.count()
+    day = timezone.localdate(previous["created_at"])
+    FAQDailyRollup.objects.add(previous["user_id"], day, previous["tone"], -1, -questions)
+    FAQDailyRollup.objects.add(instance.user_id, day, instance.tone, 1, questions)
+    invalidate_statistics([previous["user_id"]])
+
+
+@receiver(post_save, sender=FAQ)
+def faq_statistics_saved(sender, instance: FAQ, created: bool, raw: bool, **kwargs):
+    if created and not raw:
+        FAQDailyRollup.objects.add_for_faq(instance, faqs=1)
+    instance._loaded_rollup_key = (instance.user_id, instance.tone)
+    invalidate_statistics([instance.user_id])
+
+
+@receiver(post_delete, sender=FAQ)
+def faq_statistics_deleted(sender, instance: FAQ, **kwargs):
+    FAQDailyRollup.objects.add_for_faq(instance, faqs=-1, questions=-getattr(instance, "_question_count", 0))
+    invalidate_statistics([instance.user_id])
+
+
+@receiver(question_answers_added, sender=FAQ)
+def faq_question_answers_statistics_changed(sender, faq: FAQ, question_answers, **kwargs):
+    FAQDailyRollup.objects.add_for_faq(faq, questions=len(question_answers))
+    invalidate_statistics([faq.user_id])
+
+
+@receiver(pre_save, sender=QuestionAnswer)
+def question_answer_moving(sender, instance: QuestionAnswer, raw: bool, **kwargs):
+    if raw or instance._state.adding:
+        return
+    previous = QuestionAnswer.objects.filter(pk=instance.pk).values_list("faq_id", flat=True).first()
+    if previous is not None and previous != instance.faq_id:
+        count_question_answers({previous: -1, instance.faq_id: 1})
+
+
+@receiver(post_save, sender=QuestionAnswer)
+def question_answer_saved(sender, instance: QuestionAnswer, created: bool, raw: bool, **kwargs):
+    # Edits change no count; moves are counted before the save
+    if created and not raw:
+        count_question_answers({instance.faq_id: 1})
+
+
+@receiver(pre_delete, sender=QuestionAnswer)
+def question_answer_deleting(sender, instance: QuestionAnswer, origin, **kwargs):
+    # Deleted along with their FAQ (or its user), which counts them itself
+    if isinstance(origin, QuestionAnswer):
+        count_question_answers({instance.faq_id: -1})
+    elif getattr(origin, "model", None) is QuestionAnswer and not getattr(origin, "_question_answers_counted", False):
+        # A queryset delete sends this for every row; count them all at the first, once per FAQ
+        origin._question_answers_counted = True
+        counts = origin.order_by().values_list("faq_id").annotate(questions=Count("pk"))
+        count_question_answers({faq_id: -questions for faq_id, questions in counts})
+
+
+def count_question_answers(counts: Dict[Hashable, int]) -> None:
+    """Add the question/answers in ``counts`` (FAQ id -> number, negative to subtract) to their FAQs' rollups."""
+    faqs = list(FAQ.objects.filter(pk__in=counts).only("user_id", "tone", "created_at"))
+    for faq in faqs:
+        FAQDailyRollup.objects.add_for_faq(faq, questions=counts[faq.pk])
+    invalidate_statistics(faq.user_id for faq in faqs)
@@ -1,47 +1,55 @@
-from django.core.cache import cache
 from django.db.models import QuerySet
 
-from ..models import FAQ
+from ..helpers.statistics_cache import get_statistics_cache
+from ..models import FAQ, FAQDailyRollup
 
 
 class StatisticsSelector:
     """Selector for FAQ statistics."""
 
+    @staticmethod
+    def get_user_statistics(user) -> dict:
+        """
+        Get statistics of the user's FAQs from the daily rollups, cached until one of them changes.
+
+        Only the counts are cached; the last FAQ is read on every call, so
+        the cache never holds model instances or serves an edited FAQ stale.
+        """
+
+        def compute():
+            return StatisticsSelector.format_counts(FAQDailyRollup.objects.get_statistics(user))
+
+        stats = get_statistics_cache().get(user.id, compute)
+        return StatisticsSelector.with_last_faq(stats, FAQ.objects.get_user_faqs(user))
+
     @staticmethod
     def get_statistics(queryset: QuerySet[FAQ]) -> dict:
         """Get FAQ statistics from queryset."""
-        cache_key = f"faq_stats_{queryset.query.__str__()}"
-        stats = cache.get(cache_key)
-
-        if not stats:
-            total_faqs = queryset.count()
-            total_questions = sum(faq.generated_faqs.count() for faq in queryset)
-            avg_questions = total_questions / total_faqs if total_faqs > 0 else 0
-
-            monthly_trends = [
-                {"month": item["month"].strftime("%b"), "count": item["count"]}
-                for item in FAQ.objects.get_monthly_trends(queryset)
-            ]
-
-            daily_trends = [
-                {"day": item["day"].strftime("%a"), "count": item["count"]}
-                for item in FAQ.objects.get_daily_trends(queryset)
-            ]
-
-            tones = [
-                {"tone": item["tone"] or "Uncategorized", "value": item["value"]}
-                for item in FAQ.objects.get_tone_distribution(queryset)
-            ]
-
-            stats = {
-                "total_faqs": total_faqs,
-                "total_questions": total_questions,
-                "avg_questions_per_faq": round(avg_questions, 1),
-                "last_faq_created": queryset.first(),
-                "monthly_trends": monthly_trends,
-                "daily_trends": daily_trends,
-                "tones": tones,
-            }
-            cache.set(cache_key, stats, timeout=0)
-
-        return stats
+        # Constant number of queries however many FAQs there are
+        counts = StatisticsSelector.format_counts(FAQ.objects.get_statistics(queryset))
+        return StatisticsSelector.with_last_faq(counts, queryset)
+
+    @staticmethod
+    def with_last_faq(counts: dict, queryset: QuerySet[FAQ]) -> dict:
+        """Add the first FAQ of ``queryset`` to the output of ``format_counts``."""
+        return {**counts, "last_faq_created": queryset.first() if counts["total_faqs"] else None}
+
+    @staticmethod
+    def format_counts(counts: dict) -> dict:
+        """Shape the figures of ``get_statistics`` for the serializer, without the last FAQ."""
+        total_faqs = counts["total_faqs"]
+        total_questions = counts["total_questions"]
+        avg_questions = total_questions / total_faqs if total_faqs > 0 else 0
+
+        monthly_trends = [{"month": month.strftime("%b"), "count": count} for month, count in counts["months"]]
+        daily_trends = [{"day": day.strftime("%a"), "count": count} for day, count in counts["days"]]
+        tones = [{"tone": tone or "Uncategorized", "value": value} for tone, value in counts["tones"]]
+
+        return {
+            "total_faqs": total_faqs,
+            "total_questions": total_questions,
+            "avg_questions_per_faq": round(avg_questions, 1),
+            "monthly_trends": monthly_trends,
+            "daily_trends": daily_trends,
+            "tones": tones,
+        }
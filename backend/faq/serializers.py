@@ -4,7 +4,7 @@ from pypdf import PdfReader
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from .models import FAQ, QuestionAnswer
+from .models import FAQ, GenerationJob, QuestionAnswer
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +41,69 @@ class FAQSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "user", "title", "generated_faqs", "created_at", "updated_at"]
 
 
+class FAQListSerializer(serializers.ModelSerializer):
+    """
+    FAQ entries in lists: no content, the number of question/answers instead of
+    the question/answers, unless ``generated_faqs`` is in the ``expand`` context.
+    """
+
+    question_count = serializers.IntegerField(read_only=True)
+    generated_faqs = QuestionAnswerSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = FAQ
+        fields = [
+            "id",
+            "user",
+            "title",
+            "tone",
+            "category",
+            "number_of_faqs",
+            "question_count",
+            "generated_faqs",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if "generated_faqs" not in self.context.get("expand", ()):
+            del fields["generated_faqs"]
+        return fields
+
+
+class FAQEventSerializer(serializers.ModelSerializer):
+    """FAQ fields pushed to the user's sockets when it changes, without the content and question/answers."""
+
+    class Meta:
+        model = FAQ
+        fields = ["id", "user", "title", "number_of_faqs", "tone", "created_at", "updated_at"]
+        read_only_fields = fields
+
+
+class GenerationJobSerializer(serializers.ModelSerializer):
+    """Serializer for queued FAQ generations, including the FAQ once it succeeded."""
+
+    faq = FAQSerializer(read_only=True)
+
+    class Meta:
+        model = GenerationJob
+        fields = [
+            "id",
+            "status",
+            "number_of_faqs",
+            "tone",
+            "attempts",
+            "error",
+            "faq",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
 class DailyTrendSerializer(serializers.Serializer):
     day = serializers.CharField()
     count = serializers.IntegerField(min_value=0)
@@ -1,7 +1,7 @@
 import logging
 from datetime import datetime
 from io import BytesIO
-from typing import List
+from typing import List, Optional
 from zipfile import Path
 
 import requests
@@ -18,24 +18,60 @@ from weasyprint import HTML
 from .exceptions import (
     ConnectionScrapeException,
     FAQGenerationException,
+    GenerationBusyException,
+    GenerationRejectedException,
     NoContentScrapeException,
     ParseException,
     PdfGenerationException,
     RequestScrapeException,
     ScrapeException,
 )
+from .helpers.admission import AdmissionRejected, get_admission_controller
 from .helpers.faq_generator import FAQGenerator
+from .helpers.llm_scheduler import Priority, SchedulerQueueFull
 from .models import QuestionAnswer
 
 logger = logging.getLogger(__name__)
 
 
-def generate_faq(text: str, number_of_faqs: int = 5, tone: str = "neutral") -> List[QuestionAnswer]:
+def make_title(text: str) -> str:
+    """Build an FAQ title from the first characters of its content."""
+    return text[:50] + ("..." if len(text) > 50 else "")
+
+
+def admit_generation(user_id: int, text: str, number_of_faqs: int, tone: str, use_cache: bool = True) -> float:
+    """
+    Admit a generation for the user and return its estimated wait, or raise a 429 telling when to retry.
+
+    A generation the cache answers makes no model call, so it is admitted
+    without using up any of the user's allowance.
+    """
+    if use_cache and FAQGenerator().is_cached(text, number_of_faqs, tone):
+        return 0.0
+    try:
+        return get_admission_controller().admit(user_id)
+    except AdmissionRejected as err:
+        raise GenerationRejectedException(detail=str(err), wait=err.retry_after) from err
+
+
+def generate_faq(
+    text: str,
+    number_of_faqs: int = 5,
+    tone: str = "neutral",
+    use_cache: bool = True,
+    user_id: Optional[int] = None,
+    priority: Priority = Priority.BATCH,
+) -> List[QuestionAnswer]:
     """Generate FAQs using the FAQGenerator singleton."""
     try:
         # Will always return the same instance
         generator = FAQGenerator()
-        return generator.generate_faqs(text, number_of_faqs, tone)
+        return generator.generate_faqs(
+            text, number_of_faqs, tone, use_cache=use_cache, user_id=user_id, priority=priority
+        )
+    except SchedulerQueueFull as err:
+        logger.warning(f"Rejected FAQ generation: {str(err)}")
+        raise GenerationBusyException() from err
     except Exception as err:
         logger.error(f"Error generating FAQs: {str(err)}")
         raise FAQGenerationException() from err
@@ -90,11 +126,12 @@ def generate_faq_pdf(faq) -> BytesIO:
     """Generate beautiful PDF file from FAQ using WeasyPrint."""
 
     try:
+        generated_faqs = list(faq.generated_faqs.all())
         context = {
             "faq": faq,
             "date": datetime.now().strftime("%B %d, %Y"),
-            "generated_faqs": faq.generated_faqs.all(),
-            "total_questions": faq.generated_faqs.count(),
+            "generated_faqs": generated_faqs,
+            "total_questions": len(generated_faqs),
         }
 
         html_string = render_to_string("faq/pdf_template.html", context)
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent by FAQManager.bulk_add_question_answers once per FAQ, with the ``faq`` and
+# the created ``question_answers``; bulk inserts send no post_save.
+question_answers_added = Signal()
@@ -1,9 +1,11 @@
 # faq/urls.py
 from rest_framework.routers import DefaultRouter
 
-from .views import FAQViewSet
+from .views import FAQViewSet, GenerationJobViewSet
 
 router = DefaultRouter()
+# Registered first so "jobs/" is not captured by the FAQ detail route
+router.register(r"jobs", GenerationJobViewSet, basename="faq-job")
 router.register(r"", FAQViewSet, basename="faq")
 
 urlpatterns = router.urls
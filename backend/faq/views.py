@@ -1,20 +1,37 @@
 # faq/views.py
+import hmac
 import logging
 
-from django.http import FileResponse
+from django.conf import settings
+from django.db import transaction
+from django.http import FileResponse, HttpResponse
+from django.urls import reverse
+from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.viewsets import ModelViewSet
+from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 
-from .models import FAQ
+from .helpers.job_queue import JobQueue
+from .helpers.llm_scheduler import Priority
+from .helpers.metrics import REGISTRY
+from .models import FAQ, GenerationJob
 from .selectors.statistics_selector import StatisticsSelector
-from .serializers import FAQSerializer, FAQStatisticsSerializer, PdfSerializer, ScrapeSerializer
+from .serializers import (
+    FAQListSerializer,
+    FAQSerializer,
+    FAQStatisticsSerializer,
+    GenerationJobSerializer,
+    PdfSerializer,
+    ScrapeSerializer,
+)
 from .services import (
+    admit_generation,
     extract_text,
     generate_faq,
     generate_faq_pdf,
+    make_title,
     scrape_and_summarize,
 )
 
@@ -26,23 +43,67 @@ class FAQViewSet(ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
+        if self.action == "list":
+            return FAQ.objects.get_user_faq_list(self.request.user, "generated_faqs" in self._expand())
         return FAQ.objects.get_user_faqs(self.request.user)
 
+    def get_serializer_class(self):
+        return FAQListSerializer if self.action == "list" else FAQSerializer
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "expand": self._expand()}
+
+    def _expand(self) -> set:
+        # ?expand=generated_faqs nests the question/answers in lists
+        return {field.strip() for field in self.request.query_params.get("expand", "").split(",") if field.strip()}
+
+    def create(self, request, *args, **kwargs):
+        """Generate synchronously, or queue a job and return 202 when ?mode=async."""
+        if request.query_params.get("mode", settings.FAQ_CREATE_MODE) != "async":
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job = JobQueue.enqueue(
+            request.user,
+            serializer.validated_data["content"],
+            serializer.validated_data.get("number_of_faqs"),
+            serializer.validated_data.get("tone"),
+            use_cache=self._use_cache(),
+        )
+
+        return Response(
+            GenerationJobSerializer(job).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": reverse("faq-job-detail", kwargs={"pk": job.id})},
+        )
+
     def perform_create(self, serializer):
         text = serializer.validated_data["content"]
         number_of_faqs = serializer.validated_data.get("number_of_faqs")
         tone = serializer.validated_data.get("tone")
+        use_cache = self._use_cache()
 
-        serializer.save(
-            user=self.request.user,
-            title=text[:50] + ("..." if len(text) > 50 else ""),
-            generated_faqs=generate_faq(text, number_of_faqs, tone),
+        # Turn the request away now rather than after it held a worker until the model timed out
+        admit_generation(self.request.user.id, text, number_of_faqs, tone, use_cache=use_cache)
+        # The client waits for the response, so this goes ahead of queued jobs
+        generated_faqs = generate_faq(
+            text, number_of_faqs, tone, use_cache=use_cache, user_id=self.request.user.id, priority=Priority.INTERACTIVE
         )
 
+        with transaction.atomic():
+            faq = serializer.save(user=self.request.user, title=make_title(text))
+            FAQ.objects.add_question_answers(faq, generated_faqs)
+
+    def _use_cache(self) -> bool:
+        # ?regenerate=true bypasses the generation cache
+        return self.request.query_params.get("regenerate", "").lower() not in ("1", "true")
+
     @action(detail=False, methods=["get"])
-    def statistics(self, _request):
+    def statistics(self, request):
         """Get FAQ statistics."""
-        stats = StatisticsSelector.get_statistics(self.get_queryset())
+        stats = StatisticsSelector.get_user_statistics(request.user)
         return Response(FAQStatisticsSerializer(stats).data)
 
     @action(detail=False, methods=["post"])
@@ -72,3 +133,30 @@ class FAQViewSet(ModelViewSet):
         pdf_buffer = generate_faq_pdf(faq)
 
         return FileResponse(pdf_buffer, as_attachment=True, filename=f"faq_{faq.id}.pdf")
+
+
+class GenerationJobViewSet(ReadOnlyModelViewSet):
+    """Status and result of queued FAQ generations."""
+
+    serializer_class = GenerationJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return (
+            GenerationJob.objects.filter(user=self.request.user)
+            .select_related("faq")
+            .prefetch_related("faq__generated_faqs")
+            .order_by("-created_at")
+        )
+
+
+def metrics(request):
+    """Generation telemetry in the Prometheus text format, for staff and scrapers holding FAQ_METRICS_TOKEN."""
+    token = settings.FAQ_METRICS_TOKEN
+    authorization = request.headers.get("Authorization", "").encode()
+    if not request.user.is_staff and not (token and hmac.compare_digest(authorization, f"Bearer {token}".encode())):
+        response = HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+        response["WWW-Authenticate"] = 'Bearer realm="metrics"'
+        return response
+
+    return HttpResponse(REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
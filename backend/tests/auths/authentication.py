@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from auths.authentication import CachedTokenAuthentication
+from auths.token_cache import get_token_cache
+
+
+def authenticate(api_factory, header):
+    request = api_factory.get("/", HTTP_AUTHORIZATION=header)
+    with CaptureQueriesContext(connection) as queries:
+        result = CachedTokenAuthentication().authenticate(request)
+    return result, len(queries)
+
+
+@pytest.mark.django_db
+class TestCachedTokenAuthentication:
+    def test_jwt_skips_token_lookup_and_is_cached(self, api_factory, user):
+        """Test that a JWT costs one user query at most, and none once the user is cached."""
+        header = f"Bearer {AccessToken.for_user(user)}"
+
+        (first_user, _), first_queries = authenticate(api_factory, header)
+        (second_user, _), second_queries = authenticate(api_factory, header)
+
+        assert first_user == second_user == user
+        assert (first_queries, second_queries) == (1, 0)
+
+    def test_token_is_cached_until_deleted(self, api_factory, user):
+        """Test that a DRF token is looked up once and rejected after it is deleted."""
+        token = Token.objects.create(user=user)
+        header = f"Token {token.key}"
+
+        assert authenticate(api_factory, header)[1] == 1
+        (cached_user, auth), queries = authenticate(api_factory, header)
+        assert (cached_user, auth.key, queries) == (user, token.key, 0)
+
+        token.delete()
+        with pytest.raises(AuthenticationFailed):
+            authenticate(api_factory, header)
+
+    def test_deactivated_user_is_rejected(self, api_factory, user):
+        """Test that saving a user drops their cached copies."""
+        header = f"Bearer {AccessToken.for_user(user)}"
+        authenticate(api_factory, header)
+
+        user.is_active = False
+        user.save()
+
+        with pytest.raises(AuthenticationFailed):
+            authenticate(api_factory, header)
+
+    def test_other_schemes_are_left_alone(self, api_factory, user):
+        """Test that Basic credentials fall through without a query."""
+        assert authenticate(api_factory, "Basic dXNlcjpwYXNz") == (None, 0)
+
+    def test_shared_tier(self, api_factory, user, settings):
+        """Test that a process with a cold local cache is served from the shared tier."""
+        settings.AUTH_TOKEN_SHARED_CACHE = "default"
+        token = Token.objects.create(user=user)
+        authenticate(api_factory, f"Token {token.key}")
+
+        get_token_cache().clear()
+        (cached_user, _), queries = authenticate(api_factory, f"Token {token.key}")
+
+        assert (cached_user, queries) == (user, 0)
@@ -0,0 +1,81 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from auths.custom_ws_middleware import get_user, user_from_jwt
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGetUser:
+    def test_jwt(self, user):
+        """Test that a JWT access token resolves to its user."""
+        assert async_to_sync(get_user)(str(AccessToken.for_user(user))) == user
+
+    def test_token(self, user):
+        """Test the fallback to DRF tokens."""
+        token = Token.objects.create(user=user)
+
+        assert async_to_sync(get_user)(token.key) == user
+
+    def test_invalid_token(self, user):
+        """Test that an unknown token gives an anonymous user."""
+        assert isinstance(async_to_sync(get_user)("not-a-token"), AnonymousUser)
+
+    def test_jwt_user_is_cached(self, user):
+        """Test that a JWT's user is looked up once and then served from the token cache."""
+        token = str(AccessToken.for_user(user))
+        async_to_sync(user_from_jwt)(token)
+
+        with CaptureQueriesContext(connection) as queries:
+            cached_user = async_to_sync(user_from_jwt)(token)
+        assert len(queries) == 0
+        assert (cached_user.pk, cached_user.email) == (user.pk, user.email)
+
+    def test_refresh_token_is_not_accepted(self, user):
+        """Test that only access tokens open a socket."""
+        assert async_to_sync(user_from_jwt)(str(RefreshToken.for_user(user))) is None
+
+    def test_jwt_of_deleted_user(self, user):
+        """Test that a valid JWT of a deleted user, cached or not, gives an anonymous user."""
+        token = str(AccessToken.for_user(user))
+        async_to_sync(get_user)(token)
+
+        user.delete()
+
+        assert isinstance(async_to_sync(get_user)(token), AnonymousUser)
+
+    def test_jwt_of_inactive_user(self, user):
+        """Test that deactivating a user stops their valid JWT from opening a socket."""
+        token = str(AccessToken.for_user(user))
+        async_to_sync(get_user)(token)
+
+        user.is_active = False
+        user.save()
+
+        assert isinstance(async_to_sync(get_user)(token), AnonymousUser)
+
+    def test_token_lookup_is_cached_until_deleted(self, user):
+        """Test that a DRF token is looked up once, and not accepted after it is deleted."""
+        token = Token.objects.create(user=user)
+        async_to_sync(get_user)(token.key)
+
+        with CaptureQueriesContext(connection) as queries:
+            assert async_to_sync(get_user)(token.key) == user
+        assert len(queries) == 0
+
+        token.delete()
+        assert isinstance(async_to_sync(get_user)(token.key), AnonymousUser)
+
+    def test_inactive_user_token(self, user):
+        """Test that deactivating a user stops their cached token from authenticating."""
+        token = Token.objects.create(user=user)
+        async_to_sync(get_user)(token.key)
+
+        user.is_active = False
+        user.save()
+
+        assert isinstance(async_to_sync(get_user)(token.key), AnonymousUser)
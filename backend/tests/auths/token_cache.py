@@ -0,0 +1,78 @@
+import time
+
+import pytest
+from django.core.cache import caches
+
+from auths.token_cache import SharedTokenUserCache, TokenUserCache
+
+
+@pytest.mark.django_db
+class TestTokenUserCache:
+    def test_evicts_least_recently_used(self, user):
+        """Test that the entry unused the longest goes first once the cache is full."""
+        cache = TokenUserCache(max_size=2, ttl=60)
+        cache.set("a", user)
+        cache.set("b", user)
+        cache.get("a")
+        cache.set("c", user)
+
+        assert cache.get("a") == user
+        assert cache.get("b") is None
+        assert cache.get("c") == user
+
+    def test_entries_expire(self, user):
+        """Test that an entry is not served past its TTL."""
+        cache = TokenUserCache(max_size=10, ttl=0.05)
+        cache.set("a", user)
+        time.sleep(0.1)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_invalidate_user(self, user):
+        """Test that every token of a user can be dropped at once."""
+        cache = TokenUserCache(max_size=10, ttl=60)
+        cache.set("a", user)
+        cache.set("b", user)
+
+        cache.invalidate_user(user.pk)
+
+        assert len(cache) == 0
+
+    def test_get_returns_a_new_user(self, user):
+        """Test that callers never share one cached instance."""
+        cache = TokenUserCache(max_size=10, ttl=60)
+        cache.set("a", user)
+
+        first, second = cache.get("a"), cache.get("a")
+        first.first_name = "Changed"
+
+        assert first is not second
+        assert (second.pk, second.email, second.first_name) == (user.pk, user.email, user.first_name)
+
+    def test_password_is_not_cached(self, user):
+        """Test that a cached user has its password hash deferred."""
+        cache = TokenUserCache(max_size=10, ttl=60)
+        cache.set("a", user)
+
+        assert "password" in cache.get("a").get_deferred_fields()
+
+
+@pytest.mark.django_db
+class TestSharedTokenUserCache:
+    def test_password_is_not_stored(self, user):
+        """Test that the shared cache holds the user's fields but not the password hash."""
+        cache = SharedTokenUserCache("default", ttl=60)
+        cache.set("a", user)
+
+        assert user.password not in caches["default"].get(f"auth:user:{user.pk}")
+        cached_user = cache.get("a")
+        assert (cached_user.pk, cached_user.email, cached_user.is_active) == (user.pk, user.email, True)
+        assert "password" in cached_user.get_deferred_fields()
+
+    def test_get_returns_a_new_user(self, user):
+        """Test that every lookup builds its own instance."""
+        cache = SharedTokenUserCache("default", ttl=60)
+        cache.set_user(user)
+
+        assert cache.get_user(user.pk) is not cache.get_user(user.pk)
@@ -2,12 +2,29 @@ import pytest
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient, APIRequestFactory
 
+from auths.token_cache import get_token_cache
+from faq.helpers.admission import get_admission_controller
+from faq.helpers.llm_backends import get_backend
 from faq.models import FAQ, QuestionAnswer
 from faq.serializers import QuestionAnswerSerializer
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Do not let users cached by one test authenticate in another."""
+    yield
+    get_token_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_admission_buckets():
+    """Do not let generations requested in one test use up the tokens of the next."""
+    yield
+    get_admission_controller().clear()
+
+
 @pytest.fixture
 def user():
     """Fixture for creating a test user."""
@@ -21,24 +38,26 @@ def basic_faq(user):
 
 
 @pytest.fixture
-def question_answers():
-    """Fixture for creating sample question-answer pairs."""
-    return [
-        QuestionAnswer.objects.create(question="What is SmartFAQ?", answer="A FAQ generator."),
-        QuestionAnswer.objects.create(question="How does it work?", answer="It uses AI."),
-    ]
+def question_answers(basic_faq):
+    """Fixture for creating sample question-answer pairs of the basic FAQ."""
+    return FAQ.objects.add_question_answers(
+        basic_faq,
+        [
+            QuestionAnswer(question="What is SmartFAQ?", answer="A FAQ generator."),
+            QuestionAnswer(question="How does it work?", answer="It uses AI."),
+        ],
+    )
 
 
 @pytest.fixture
-def question_answer():
+def question_answer(basic_faq):
     """Fixture for creating a basic question-answer"""
-    return QuestionAnswer.objects.create(question="What is SmartFAQ?", answer="A FAQ generator.")
+    return QuestionAnswer.objects.create(faq=basic_faq, question="What is SmartFAQ?", answer="A FAQ generator.")
 
 
 @pytest.fixture
 def faq_with_qa(basic_faq, question_answers):
     """Fixture for creating a FAQ instance with question-answer pairs."""
-    basic_faq.generated_faqs.add(*question_answers)
     return basic_faq
 
 
@@ -73,3 +92,10 @@ def authenticated_client(api_client, user):
 def qa_serialized(question_answer):
     """Serialized question answer."""
     return QuestionAnswerSerializer(question_answer)
+
+
+@pytest.fixture
+def fake_llm(settings):
+    """Generate with the deterministic FakeBackend instead of Ollama."""
+    settings.LLM_BACKEND = {"BACKEND": "faq.helpers.llm_backends.FakeBackend", "OPTIONS": {}}
+    return get_backend()
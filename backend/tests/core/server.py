@@ -0,0 +1,18 @@
+from autobahn.websocket.compress import PerMessageDeflateOffer, PerMessageDeflateOfferAccept
+
+from core.server import accept_permessage_deflate
+
+
+class TestPermessageDeflate:
+    def test_deflate_offer_is_accepted(self):
+        """Test that a client offering permessage-deflate gets it."""
+        offer = PerMessageDeflateOffer()
+
+        accept = accept_permessage_deflate([offer])
+
+        assert isinstance(accept, PerMessageDeflateOfferAccept)
+        assert accept.offer is offer
+
+    def test_no_offer(self):
+        """Test that clients without compression are served uncompressed."""
+        assert accept_permessage_deflate([]) is None
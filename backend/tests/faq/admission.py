@@ -0,0 +1,98 @@
+import pytest
+
+from faq.helpers import admission
+from faq.helpers.admission import AdmissionController, AdmissionRejected
+
+
+class StubScheduler:
+    def __init__(self, queue_depth=0, estimated_wait=0.0):
+        self.queue_depth = queue_depth
+        self.wait = estimated_wait
+
+    def estimated_wait(self):
+        return self.wait
+
+    def metrics(self):
+        return {"queue_depth": self.queue_depth, "estimated_wait_seconds": self.wait}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(admission, "time", clock)
+    return clock
+
+
+def controller(scheduler=None, rate=1.0, burst=2, max_queue=10, max_wait=60):
+    return AdmissionController(rate, burst, max_queue, max_wait, scheduler=scheduler or StubScheduler())
+
+
+class TestAdmissionController:
+    def test_user_bucket(self, clock):
+        """Test that a user gets a burst of generations, then one per refill, with a retry hint."""
+        gate = controller(rate=0.5, burst=2)
+        gate.admit("a")
+        gate.admit("a")
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            gate.admit("a")
+        assert rejected.value.reason == "user_rate"
+        assert rejected.value.retry_after == 2
+
+        # Other users have buckets of their own
+        gate.admit("b")
+
+        clock.now += 2
+        gate.admit("a")
+        with pytest.raises(AdmissionRejected):
+            gate.admit("a")
+
+    def test_rejects_on_queue_depth(self, clock):
+        """Test that nobody is admitted while the queue is at its limit."""
+        gate = controller(StubScheduler(queue_depth=10, estimated_wait=25), max_queue=10)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            gate.admit("a")
+
+        assert rejected.value.reason == "queue_depth"
+        assert rejected.value.retry_after == 25
+        assert rejected.value.estimated_wait == 25
+
+    def test_rejects_on_estimated_wait(self, clock):
+        """Test that nobody is admitted while the estimated wait is too long, and no token is spent on it."""
+        scheduler = StubScheduler(estimated_wait=90)
+        gate = controller(scheduler, burst=1, max_wait=60)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            gate.admit("a")
+        assert rejected.value.reason == "estimated_wait"
+
+        scheduler.wait = 30
+        assert gate.admit("a") == 30
+
+    def test_zero_disables_checks(self, clock):
+        """Test that a rate, queue or wait limit of 0 turns that check off."""
+        gate = controller(StubScheduler(queue_depth=500, estimated_wait=500), rate=0, max_queue=0, max_wait=0)
+
+        for _ in range(10):
+            gate.admit("a")
+
+    def test_full_buckets_are_pruned(self, clock, monkeypatch):
+        """Test that users whose buckets refilled are forgotten once there are many buckets."""
+        monkeypatch.setattr(AdmissionController, "MAX_BUCKETS", 3)
+        gate = controller(rate=1, burst=1)
+        for user in "abc":
+            gate.admit(user)
+
+        clock.now += 5
+        gate.admit("d")
+
+        assert list(gate._buckets) == ["d"]
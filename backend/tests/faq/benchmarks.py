@@ -0,0 +1,18 @@
+import importlib
+import json
+
+import pytest
+
+from benchmarks import SUITES
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("name", sorted(SUITES))
+def test_benchmark_suite(name):
+    """Smoke-run a benchmark suite at its quick sizes and check the result is JSON."""
+    module_name, _full_options, quick_options = SUITES[name]
+
+    result = importlib.import_module(module_name).run(**quick_options)
+
+    assert json.loads(json.dumps(result, default=str))
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from faq.helpers.async_faq_generator import FAQGenerator as AsyncFAQGenerator
+from faq.helpers.chunking import (
+    CHARS_PER_TOKEN,
+    questions_per_chunk,
+    reduce_question_answers,
+    split_into_chunks,
+)
+from faq.helpers.faq_generator import FAQGenerator
+from faq.helpers.llm_backends import LLMBackendError
+
+LONG_TEXT = "\n\n".join(f"Paragraph {i} talks about topic {i}. It has a second sentence." for i in range(40))
+
+
+def chat_content(kwargs, count=2):
+    """Answer a chat call with questions about the first paragraph of its prompt."""
+    paragraph = re.search(r"Paragraph \d+", kwargs["messages"][0]["content"]).group()
+    return json.dumps(
+        {"generated_faqs": [{"question": f"{paragraph} question {i}?", "answer": f"Answer {i}."} for i in range(count)]}
+    )
+
+
+class TestChunking:
+    def test_short_text_is_a_single_chunk(self):
+        """Test that text within budget is not split."""
+        assert split_into_chunks("Short text.", max_tokens=100) == ["Short text."]
+
+    def test_chunks_respect_token_budget(self):
+        """Test that every chunk fits the budget and no text is lost."""
+        chunks = split_into_chunks(LONG_TEXT, max_tokens=50)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 50 * CHARS_PER_TOKEN for chunk in chunks)
+        assert " ".join(" ".join(chunks).split()) == " ".join(LONG_TEXT.split())
+
+    def test_long_sentence_is_split_on_whitespace(self):
+        """Test that a sentence above budget is hard split."""
+        chunks = split_into_chunks("word " * 200, max_tokens=10)
+
+        assert all(len(chunk) <= 10 * CHARS_PER_TOKEN for chunk in chunks)
+
+    def test_questions_per_chunk(self):
+        """Test candidate counts per chunk."""
+        assert questions_per_chunk(5, 1) == 5
+        assert questions_per_chunk(10, 4) == 4
+        assert questions_per_chunk(3, 20) == 2
+
+    def test_reduce_round_robins_and_dedupes(self):
+        """Test that reduction covers every chunk and drops near-duplicate questions."""
+        candidates = [
+            [{"question": "What is SmartFAQ?", "answer": "A"}, {"question": "Who made it?", "answer": "B"}],
+            [{"question": "What is SmartFAQ", "answer": "C"}, {"question": "How is it priced?", "answer": "D"}],
+            [{"question": "Does it support PDFs?", "answer": "E"}],
+        ]
+
+        result = reduce_question_answers(candidates, 3)
+
+        assert [pair["answer"] for pair in result] == ["A", "E", "B"]
+
+
+@pytest.mark.django_db
+class TestChunkedGeneration:
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, settings):
+        settings.FAQ_CHUNK_MAX_TOKENS = 50
+        settings.FAQ_GENERATION_CACHE_ENABLED = False
+
+    @patch("ollama.Client.chat")
+    def test_generate_faqs_maps_over_chunks(self, mock_chat):
+        """Test that every chunk is sent to the model and the result is reduced."""
+        mock_chat.side_effect = lambda **kwargs: SimpleNamespace(message=SimpleNamespace(content=chat_content(kwargs)))
+        chunks = split_into_chunks(LONG_TEXT, 50)
+
+        faqs = FAQGenerator().generate_faqs(LONG_TEXT, 5, "neutral")
+
+        assert mock_chat.call_count == len(chunks)
+        assert len(faqs) == 5
+
+    def test_generate_faqs_stream_reports_progress(self, fake_llm):
+        """Test that the async generator maps over chunks and reports progress."""
+        chunks = split_into_chunks(LONG_TEXT, 50)
+        progress = []
+
+        async def on_progress(completed, total):
+            progress.append((completed, total))
+
+        async def run():
+            generator = AsyncFAQGenerator()
+            return [faq async for faq in generator.generate_faqs_stream(LONG_TEXT, 4, on_progress=on_progress)]
+
+        faqs = async_to_sync(run)()
+
+        assert len(faqs) == 4
+        assert progress[-1] == (len(chunks), len(chunks))
+        assert fake_llm.calls == len(chunks)
+
+    def test_failed_chunk_stops_the_others(self, fake_llm, settings):
+        """Test that the first failing chunk cancels the chunks still waiting for a slot."""
+        settings.FAQ_CHUNK_CONCURRENCY = 1
+        fake_llm.fail_after_tokens = 2
+        fake_llm.tokens_per_second = 1000
+        chunks = split_into_chunks(LONG_TEXT, 50)
+
+        async def run():
+            with pytest.raises(LLMBackendError):
+                [faq async for faq in AsyncFAQGenerator().generate_faqs_stream(LONG_TEXT, 4)]
+            calls = fake_llm.calls
+            # Give chunks that were left running the chance to reach the model
+            await asyncio.sleep(0.1)
+            return calls, fake_llm.calls
+
+        calls, later_calls = async_to_sync(run)()
+        assert calls == later_calls
+        assert calls < len(chunks)
@@ -0,0 +1,470 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+
+from faq.helpers.consumers import FAQConsumer
+from faq.helpers.llm_scheduler import get_scheduler
+from faq.helpers.routing import websocket_urlpatterns
+from faq.models import FAQ, QuestionAnswer
+
+
+@pytest.fixture
+def slow_llm(settings):
+    """A fake model slow enough to stop part way through a generation."""
+    settings.LLM_BACKEND = {
+        "BACKEND": "faq.helpers.llm_backends.FakeBackend",
+        "OPTIONS": {"tokens_per_second": 100},
+    }
+    settings.FAQ_GENERATION_CACHE_ENABLED = False
+
+
+@pytest.fixture
+def communicate(user, settings):
+    """Run ``scenario(connect)`` on one event loop; ``connect()`` opens an authenticated socket."""
+    settings.FAQ_WS_RESUME_GRACE = 0
+    router = URLRouter(websocket_urlpatterns)
+
+    async def application(scope, receive, send):
+        # Stands in for TokenAuthMiddleware
+        return await router(dict(scope, user=user), receive, send)
+
+    def run(scenario):
+        communicators = []
+
+        async def connect(subprotocols=None):
+            communicator = WebsocketCommunicator(application, "/ws/faq/", subprotocols=subprotocols)
+            connected, _ = await communicator.connect()
+            assert connected
+            communicators.append(communicator)
+            return communicator
+
+        async def wrapper():
+            try:
+                return await scenario(connect)
+            finally:
+                for communicator in communicators:
+                    await communicator.disconnect()
+                # The consumer's queries ran on the sync_to_async thread; release its connection
+                await sync_to_async(connections.close_all)()
+
+        return async_to_sync(wrapper)()
+
+    return run
+
+
+async def receive_until(communicator, predicate, timeout=10):
+    messages = []
+    while True:
+        message = await communicator.receive_json_from(timeout=timeout)
+        messages.append(message)
+        if predicate(message):
+            return messages
+
+
+def is_final(message):
+    return message["type"] == "error" or message.get("status") in ("complete", "stopped")
+
+
+def generation_messages(messages):
+    # Drops the FAQ and statistics change events every socket of the user gets
+    return [message for message in messages if "." not in message["type"]]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFAQConsumer:
+    def test_generation_is_tagged_with_request_id(self, communicate, fake_llm):
+        """Test that every message of a generation carries its request id."""
+
+        async def scenario(connect):
+            communicator = await connect()
+            await communicator.send_json_to({"request_id": "a", "text": "Some text", "num_questions": 3})
+            return await receive_until(communicator, is_final)
+
+        messages = generation_messages(communicate(scenario))
+
+        assert messages[-1]["status"] == "complete"
+        assert len([message for message in messages if message["type"] == "faq"]) == 3
+        assert {message["requestId"] for message in messages} == {"a"}
+        assert not any(message["type"] == "partial" for message in messages)
+
+    def test_stop_cancels_generation_mid_stream(self, communicate, slow_llm):
+        """Test that stop is read while streaming and frees the model slot at once."""
+
+        async def scenario(connect):
+            communicator = await connect()
+            await communicator.send_json_to({"request_id": "a", "text": "Some text", "num_questions": 5})
+            await asyncio.sleep(0.2)
+            await communicator.send_json_to({"type": "stop", "request_id": "a"})
+            messages = await receive_until(communicator, is_final, timeout=2)
+            return messages, get_scheduler().metrics()["in_flight"]
+
+        messages, in_flight = communicate(scenario)
+
+        assert messages[-1]["status"] == "stopped"
+        assert messages[-1]["requestId"] == "a"
+        assert not any(message.get("status") == "complete" for message in messages)
+        assert in_flight == 0
+
+    def test_stop_unknown_request_id_is_answered(self, communicate):
+        """Test that stopping a generation that is not running still answers with its request_id."""
+
+        async def scenario(connect):
+            communicator = await connect()
+            await communicator.send_json_to({"type": "stop", "request_id": "missing"})
+            return await communicator.receive_json_from(timeout=2)
+
+        assert communicate(scenario) == {"type": "status", "status": "stopped", "requestId": "missing"}
+
+    def test_stop_without_request_id_stops_everything(self, communicate, slow_llm):
+        """Test that a bare stop, as the frontend sends it, stops every generation."""
+
+        async def scenario(connect):
+            communicator = await connect()
+            await communicator.send_json_to({"request_id": "a", "text": "First text"})
+            await communicator.send_json_to({"request_id": "b", "text": "Second text"})
+            await asyncio.sleep(0.1)
+            await communicator.send_json_to({"type": "stop"})
+            stopped = []
+            while len(stopped) < 2:
+                message = await communicator.receive_json_from(timeout=2)
+                if message.get("status") == "stopped":
+                    stopped.append(message["requestId"])
+            return stopped
+
+        assert sorted(communicate(scenario)) == ["a", "b"]
+        assert get_scheduler().metrics()["in_flight"] == 0
+
+    def test_concurrent_generations(self, communicate, fake_llm):
+        """Test that one socket multiplexes generations by request id."""
+
+        async def scenario(connect):
+            communicator = await connect()
+            await communicator.send_json_to({"request_id": "a", "text": "First text", "num_questions": 2})
+            await communicator.send_json_to({"request_id": "b", "text": "Second text", "num_questions": 3})
+            completed = set()
+            messages = []
+            while completed != {"a", "b"}:
+                message = await communicator.receive_json_from(timeout=10)
+                assert message["type"] != "error", message
+                messages.append(message)
+                if message.get("status") == "complete":
+                    completed.add(message["requestId"])
+            return messages
+
+        messages = communicate(scenario)
+
+        faqs = [message for message in messages if message["type"] == "faq"]
+        assert len([message for message in faqs if message["requestId"] == "a"]) == 2
+        assert len([message for message in faqs if message["requestId"] == "b"]) == 3
+
+    def test_duplicate_request_id_is_rejected(self, communicate, slow_llm):
+        """Test that a request id can only be used by one running generation."""
+
+        async def scenario(connect):
+            communicator = await connect()
+            await communicator.send_json_to({"request_id": "a", "text": "Some text"})
+            await communicator.send_json_to({"request_id": "a", "text": "Other text"})
+            return await receive_until(communicator, lambda message: message["type"] == "error", timeout=2)
+
+        messages = communicate(scenario)
+
+        assert "already running" in messages[-1]["message"]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGenerationSessions:
+    def test_resume_replays_missed_question_answers(self, communicate, slow_llm, settings):
+        """Test that a client reconnecting mid-stream gets what it missed, then the rest live."""
+        settings.FAQ_WS_RESUME_GRACE = 30
+        settings.FAQ_PERSIST_BATCH_SIZE = 1
+
+        async def scenario(connect):
+            first = await connect()
+            await first.send_json_to({"request_id": "a", "text": "Some text", "num_questions": 5})
+            messages = await receive_until(first, lambda message: message["type"] == "faq")
+            session_id = messages[0]["sessionId"]
+            # The socket drops after the first question/answer
+            await first.disconnect()
+            await asyncio.sleep(0.3)
+
+            second = await connect()
+            await second.send_json_to({"type": "resume", "session_id": session_id, "last_sequence": 1})
+            return await receive_until(second, is_final)
+
+        messages = communicate(scenario)
+
+        assert messages[-1]["status"] == "complete"
+        sequences = [message["sequence"] for message in messages if message["type"] == "faq"]
+        assert sequences == [2, 3, 4, 5]
+        assert any(message.get("status") == "resumed" for message in messages)
+
+    def test_resume_finished_session(self, communicate, fake_llm):
+        """Test that a session finished while the client was away is replayed from the database."""
+
+        async def scenario(connect):
+            first = await connect()
+            await first.send_json_to({"text": "Some text", "num_questions": 3})
+            messages = await receive_until(first, is_final)
+
+            second = await connect()
+            await second.send_json_to({"type": "resume", "session_id": messages[0]["sessionId"]})
+            return messages, await receive_until(second, is_final)
+
+        live, replayed = communicate(scenario)
+
+        live_faqs = [(message["sequence"], message["question"]) for message in live if message["type"] == "faq"]
+        replayed_faqs = [(message["sequence"], message["question"]) for message in replayed if message["type"] == "faq"]
+        assert replayed_faqs == live_faqs
+        assert replayed[-1]["status"] == "complete"
+
+    def test_stop_from_another_connection(self, communicate, slow_llm, settings):
+        """Test that a resumed client can stop a generation another connection runs."""
+        settings.FAQ_WS_RESUME_GRACE = 30
+
+        async def scenario(connect):
+            first = await connect()
+            await first.send_json_to({"text": "Some text"})
+            started = await first.receive_json_from(timeout=2)
+
+            second = await connect()
+            await second.send_json_to({"type": "resume", "session_id": started["sessionId"]})
+            await second.send_json_to({"type": "stop", "session_id": started["sessionId"]})
+            return await receive_until(second, is_final, timeout=2)
+
+        messages = communicate(scenario)
+
+        assert messages[-1]["status"] == "stopped"
+        assert get_scheduler().metrics()["in_flight"] == 0
+
+    def test_unknown_session(self, communicate):
+        """Test that resuming someone else's or a made up session fails cleanly."""
+
+        async def scenario(connect):
+            communicator = await connect()
+            await communicator.send_json_to({"type": "resume", "session_id": "not-a-session"})
+            return await communicator.receive_json_from(timeout=2)
+
+        assert communicate(scenario) == {"type": "error", "message": "Unknown generation session."}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCompactProtocol:
+    def test_compact_frames(self, communicate, fake_llm, settings):
+        """Test that compact clients get batched question/answers and a completion without the FAQ."""
+        settings.FAQ_PERSIST_BATCH_SIZE = 5
+
+        async def scenario(connect):
+            communicator = await connect([FAQConsumer.COMPACT_PROTOCOL])
+            await communicator.send_json_to({"text": "Some text", "num_questions": 5})
+            return await receive_until(communicator, is_final)
+
+        messages = generation_messages(communicate(scenario))
+
+        batches = [message for message in messages if message["type"] == "faqs"]
+        assert len(batches) == 1
+        assert [item["sequence"] for item in batches[0]["items"]] == [1, 2, 3, 4, 5]
+        assert messages[-1]["status"] == "complete"
+        assert messages[-1]["count"] == 5
+        assert "durationMs" in messages[-1]
+        assert not any("faq" in message or "content" in str(message) for message in messages)
+
+    def test_subprotocol_is_negotiated(self, user, settings):
+        """Test that the server only confirms the compact subprotocol when offered."""
+        router = URLRouter(websocket_urlpatterns)
+
+        async def application(scope, receive, send):
+            return await router(dict(scope, user=user), receive, send)
+
+        async def negotiate(subprotocols):
+            communicator = WebsocketCommunicator(application, "/ws/faq/", subprotocols=subprotocols)
+            _, subprotocol = await communicator.connect()
+            await communicator.disconnect()
+            return subprotocol
+
+        assert async_to_sync(negotiate)([FAQConsumer.COMPACT_PROTOCOL]) == FAQConsumer.COMPACT_PROTOCOL
+        assert async_to_sync(negotiate)(None) is None
+
+    def test_compact_resume(self, communicate, fake_llm):
+        """Test that a finished session replays in compact frames."""
+
+        async def scenario(connect):
+            first = await connect([FAQConsumer.COMPACT_PROTOCOL])
+            await first.send_json_to({"text": "Some text", "num_questions": 3})
+            messages = await receive_until(first, is_final)
+
+            second = await connect([FAQConsumer.COMPACT_PROTOCOL])
+            await second.send_json_to({"type": "resume", "session_id": messages[0]["sessionId"], "last_sequence": 1})
+            return await receive_until(second, is_final)
+
+        messages = communicate(scenario)
+
+        assert [item["sequence"] for item in messages[0]["items"]] == [2, 3]
+        assert messages[-1]["status"] == "complete"
+        assert messages[-1]["count"] == 3
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPartialFrames:
+    def test_partial_text_precedes_each_question_answer(self, communicate, slow_llm, settings):
+        """Test that opted in clients see the text being streamed before each saved question/answer."""
+        settings.FAQ_WS_PARTIAL_FPS = 50
+        settings.FAQ_PERSIST_BATCH_SIZE = 1
+
+        async def scenario(connect):
+            communicator = await connect()
+            await communicator.send_json_to({"text": "Some text", "num_questions": 2, "partial": True})
+            return await receive_until(communicator, is_final)
+
+        messages = communicate(scenario)
+
+        assert messages[-1]["status"] == "complete"
+        finals = {message["sequence"]: message for message in messages if message["type"] == "faq"}
+        partials = [(index, message) for index, message in enumerate(messages) if message["type"] == "partial"]
+        assert {message["sequence"] for _, message in partials} == {1, 2}
+        for index, message in partials:
+            final = finals[message["sequence"]]
+            # Never after the saved question/answer it previews, and always a prefix of it
+            assert index < messages.index(final)
+            assert final["question"].startswith(message["question"])
+            assert final["answer"].startswith(message.get("answer", ""))
+
+
+@pytest.mark.django_db(transaction=True)
+class TestUserEvents:
+    def test_faq_changes_are_pushed(self, communicate, user):
+        """Test that creating, filling and deleting an FAQ reaches the user's sockets as small events."""
+
+        def change_faqs():
+            faq = FAQ.objects.create(user=user, title="Test FAQ", content="Test content")
+            FAQ.objects.add_question_answers(faq, [QuestionAnswer(question=f"Q{i}?", answer="A") for i in range(2)])
+            faq.delete()
+
+        async def scenario(connect):
+            communicator = await connect()
+            await sync_to_async(change_faqs)()
+            return [await communicator.receive_json_from(timeout=2) for _ in range(6)]
+
+        messages = communicate(scenario)
+
+        assert [message["type"] for message in messages] == [
+            "faq.created",
+            "statistics.changed",
+            "faq.question_answers_added",
+            "statistics.changed",
+            "faq.deleted",
+            "statistics.changed",
+        ]
+        assert messages[0]["faq"]["title"] == "Test FAQ"
+        assert "content" not in messages[0]["faq"]
+        assert messages[2]["count"] == 2
+        assert [(message["totalFaqs"], message["totalQuestions"]) for message in messages[1::2]] == [
+            (1, 0),
+            (0, 2),
+            (-1, -2),
+        ]
+
+    def test_events_are_per_user_and_committed(self, communicate, user):
+        """Test that sockets only hear about their user's FAQs, once the change is committed."""
+        other = get_user_model().objects.create_user(email="other@mail.com", password="testpass")
+
+        def change_faqs():
+            FAQ.objects.create(user=other, title="Other FAQ", content="Test content")
+            try:
+                with transaction.atomic():
+                    FAQ.objects.create(user=user, title="Rolled back", content="Test content")
+                    raise ValueError
+            except ValueError:
+                pass
+            FAQ.objects.create(user=user, title="Committed", content="Test content")
+
+        async def scenario(connect):
+            communicator = await connect()
+            await sync_to_async(change_faqs)()
+            return await communicator.receive_json_from(timeout=2)
+
+        assert communicate(scenario)["faq"]["title"] == "Committed"
+
+
+@pytest.mark.django_db(transaction=True)
+class TestHeartbeat:
+    def test_silent_client_is_pinged_then_closed(self, communicate, settings):
+        """Test that a client that never answers the ping is disconnected."""
+        settings.FAQ_WS_HEARTBEAT_INTERVAL = 0.1
+        settings.FAQ_WS_HEARTBEAT_TIMEOUT = 0.1
+        settings.FAQ_WS_IDLE_TICK = 0.02
+
+        async def scenario(connect):
+            communicator = await connect()
+            ping = await communicator.receive_json_from(timeout=2)
+            error = await communicator.receive_json_from(timeout=2)
+            closed = await communicator.receive_output(timeout=2)
+            return ping, error, closed
+
+        ping, error, closed = communicate(scenario)
+
+        assert ping == {"type": "ping"}
+        assert error["type"] == "error"
+        assert closed["type"] == "websocket.close"
+
+    def test_pong_keeps_the_socket_open(self, communicate, settings):
+        """Test that answering pings keeps a quiet socket open."""
+        settings.FAQ_WS_HEARTBEAT_INTERVAL = 0.1
+        settings.FAQ_WS_HEARTBEAT_TIMEOUT = 0.1
+        settings.FAQ_WS_IDLE_TICK = 0.02
+
+        async def scenario(connect):
+            communicator = await connect()
+            for _ in range(3):
+                assert await communicator.receive_json_from(timeout=2) == {"type": "ping"}
+                await communicator.send_json_to({"type": "pong"})
+            await communicator.send_json_to({"type": "stop"})
+            return await communicator.receive_json_from(timeout=2)
+
+        assert communicate(scenario) == {"type": "status", "status": "stopped"}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAdmission:
+    def test_rejected_generation_gets_retry_hint(self, communicate, fake_llm, settings):
+        """Test that a generation turned away gets an error frame telling when to retry, and no FAQ."""
+        settings.FAQ_ADMISSION_USER_BURST = 1
+        settings.FAQ_ADMISSION_USER_RATE = 0.25
+
+        async def scenario(connect):
+            communicator = await connect()
+            await communicator.send_json_to({"request_id": "a", "text": "Some text", "num_questions": 1})
+            first = await receive_until(communicator, is_final)
+            await communicator.send_json_to({"request_id": "b", "text": "Other text", "num_questions": 1})
+            second = await receive_until(communicator, lambda message: message.get("requestId") == "b")
+            return generation_messages(first), second[-1]
+
+        first, rejection = communicate(scenario)
+
+        assert first[0]["status"] == "started"
+        assert first[0]["estimatedWait"] == 0
+        assert first[-1]["status"] == "complete"
+        assert rejection["type"] == "error"
+        assert rejection["code"] == "generation_rejected"
+        assert rejection["retryAfter"] == 4
+        assert FAQ.objects.count() == 1
+
+    def test_cached_generation_is_not_rate_limited(self, communicate, fake_llm, settings):
+        """Test that repeating a generation the cache answers is admitted past the user's allowance."""
+        settings.FAQ_ADMISSION_USER_BURST = 1
+        settings.FAQ_ADMISSION_USER_RATE = 0.25
+
+        async def scenario(connect):
+            communicator = await connect()
+            results = []
+            for request_id in ("a", "b"):
+                await communicator.send_json_to({"request_id": request_id, "text": "Some text", "num_questions": 1})
+                results.append(generation_messages(await receive_until(communicator, is_final))[-1])
+            return results
+
+        assert [message["status"] for message in communicate(scenario)] == ["complete", "complete"]
+        assert fake_llm.calls == 1
@@ -0,0 +1,43 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+
+from faq.helpers.frame_throttle import FrameThrottle
+
+
+class TestFrameThrottle:
+    def test_coalesces_updates_within_a_frame(self):
+        """Test that the first update goes out at once and only the latest of the rest follows."""
+        sent = []
+
+        async def send(value):
+            sent.append(value)
+
+        async def run():
+            throttle = FrameThrottle(send, fps=20)
+            for value in range(5):
+                await throttle.update(value)
+            snapshot = list(sent)
+            await asyncio.sleep(0.1)
+            return snapshot
+
+        assert async_to_sync(run)() == [0]
+        assert sent == [0, 4]
+
+    def test_close_drops_pending_update(self):
+        """Test that nothing is sent after close."""
+        sent = []
+
+        async def send(value):
+            sent.append(value)
+
+        async def run():
+            throttle = FrameThrottle(send, fps=20)
+            await throttle.update("first")
+            await throttle.update("second")
+            throttle.close()
+            await asyncio.sleep(0.1)
+
+        async_to_sync(run)()
+
+        assert sent == ["first"]
@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+
+from faq.helpers.faq_generator import FAQGenerator
+from faq.helpers.generation_cache import GenerationCache
+from faq.models import GenerationCacheEntry
+
+PAIRS = [
+    {"question": "What is SmartFAQ?", "answer": "A FAQ generator."},
+    {"question": "How does it work?", "answer": "It uses AI."},
+]
+
+
+def ollama_response(pairs):
+    """Build a fake ollama.chat response carrying the given pairs."""
+    content = '{"generated_faqs": [%s]}' % ", ".join(
+        '{"question": "%s", "answer": "%s"}' % (pair["question"], pair["answer"]) for pair in pairs
+    )
+    return SimpleNamespace(message=SimpleNamespace(content=content))
+
+
+@pytest.mark.django_db
+class TestGenerationCache:
+    @pytest.fixture(autouse=True)
+    def reset_stats(self):
+        GenerationCache.reset_stats()
+        yield
+        GenerationCache.reset_stats()
+
+    def test_make_key_normalizes_whitespace(self):
+        """Test that whitespace differences map to the same key."""
+        first = GenerationCache.make_key("Some   text\n here", 3, "neutral", "gemma", "v1")
+        second = GenerationCache.make_key(" Some text here ", 3, "neutral", "gemma", "v1")
+
+        assert first == second
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ("Other text", 3, "neutral", "gemma", "v1"),
+            ("Some text", 4, "neutral", "gemma", "v1"),
+            ("Some text", 3, "formal", "gemma", "v1"),
+            ("Some text", 3, "neutral", "llama3", "v1"),
+            ("Some text", 3, "neutral", "gemma", "v2"),
+        ],
+    )
+    def test_make_key_depends_on_every_parameter(self, args):
+        """Test that changing any generation parameter changes the key."""
+        assert GenerationCache.make_key("Some text", 3, "neutral", "gemma", "v1") != GenerationCache.make_key(*args)
+
+    def test_get_and_set(self):
+        """Test storing pairs and counting hits and misses."""
+        cache = GenerationCache()
+
+        assert cache.get("key") is None
+        cache.set("key", "gemma", PAIRS)
+
+        assert cache.get("key") == PAIRS
+        assert GenerationCache.stats() == {"hits": 1, "misses": 1}
+        assert GenerationCacheEntry.objects.get(key="key").hits == 1
+
+    def test_set_ignores_empty_generations(self):
+        """Test that empty results are never cached."""
+        GenerationCache().set("key", "gemma", [])
+
+        assert not GenerationCacheEntry.objects.exists()
+
+    def test_eviction_keeps_most_recent_entries(self):
+        """Test that the cache is bounded to max_entries."""
+        cache = GenerationCache(max_entries=2)
+
+        for key in ("first", "second", "third"):
+            cache.set(key, "gemma", PAIRS)
+
+        assert set(GenerationCacheEntry.objects.values_list("key", flat=True)) == {"second", "third"}
+
+
+@pytest.mark.django_db
+class TestFAQGeneratorCache:
+    @patch("ollama.Client.chat")
+    def test_generate_faqs_reuses_cached_generation(self, mock_chat):
+        """Test that identical requests only call the model once."""
+        mock_chat.return_value = ollama_response(PAIRS)
+        generator = FAQGenerator()
+
+        first = generator.generate_faqs("Some text", 2, "neutral")
+        second = generator.generate_faqs("Some text", 2, "neutral")
+
+        assert mock_chat.call_count == 1
+        assert [qa.question for qa in first] == [qa.question for qa in second]
+        assert all(a is not b for a, b in zip(first, second, strict=True))
+
+    @patch("ollama.Client.chat")
+    def test_generate_faqs_without_cache_regenerates(self, mock_chat):
+        """Test that use_cache=False forces a new generation."""
+        mock_chat.return_value = ollama_response(PAIRS)
+        generator = FAQGenerator()
+
+        generator.generate_faqs("Some text", 2, "neutral")
+        generator.generate_faqs("Some text", 2, "neutral", use_cache=False)
+
+        assert mock_chat.call_count == 2
+
+    @override_settings(FAQ_GENERATION_CACHE_ENABLED=False)
+    @patch("ollama.Client.chat")
+    def test_generate_faqs_with_cache_disabled(self, mock_chat):
+        """Test that nothing is stored when the cache is disabled."""
+        mock_chat.return_value = ollama_response(PAIRS)
+
+        FAQGenerator().generate_faqs("Some text", 2, "neutral")
+
+        assert not GenerationCacheEntry.objects.exists()
@@ -0,0 +1,103 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+
+from faq.helpers.idle_manager import IdleManager
+
+
+class Connection:
+    def __init__(self):
+        self.pings = 0
+        self.closed = None
+
+    async def send_ping(self):
+        self.pings += 1
+
+    async def close_idle(self, reason):
+        self.closed = reason
+
+
+class TestIdleManager:
+    def test_closes_idle_connections(self, settings):
+        """Test that a connection is closed once idle, and that activity pushes that back."""
+        settings.INACTIVITY_TIME_ENABLED = True
+        settings.INACTIVITY_TIME = 0.2
+        settings.FAQ_WS_HEARTBEAT_INTERVAL = 0
+        idle, busy = Connection(), Connection()
+
+        async def run():
+            manager = IdleManager(tick=0.02)
+            manager.register(idle)
+            manager.register(busy)
+            for _ in range(10):
+                await asyncio.sleep(0.05)
+                manager.activity(busy)
+            return len(manager)
+
+        assert async_to_sync(run)() == 1
+        assert idle.closed == "Connection closed due to inactivity."
+        assert busy.closed is None
+
+    def test_pings_quiet_peers_and_closes_dead_ones(self, settings):
+        """Test that quiet peers are pinged, a pong keeps them open and silence closes them."""
+        settings.INACTIVITY_TIME_ENABLED = False
+        settings.FAQ_WS_HEARTBEAT_INTERVAL = 0.1
+        settings.FAQ_WS_HEARTBEAT_TIMEOUT = 0.1
+        alive, dead = Connection(), Connection()
+
+        async def run():
+            manager = IdleManager(tick=0.02)
+            manager.register(alive)
+            manager.register(dead)
+            while dead.closed is None:
+                await asyncio.sleep(0.02)
+                if alive.pings:
+                    manager.received(alive, heartbeat=True)
+
+        async_to_sync(run)()
+
+        assert alive.pings >= 1
+        assert alive.closed is None
+        assert dead.pings == 1
+        assert dead.closed == "Connection closed: no heartbeat from client."
+
+    def test_register_right_after_last_unregister(self, settings):
+        """Test that a connection registered before the cancelled timer task unwound is still watched."""
+        settings.INACTIVITY_TIME_ENABLED = True
+        settings.INACTIVITY_TIME = 0.1
+        settings.FAQ_WS_HEARTBEAT_INTERVAL = 0
+        first, second = Connection(), Connection()
+
+        async def run():
+            manager = IdleManager(tick=0.02)
+            manager.register(first)
+            await asyncio.sleep(0)
+            manager.unregister(first)
+            manager.register(second)
+            for _ in range(50):
+                if second.closed is not None:
+                    break
+                await asyncio.sleep(0.02)
+
+        async_to_sync(run)()
+
+        assert second.closed == "Connection closed due to inactivity."
+
+    def test_heartbeats_are_not_activity(self, settings):
+        """Test that a peer answering pings is still closed when idle."""
+        settings.INACTIVITY_TIME_ENABLED = True
+        settings.INACTIVITY_TIME = 0.3
+        settings.FAQ_WS_HEARTBEAT_INTERVAL = 0.05
+        settings.FAQ_WS_HEARTBEAT_TIMEOUT = 0.1
+        connection = Connection()
+
+        async def run():
+            manager = IdleManager(tick=0.02)
+            manager.register(connection)
+            while connection.closed is None:
+                await asyncio.sleep(0.02)
+                manager.received(connection, heartbeat=True)
+
+        async_to_sync(run)()
+
+        assert connection.closed == "Connection closed due to inactivity."
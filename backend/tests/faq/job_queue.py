@@ -0,0 +1,150 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from auths.models import User
+from faq.exceptions import GenerationBusyException
+from faq.helpers.job_queue import JobQueue
+from faq.models import FAQ, GenerationJob, QuestionAnswer
+
+
+def fake_generate_faq(text, number_of_faqs=5, tone="neutral", **kwargs):
+    return [QuestionAnswer(question=f"Question {i}?", answer="Answer") for i in range(number_of_faqs)]
+
+
+@pytest.fixture
+def job(user):
+    return JobQueue.enqueue(user, "Some content", 2, "formal")
+
+
+@pytest.mark.django_db
+class TestJobQueue:
+    def test_claim_next_marks_oldest_job_running(self, user):
+        """Test that jobs are claimed in FIFO order."""
+        first = JobQueue.enqueue(user, "First", 2, "neutral")
+        JobQueue.enqueue(user, "Second", 2, "neutral")
+
+        claimed = JobQueue.claim_next()
+
+        assert claimed.id == first.id
+        assert claimed.status == GenerationJob.RUNNING
+        assert claimed.attempts == 1
+        assert claimed.heartbeat_at is not None
+
+    def test_claim_next_empty_queue(self):
+        """Test that an empty queue returns None."""
+        assert JobQueue.claim_next() is None
+
+    @patch("faq.helpers.job_queue.generate_faq", side_effect=fake_generate_faq)
+    def test_run_success(self, _mock_generate, job):
+        """Test that a successful run creates the FAQ with its QAs."""
+        JobQueue.run(JobQueue.claim_next())
+
+        job.refresh_from_db()
+        assert job.status == GenerationJob.SUCCEEDED
+        assert job.faq.tone == "formal"
+        assert job.faq.generated_faqs.count() == 2
+
+    @patch("faq.helpers.job_queue.generate_faq", side_effect=Exception("Ollama is down"))
+    def test_run_failure(self, _mock_generate, job):
+        """Test that failures are recorded on the job."""
+        JobQueue.run(JobQueue.claim_next())
+
+        job.refresh_from_db()
+        assert job.status == GenerationJob.FAILED
+        assert job.error == "Ollama is down"
+        assert not FAQ.objects.exists()
+
+    @patch("faq.helpers.job_queue.generate_faq", side_effect=GenerationBusyException())
+    def test_run_requeues_when_llm_busy(self, _mock_generate, job):
+        """Test that a full LLM queue puts the job back without using up an attempt, and not at once."""
+        JobQueue.run(JobQueue.claim_next())
+
+        job.refresh_from_db()
+        assert job.status == GenerationJob.PENDING
+        assert job.attempts == 0
+        assert job.run_after > timezone.now()
+        assert JobQueue.claim_next() is None
+
+        GenerationJob.objects.update(run_after=timezone.now())
+        assert JobQueue.claim_next().id == job.id
+
+    def test_requeue_stale(self, job, settings):
+        """Test that jobs abandoned by a dead worker go back to the queue."""
+        settings.FAQ_JOB_MAX_ATTEMPTS = 2
+        JobQueue.claim_next()
+        stale_time = timezone.now() - timedelta(seconds=settings.FAQ_JOB_STALE_SECONDS + 1)
+        GenerationJob.objects.update(heartbeat_at=stale_time)
+
+        assert JobQueue.requeue_stale() == 1
+        job.refresh_from_db()
+        assert job.status == GenerationJob.PENDING
+
+        JobQueue.claim_next()
+        GenerationJob.objects.update(heartbeat_at=stale_time)
+        assert JobQueue.requeue_stale() == 0
+        job.refresh_from_db()
+        assert job.status == GenerationJob.FAILED
+
+
+@pytest.mark.django_db(transaction=True)
+@patch("faq.helpers.job_queue.generate_faq", side_effect=fake_generate_faq)
+def test_worker_processes_queue(_mock_generate, user):
+    """Test that the worker command drains the queue."""
+    for i in range(3):
+        JobQueue.enqueue(user, f"Content {i}", 1, "neutral")
+
+    call_command("faq_worker", "--once", "--concurrency", "2")
+
+    assert set(GenerationJob.objects.values_list("status", flat=True)) == {GenerationJob.SUCCEEDED}
+    assert FAQ.objects.count() == 3
+
+
+@pytest.mark.django_db
+class TestGenerationJobAPI:
+    def test_create_async_returns_job(self, user, authenticated_client):
+        """Test that ?mode=async queues a job and returns 202 without generating."""
+        payload = {"content": "content", "tone": "formal", "number_of_faqs": 2}
+
+        with patch("faq.views.generate_faq") as mock_generate:
+            response = authenticated_client.post(reverse("faq-list") + "?mode=async", payload, format="json")
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["status"] == GenerationJob.PENDING
+        assert response["Location"] == reverse("faq-job-detail", kwargs={"pk": response.data["id"]})
+        mock_generate.assert_not_called()
+        assert GenerationJob.objects.get(id=response.data["id"]).user == user
+
+    def test_create_async_validates_payload(self, authenticated_client):
+        """Test that invalid payloads are rejected before queueing."""
+        response = authenticated_client.post(
+            reverse("faq-list") + "?mode=async", {"content": "content", "number_of_faqs": 50}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not GenerationJob.objects.exists()
+
+    @patch("faq.helpers.job_queue.generate_faq", side_effect=fake_generate_faq)
+    def test_job_detail_includes_result(self, _mock_generate, job, authenticated_client):
+        """Test polling a finished job returns the generated FAQ."""
+        JobQueue.run(JobQueue.claim_next())
+
+        response = authenticated_client.get(reverse("faq-job-detail", kwargs={"pk": job.id}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == GenerationJob.SUCCEEDED
+        assert len(response.data["faq"]["generated_faqs"]) == 2
+
+    def test_job_detail_of_other_user(self, job, api_client):
+        """Test that users cannot see each other's jobs."""
+        other_user = User.objects.create_user(email="other@test.com", password="testpass123")
+        api_client.force_authenticate(user=other_user)
+
+        response = api_client.get(reverse("faq-job-detail", kwargs={"pk": job.id}))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
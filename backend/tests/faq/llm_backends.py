@@ -0,0 +1,143 @@
+import asyncio
+import json
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from faq.helpers.async_faq_generator import FAQGenerator as AsyncFAQGenerator
+from faq.helpers.faq_generator import FAQGenerator
+from faq.helpers.llm_backends import FakeBackend, LLMBackendError, OllamaBackend, get_backend
+
+MESSAGES = [{"role": "user", "content": "Generate 3 frequently asked questions about: Some text"}]
+
+
+def collect(backend, messages=MESSAGES):
+    async def run():
+        return [piece async for piece in backend.astream(messages)]
+
+    return asyncio.run(run())
+
+
+class TestFakeBackend:
+    def test_output_is_deterministic(self):
+        """Test that the same prompt always gets the same answer and the requested count."""
+        first = json.loads(FakeBackend().chat(MESSAGES))
+        second = json.loads(FakeBackend().chat(MESSAGES))
+
+        assert first == second
+        assert len(first["generated_faqs"]) == 3
+
+    def test_different_prompts_get_different_questions(self):
+        """Test that chunks of one document do not collapse into duplicates."""
+        other = [{"role": "user", "content": "Generate 3 frequently asked questions about: Other text"}]
+
+        assert FakeBackend().chat(MESSAGES) != FakeBackend().chat(other)
+
+    def test_configured_question_answers(self):
+        """Test that fixed pairs are returned as given."""
+        pairs = [{"question": "What is SmartFAQ?", "answer": "A FAQ generator."}]
+
+        assert json.loads(FakeBackend(question_answers=pairs).chat(MESSAGES)) == {"generated_faqs": pairs}
+
+    def test_stream_matches_chat(self):
+        """Test that streamed tokens join up to the full response."""
+        backend = FakeBackend()
+
+        pieces = collect(backend)
+
+        assert len(pieces) > 1
+        assert "".join(pieces) == backend.chat(MESSAGES)
+
+    def test_latency(self):
+        """Test time to first token and token rate."""
+        backend = FakeBackend(tokens_per_second=1000, time_to_first_token=0.05)
+        tokens = len(collect(FakeBackend()))
+
+        start = time.perf_counter()
+        backend.chat(MESSAGES)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed >= 0.05 + (tokens - 1) / 1000
+
+    def test_error_rate(self):
+        """Test that injected errors follow the seeded error rate."""
+
+        def outcomes(backend):
+            results = []
+            for _ in range(20):
+                try:
+                    backend.chat(MESSAGES)
+                    results.append(True)
+                except LLMBackendError:
+                    results.append(False)
+            return results
+
+        first = outcomes(FakeBackend(error_rate=0.5, seed=1))
+
+        assert True in first and False in first
+        assert outcomes(FakeBackend(error_rate=0.5, seed=1)) == first
+
+    def test_fail_after_tokens(self):
+        """Test that a stream can be broken part way through."""
+        with pytest.raises(LLMBackendError):
+            collect(FakeBackend(fail_after_tokens=3))
+
+
+class TestBackendSelection:
+    def test_default_is_ollama(self, settings):
+        """Test that Ollama is used unless configured otherwise."""
+        settings.OLLAMA_MODEL = "gemma"
+
+        backend = get_backend()
+
+        assert isinstance(backend, OllamaBackend)
+        assert backend.model_name == "gemma"
+
+    def test_backend_from_settings(self, settings):
+        """Test that the backend and its options come from LLM_BACKEND."""
+        settings.LLM_BACKEND = {
+            "BACKEND": "faq.helpers.llm_backends.FakeBackend",
+            "OPTIONS": {"model": "fake-small", "time_to_first_token": 0.01},
+        }
+
+        backend = get_backend()
+
+        assert isinstance(backend, FakeBackend)
+        assert backend.model_name == "fake-small"
+        assert backend.time_to_first_token == 0.01
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGenerationWithFakeBackend:
+    def test_generate_faqs(self, fake_llm):
+        """Test the sync generator end to end without a model."""
+        faqs = FAQGenerator().generate_faqs("Some text", 3, "neutral", use_cache=False)
+
+        assert len(faqs) == 3
+        assert fake_llm.calls == 1
+
+    def test_generate_faqs_stream(self, fake_llm):
+        """Test the streaming generator end to end without a model."""
+
+        async def run():
+            return [faq async for faq in AsyncFAQGenerator().generate_faqs_stream("Some text", 3, use_cache=False)]
+
+        faqs = async_to_sync(run)()
+
+        assert len(faqs) == 3
+        assert len({faq.question for faq in faqs}) == 3
+        assert fake_llm.calls == 1
+
+    def test_stream_error_is_raised(self, settings):
+        """Test that a broken stream surfaces as an error."""
+        settings.LLM_BACKEND = {
+            "BACKEND": "faq.helpers.llm_backends.FakeBackend",
+            "OPTIONS": {"fail_after_tokens": 20},
+        }
+
+        async def run():
+            return [faq async for faq in AsyncFAQGenerator().generate_faqs_stream("Some text", 3, use_cache=False)]
+
+        with pytest.raises(LLMBackendError):
+            async_to_sync(run)()
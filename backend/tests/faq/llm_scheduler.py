@@ -0,0 +1,144 @@
+import asyncio
+import threading
+
+import pytest
+
+from faq.helpers.llm_scheduler import LLMScheduler, Priority, SchedulerQueueFull
+
+
+def run_waiters(scheduler, waiters):
+    """Queue (user, priority) waiters behind a held slot and return the order they were served in."""
+    served = []
+
+    async def waiter(user_key, priority):
+        async with scheduler.aslot(user_key, priority):
+            served.append((user_key, priority))
+
+    async def run():
+        async with scheduler.aslot("holder"):
+            tasks = [asyncio.create_task(waiter(*args)) for args in waiters]
+            # Let every waiter reach the queue before the slot is released
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    return served
+
+
+class TestLLMScheduler:
+    def test_limits_in_flight(self):
+        """Test that no more than max_in_flight holders run at once."""
+        scheduler = LLMScheduler(max_in_flight=2, max_queue=10)
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal running, peak
+            with scheduler.slot("user"):
+                with lock:
+                    running += 1
+                    peak = max(peak, running)
+                threading.Event().wait(0.01)
+                with lock:
+                    running -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == 2
+        metrics = scheduler.metrics()
+        assert metrics["in_flight"] == 0
+        assert metrics["granted"] == 6
+
+    def test_priority_order(self):
+        """Test that interactive work is served before batch and background work."""
+        scheduler = LLMScheduler(max_in_flight=1, max_queue=10)
+
+        served = run_waiters(
+            scheduler,
+            [("a", Priority.BACKGROUND), ("b", Priority.BATCH), ("c", Priority.INTERACTIVE)],
+        )
+
+        assert [priority for _user, priority in served] == [
+            Priority.INTERACTIVE,
+            Priority.BATCH,
+            Priority.BACKGROUND,
+        ]
+
+    def test_round_robin_between_users(self):
+        """Test that a user with many queued requests cannot starve another user."""
+        scheduler = LLMScheduler(max_in_flight=1, max_queue=10)
+
+        served = run_waiters(scheduler, [("a", Priority.BATCH)] * 3 + [("b", Priority.BATCH)])
+
+        assert [user for user, _priority in served] == ["a", "b", "a", "a"]
+
+    def test_rejects_when_queue_full(self):
+        """Test that waiters beyond max_queue are rejected."""
+        scheduler = LLMScheduler(max_in_flight=1, max_queue=1)
+
+        async def run():
+            async with scheduler.aslot("a"):
+                waiting = asyncio.create_task(scheduler.aslot("b").__aenter__())
+                await asyncio.sleep(0)
+                with pytest.raises(SchedulerQueueFull):
+                    async with scheduler.aslot("c"):
+                        pass
+                assert scheduler.metrics()["queue_depth"] == 1
+                waiting.cancel()
+
+        asyncio.run(run())
+
+        assert scheduler.metrics()["rejected"] == 1
+
+    def test_cancelled_waiter_leaves_queue(self):
+        """Test that cancelling a waiting coroutine frees its place and does not leak the slot."""
+        scheduler = LLMScheduler(max_in_flight=1, max_queue=10)
+
+        async def waiter():
+            async with scheduler.aslot("b"):
+                pass
+
+        async def run():
+            async with scheduler.aslot("a"):
+                task = asyncio.create_task(waiter())
+                await asyncio.sleep(0)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                assert scheduler.metrics()["queue_depth"] == 0
+
+        asyncio.run(run())
+
+        metrics = scheduler.metrics()
+        assert metrics["in_flight"] == 0
+        assert metrics["queue_depth_by_priority"] == {"interactive": 0, "batch": 0, "background": 0}
+
+    def test_estimated_wait(self):
+        """Test that the estimated wait grows with the queue and follows the measured hold time."""
+        scheduler = LLMScheduler(max_in_flight=2, max_queue=10, expected_hold=10)
+        assert scheduler.estimated_wait() == 0
+
+        async def waiter():
+            async with scheduler.aslot("c"):
+                pass
+
+        async def run():
+            async with scheduler.aslot("a"), scheduler.aslot("b"):
+                # Both slots taken: the next generation waits for one of them
+                assert scheduler.estimated_wait() == 5
+                task = asyncio.create_task(waiter())
+                await asyncio.sleep(0)
+                assert scheduler.estimated_wait() == 10
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(run())
+
+        # Measured holds replace the expected one
+        assert scheduler.metrics()["hold_seconds_mean"] < 1
+        with scheduler.slot("a"), scheduler.slot("b"):
+            assert scheduler.estimated_wait() < 1
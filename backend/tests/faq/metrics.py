@@ -0,0 +1,133 @@
+import pytest
+from asgiref.sync import async_to_sync
+
+from faq.helpers.async_faq_generator import FAQGenerator as AsyncFAQGenerator
+from faq.helpers.faq_generator import FAQGenerator
+from faq.helpers.metrics import (
+    COMPLETION_TOKENS,
+    GENERATION_DURATION,
+    PROMPT_TOKENS,
+    QUEUE_WAIT,
+    TIME_TO_FIRST_QA,
+    TIME_TO_FIRST_TOKEN,
+    Counter,
+    Histogram,
+    Registry,
+    generation_labels,
+)
+
+
+class TestRendering:
+    def test_histogram(self):
+        """Test that buckets are cumulative and end with +Inf, sum and count."""
+        registry = Registry()
+        histogram = registry.register(Histogram("latency_seconds", "Latency.", ("model",), buckets=(1, 5)))
+
+        histogram.observe(0.5, model="fake")
+        histogram.observe(3, model="fake")
+        histogram.observe(10, model="fake")
+
+        assert registry.render().splitlines() == [
+            "# HELP latency_seconds Latency.",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{model="fake",le="1"} 1',
+            'latency_seconds_bucket{model="fake",le="5"} 2',
+            'latency_seconds_bucket{model="fake",le="+Inf"} 3',
+            'latency_seconds_sum{model="fake"} 13.5',
+            'latency_seconds_count{model="fake"} 3',
+        ]
+
+    def test_counter(self):
+        """Test counter samples and label escaping."""
+        registry = Registry()
+        counter = registry.register(Counter("sent_bytes_total", "Bytes.", ("tone",)))
+
+        counter.inc(10, tone='a "quoted" tone')
+        counter.inc(5, tone='a "quoted" tone')
+
+        assert 'sent_bytes_total{tone="a \\"quoted\\" tone"} 15' in registry.render()
+
+    def test_labels_must_match(self):
+        """Test that observing with the wrong labels fails loudly."""
+        with pytest.raises(ValueError):
+            Histogram("latency_seconds", "Latency.", ("model",)).observe(1, tone="neutral")
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGenerationTelemetry:
+    def test_sync_generation(self, fake_llm):
+        """Test that a generation records its duration, queue wait and token usage."""
+        labels = generation_labels(fake_llm.model_name, "neutral", 3)
+        before = (
+            GENERATION_DURATION.count(mode="sync", status="generated", **labels),
+            QUEUE_WAIT.count(model=fake_llm.model_name, priority="batch"),
+            PROMPT_TOKENS.count(**labels),
+            COMPLETION_TOKENS.count(**labels),
+        )
+
+        FAQGenerator().generate_faqs("Some text", 3, "neutral", use_cache=False)
+
+        after = (
+            GENERATION_DURATION.count(mode="sync", status="generated", **labels),
+            QUEUE_WAIT.count(model=fake_llm.model_name, priority="batch"),
+            PROMPT_TOKENS.count(**labels),
+            COMPLETION_TOKENS.count(**labels),
+        )
+        assert [b - a for a, b in zip(before, after, strict=True)] == [1, 1, 1, 1]
+
+    def test_stream_generation(self, fake_llm):
+        """Test that a stream records time to first token and to first question/answer."""
+        labels = generation_labels(fake_llm.model_name, "friendly", 3)
+        before = (
+            TIME_TO_FIRST_TOKEN.count(**labels),
+            TIME_TO_FIRST_QA.count(**labels),
+            GENERATION_DURATION.count(mode="stream", status="generated", **labels),
+        )
+
+        async def run():
+            return [faq async for faq in AsyncFAQGenerator().generate_faqs_stream("Some text", 3, "friendly")]
+
+        async_to_sync(run)()
+
+        after = (
+            TIME_TO_FIRST_TOKEN.count(**labels),
+            TIME_TO_FIRST_QA.count(**labels),
+            GENERATION_DURATION.count(mode="stream", status="generated", **labels),
+        )
+        assert [b - a for a, b in zip(before, after, strict=True)] == [1, 1, 1]
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    def test_metrics(self, api_client, settings):
+        """Test that the registry is served in the Prometheus text format to a scraper holding the token."""
+        settings.FAQ_METRICS_TOKEN = "scrape-token"
+        response = api_client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-token")
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE faq_generation_duration_seconds histogram" in response.content.decode()
+
+    def test_metrics_for_staff(self, client, user):
+        """Test that a staff session can read the metrics without a token."""
+        user.is_staff = True
+        user.save()
+        client.force_login(user)
+
+        assert client.get("/metrics").status_code == 200
+
+    @pytest.mark.parametrize("authorization", [None, "Bearer wrong-token", "Bearer "])
+    def test_metrics_rejected(self, api_client, settings, authorization):
+        """Test that requests without the token or a staff session get a 401."""
+        settings.FAQ_METRICS_TOKEN = "scrape-token"
+        headers = {"HTTP_AUTHORIZATION": authorization} if authorization else {}
+        response = api_client.get("/metrics", **headers)
+
+        assert response.status_code == 401
+        assert "faq_generation_duration_seconds" not in response.content.decode()
+
+    def test_metrics_for_non_staff(self, client, user):
+        """Test that a signed in user who is not staff cannot read the metrics."""
+        client.force_login(user)
+
+        assert client.get("/metrics").status_code == 401
@@ -0,0 +1,51 @@
+import importlib
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+from faq.models import FAQ, QuestionAnswer
+
+BEFORE = [("faq", "0010_questionanswer_faq")]
+
+
+def migrate(targets=None):
+    """Migrate to the targets, or to the latest migrations when none are given."""
+    executor = MigrationExecutor(connection)
+    targets = targets or executor.loader.graph.leaf_nodes()
+    executor.migrate(targets)
+    return executor.loader.project_state(targets).apps
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLinkQuestionAnswersMigration:
+    def test_links_question_answers(self, user, monkeypatch):
+        """Test that the migration keeps the order of the links, copies shared QAs and drops unlinked ones."""
+        # Batches of one FAQ, so a shared question/answer is taken in an earlier batch
+        monkeypatch.setattr(importlib.import_module("faq.migrations.0011_link_question_answers"), "BATCH_SIZE", 1)
+        apps = migrate(BEFORE)
+        try:
+            OldFAQ = apps.get_model("faq", "FAQ")
+            OldQuestionAnswer = apps.get_model("faq", "QuestionAnswer")
+            first = OldFAQ.objects.create(user_id=user.id, title="First", content="Content")
+            second = OldFAQ.objects.create(user_id=user.id, title="Second", content="Content")
+            one, two, shared, _ = [
+                OldQuestionAnswer.objects.create(question=question, answer="A.")
+                for question in ("One?", "Two?", "Shared?", "Orphan?")
+            ]
+            first.generated_faqs.add(two)
+            first.generated_faqs.add(one)
+            first.generated_faqs.add(shared)
+            second.generated_faqs.add(shared)
+        finally:
+            migrate()
+
+        assert list(FAQ.objects.get(title="First").generated_faqs.values_list("position", "question")) == [
+            (0, "Two?"),
+            (1, "One?"),
+            (2, "Shared?"),
+        ]
+        assert list(FAQ.objects.get(title="Second").generated_faqs.values_list("position", "question")) == [
+            (0, "Shared?")
+        ]
+        assert not QuestionAnswer.objects.filter(question="Orphan?").exists()
@@ -1,6 +1,15 @@
+import threading
+import time
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-from faq.models import FAQ, QuestionAnswer
+from faq.models import FAQ, FAQDailyRollup, QuestionAnswer
+from faq.selectors.statistics_selector import StatisticsSelector
 
 
 @pytest.mark.django_db
@@ -34,13 +43,17 @@ class TestFAQModel:
 
     def test_faq_question_answer_relationships(self, basic_faq, question_answers):
         """Test FAQ and QuestionAnswer relationships."""
-        # Add question-answers to FAQ
-        basic_faq.generated_faqs.add(*question_answers)
-
         # Verify relationships
         assert basic_faq.generated_faqs.count() == len(question_answers)
         for qa in question_answers:
             assert qa in basic_faq.generated_faqs.all()
+            assert qa.faq == basic_faq
+
+    def test_faq_delete_deletes_question_answers(self, faq_with_qa):
+        """Test that deleting an FAQ does not leave its question/answers behind."""
+        faq_with_qa.delete()
+
+        assert not QuestionAnswer.objects.exists()
 
     def test_faq_custom_creation(self, user):
         """Test FAQ creation with custom values."""
@@ -85,13 +98,176 @@ class TestQuestionAnswerModel:
 
         assert not QuestionAnswer.objects.exists()
 
-    def test_qa_bulk_create(self):
+    def test_qa_bulk_create(self, basic_faq):
         """Test bulk creation of QAs"""
         QuestionAnswer.objects.bulk_create(
             [
-                QuestionAnswer(question="What is SmartFAQ?", answer="A FAQ generator."),
-                QuestionAnswer(question="How does it work?", answer="It uses AI."),
+                QuestionAnswer(faq=basic_faq, question="What is SmartFAQ?", answer="A FAQ generator."),
+                QuestionAnswer(faq=basic_faq, question="How does it work?", answer="It uses AI."),
             ]
         )
 
         assert QuestionAnswer.objects.count() == 2
+
+
+@pytest.mark.django_db
+class TestFAQManager:
+    def test_add_question_answers(self, basic_faq, django_assert_num_queries):
+        """Test saving and linking QAs with a constant number of queries."""
+        question_answers = [QuestionAnswer(question=f"Question {i}?", answer="Answer") for i in range(10)]
+
+        # SAVEPOINT + FAQ lock + next position + QA insert + daily rollup update + RELEASE
+        with django_assert_num_queries(6):
+            created = FAQ.objects.add_question_answers(basic_faq, question_answers)
+
+        assert all(qa.pk for qa in created)
+        assert basic_faq.generated_faqs.count() == 10
+
+    def test_add_question_answers_keeps_order(self, faq_with_qa):
+        """Test that added QAs are numbered after the existing ones and read back in that order."""
+        FAQ.objects.add_question_answers(faq_with_qa, [QuestionAnswer(question="Third?", answer="Answer")])
+
+        assert list(faq_with_qa.generated_faqs.values_list("position", "question")) == [
+            (0, "What is SmartFAQ?"),
+            (1, "How does it work?"),
+            (2, "Third?"),
+        ]
+
+    def test_bulk_add_question_answers(self, user):
+        """Test linking QAs to several FAQs at once."""
+        faqs = [FAQ.objects.create(user=user, title=f"FAQ {i}", content="Content") for i in range(3)]
+
+        FAQ.objects.bulk_add_question_answers(
+            (faq, [QuestionAnswer(question=f"{faq.title}?", answer="Answer")]) for faq in faqs
+        )
+
+        for faq in faqs:
+            assert list(faq.generated_faqs.values_list("question", flat=True)) == [f"{faq.title}?"]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_concurrent_adds_get_distinct_positions(self, basic_faq):
+        """Test that an add waits for another add to the same FAQ to commit before numbering its QAs."""
+        reading = threading.Event()
+
+        def add_in_thread():
+            try:
+                reading.set()
+                FAQ.objects.add_question_answers(basic_faq, [QuestionAnswer(question="Thread?", answer="A.")])
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            FAQ.objects.add_question_answers(basic_faq, [QuestionAnswer(question="Main?", answer="A.")])
+            thread = threading.Thread(target=add_in_thread)
+            thread.start()
+            reading.wait()
+            # Let the thread read the positions while this add is not committed yet
+            time.sleep(0.2)
+        thread.join()
+
+        assert list(basic_faq.generated_faqs.values_list("position", "question")) == [(0, "Main?"), (1, "Thread?")]
+
+    def test_add_question_answers_empty(self, basic_faq, django_assert_num_queries):
+        """Test that nothing is written for an empty list."""
+        with django_assert_num_queries(0):
+            assert FAQ.objects.add_question_answers(basic_faq, []) == []
+
+
+def rollups(user):
+    return {
+        (rollup.day, rollup.tone): (rollup.faq_count, rollup.question_count)
+        for rollup in FAQDailyRollup.objects.filter(user=user)
+        if rollup.faq_count or rollup.question_count
+    }
+
+
+@pytest.mark.django_db
+class TestFAQDailyRollup:
+    def test_follows_faq_changes(self, user, basic_faq, question_answers):
+        """Test that the rollups count FAQs and question/answers as they are created, changed and deleted."""
+        today = timezone.localdate()
+        assert rollups(user) == {(today, "neutral"): (1, 2)}
+
+        FAQ.objects.add_question_answers(basic_faq, [QuestionAnswer(question="Q?", answer="A.")])
+        QuestionAnswer.objects.create(faq=basic_faq, question="Created?", answer="A.")
+        assert rollups(user) == {(today, "neutral"): (1, 4)}
+
+        basic_faq.tone = "formal"
+        basic_faq.save()
+        assert rollups(user) == {(today, "formal"): (1, 4)}
+
+        question_answers[1].delete()
+        basic_faq.generated_faqs.filter(question="Q?").delete()
+        assert rollups(user) == {(today, "formal"): (1, 2)}
+
+        # Moved to another FAQ
+        other = FAQ.objects.create(user=user, title="Other", content="Content", tone="casual")
+        question_answers[0].faq = other
+        question_answers[0].save()
+        assert rollups(user) == {(today, "formal"): (1, 1), (today, "casual"): (1, 1)}
+
+        # The question/answers deleted along with their FAQ are not subtracted twice
+        basic_faq.delete()
+        assert rollups(user) == {(today, "casual"): (1, 1)}
+
+    def test_queryset_delete_counts_once_per_faq(self, user, basic_faq):
+        """Test that deleting many question/answers of an FAQ at once costs as many queries as deleting one."""
+        FAQ.objects.add_question_answers(basic_faq, [QuestionAnswer(question=f"Q{i}?", answer="A.") for i in range(6)])
+
+        with CaptureQueriesContext(connection) as one:
+            basic_faq.generated_faqs.filter(question="Q0?").delete()
+        with CaptureQueriesContext(connection) as many:
+            basic_faq.generated_faqs.all().delete()
+
+        assert len(many) == len(one)
+        assert rollups(user) == {(timezone.localdate(), "neutral"): (1, 0)}
+
+    def test_save_without_moving_needs_no_lookup(self, basic_faq):
+        """Test that saving a loaded FAQ with the same user and tone does not read its old row."""
+        faq = FAQ.objects.get(pk=basic_faq.pk)
+        faq.title = "Renamed"
+
+        with CaptureQueriesContext(connection) as queries:
+            faq.save()
+            faq.tone = "formal"
+            faq.save()
+            faq.save()
+
+        assert sum(query["sql"].startswith("SELECT") for query in queries) == 2
+
+    def test_statistics_match_the_faqs(self, user, faq_with_qa):
+        """Test that statistics read from the rollups agree with those counted from the FAQs."""
+        FAQ.objects.create(user=user, title="Formal", content="Content", tone="formal")
+
+        from_rollups = FAQDailyRollup.objects.get_statistics(user)
+        from_faqs = FAQ.objects.get_statistics(FAQ.objects.filter(user=user))
+
+        assert from_rollups["total_faqs"] == from_faqs["total_faqs"] == 2
+        assert from_rollups["total_questions"] == from_faqs["total_questions"] == 2
+        assert from_rollups["tones"] == from_faqs["tones"] == [("formal", 1), ("neutral", 1)]
+        assert [count for _, count in from_rollups["days"]] == [count for _, count in from_faqs["days"]] == [2]
+
+    def test_rebuild_repairs_drift(self, user, faq_with_qa):
+        """Test that the rebuild command rewrites rollups changed behind the signals' back, and only those."""
+        expected = rollups(user)
+        other = type(user).objects.create_user(email="other@mail.com", password="testpass")
+        FAQ.objects.create(user=other, title="Other", content="Content")
+        FAQ.objects.filter(user=user).update(tone="casual")
+
+        out = StringIO()
+        call_command("rebuild_faq_rollups", "--dry-run", stdout=out)
+        assert "Would rebuild the rollups of 1 of" in out.getvalue()
+        assert rollups(user) == expected
+
+        call_command("rebuild_faq_rollups", stdout=StringIO())
+        assert rollups(user) == {(timezone.localdate(), "casual"): (1, 2)}
+
+    def test_populate_counts_the_faqs(self, user):
+        """Test that statistics of FAQs seeded by populate_faqs agree with those counted from the FAQs."""
+        call_command("populate_faqs", "--commit", "--email", user.email, "--quantity", "3", stdout=StringIO())
+
+        from_rollups = StatisticsSelector.get_user_statistics(user)
+        from_faqs = StatisticsSelector.get_statistics(FAQ.objects.get_user_faqs(user))
+
+        assert from_rollups["total_faqs"] == from_faqs["total_faqs"] == 3
+        assert from_rollups["total_questions"] == from_faqs["total_questions"] == 12
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from faq.helpers.persistence import QuestionAnswerBatchWriter
+from faq.models import QuestionAnswer
+
+
+def question_answers(count):
+    return [QuestionAnswer(question=f"Question {i}?", answer="Answer") for i in range(count)]
+
+
+@pytest.mark.django_db
+class TestQuestionAnswerBatchWriter:
+    def test_flushes_full_batches(self, basic_faq):
+        """Test that a batch is written as soon as it is full."""
+        flushed = []
+
+        async def on_flush(batch):
+            flushed.append([qa.pk for qa in batch])
+
+        async def run():
+            writer = QuestionAnswerBatchWriter(basic_faq, on_flush, batch_size=2, flush_interval=60)
+            for qa in question_answers(5):
+                await writer.add(qa)
+            await writer.close()
+            return writer
+
+        writer = async_to_sync(run)()
+
+        assert [len(batch) for batch in flushed] == [2, 2, 1]
+        assert basic_faq.generated_faqs.count() == 5
+        assert [qa.question for qa in writer.saved] == [f"Question {i}?" for i in range(5)]
+
+    def test_flushes_after_interval(self, basic_faq):
+        """Test that a partial batch is written once the flush interval passes."""
+        flushed = []
+
+        async def on_flush(batch):
+            flushed.append(len(batch))
+
+        async def run():
+            writer = QuestionAnswerBatchWriter(basic_faq, on_flush, batch_size=10, flush_interval=0.01)
+            await writer.add(question_answers(1)[0])
+            await asyncio.sleep(0.1)
+            assert flushed == [1]
+            await writer.close()
+
+        async_to_sync(run)()
+
+        assert flushed == [1]
+        assert basic_faq.generated_faqs.count() == 1
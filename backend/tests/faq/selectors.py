@@ -1,10 +1,10 @@
-from unittest.mock import patch
-
 import pytest
 from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from freezegun import freeze_time
 
-from faq.models import FAQ
+from faq.models import FAQ, QuestionAnswer
 from faq.selectors.statistics_selector import StatisticsSelector
 
 
@@ -59,25 +59,27 @@ class TestStatisticsSelector:
         total_faqs = sum(tone["value"] for tone in result["tones"])
         assert total_faqs == faq_queryset.count()
 
-    @patch("django.core.cache.cache.get")
-    @patch("django.core.cache.cache.set")
-    def test_get_statistics_caching(self, mock_cache_set, mock_cache_get, faq_queryset):
-        """Test that statistics are properly cached."""
-        # First call - cache miss
-        mock_cache_get.return_value = None
-        first_result = StatisticsSelector.get_statistics(faq_queryset)
-
-        # Verify cache was set
-        mock_cache_set.assert_called_once()
+    def test_get_user_statistics_caching(self, user, faq_with_qa):
+        """Test that a user's counts are computed once and then served from the cache, next to the last FAQ."""
+        first_result = StatisticsSelector.get_user_statistics(user)
 
-        # Second call - cache hit
-        mock_cache_get.return_value = first_result
-        second_result = StatisticsSelector.get_statistics(faq_queryset)
+        with CaptureQueriesContext(connection) as queries:
+            second_result = StatisticsSelector.get_user_statistics(user)
 
-        # Verify results match and cache was used
+        # The last FAQ and its question/answers
+        assert len(queries) == 2
+        assert "faq_faqdailyrollup" not in " ".join(query["sql"] for query in queries)
         assert first_result == second_result
-        assert mock_cache_get.call_count == 2
-        assert mock_cache_set.call_count == 1
+        assert second_result["total_questions"] == 2
+
+    def test_last_faq_is_not_cached(self, user, basic_faq):
+        """Test that the cache holds only the counts and an FAQ edited behind the signals' back is read fresh."""
+        StatisticsSelector.get_user_statistics(user)
+
+        assert "last_faq_created" not in cache.get(f"faq:stats:{user.id}")["stats"]
+
+        FAQ.objects.filter(pk=basic_faq.pk).update(title="Edited")
+        assert StatisticsSelector.get_user_statistics(user)["last_faq_created"].title == "Edited"
 
     @pytest.mark.parametrize("queryset_size", [1, 10])
     def test_get_statistics_with_different_sizes(self, user, queryset_size):
@@ -89,3 +91,52 @@ class TestStatisticsSelector:
 
         assert result["total_faqs"] == queryset_size
         assert result["avg_questions_per_faq"] == 0  # No questions added
+
+    def test_get_statistics_query_count_is_constant(self, user):
+        """Test that statistics take the same number of queries however many FAQs there are."""
+
+        def count_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                StatisticsSelector.get_statistics(FAQ.objects.get_user_faqs(user))
+            return len(queries)
+
+        def create_faq(title):
+            faq = FAQ.objects.create(user=user, title=title, content="Content")
+            FAQ.objects.add_question_answers(faq, [QuestionAnswer(question=f"Q{i}?", answer="A.") for i in range(2)])
+
+        create_faq("FAQ")
+        few = count_queries()
+        for i in range(10):
+            create_faq(f"FAQ {i}")
+
+        assert count_queries() == few <= 3
+
+    @freeze_time("2025-03-15 12:00")
+    def test_get_statistics_buckets(self, user):
+        """Test that FAQs are counted in the right month, day and tone."""
+        created = [
+            ("2025-03-15 08:00+00:00", "formal"),
+            ("2025-03-14 23:00+00:00", "formal"),
+            ("2025-03-01 10:00+00:00", "casual"),
+            ("2025-01-20 10:00+00:00", "neutral"),
+            # Outside both windows
+            ("2024-06-01 10:00+00:00", "neutral"),
+        ]
+        for created_at, tone in created:
+            faq = FAQ.objects.create(user=user, title="FAQ", content="Content", tone=tone)
+            FAQ.objects.add_question_answers(faq, [QuestionAnswer(question=f"Q{i}?", answer="A.") for i in range(2)])
+            FAQ.objects.filter(id=faq.id).update(created_at=created_at)
+
+        result = StatisticsSelector.get_statistics(FAQ.objects.get_user_faqs(user))
+
+        assert result["total_faqs"] == 5
+        assert result["total_questions"] == 10
+        assert result["monthly_trends"] == [{"month": "Jan", "count": 1}, {"month": "Mar", "count": 3}]
+        assert result["daily_trends"] == [{"day": "Fri", "count": 1}, {"day": "Sat", "count": 1}]
+        assert result["tones"] == [
+            {"tone": "formal", "value": 2},
+            {"tone": "neutral", "value": 2},
+            {"tone": "casual", "value": 1},
+        ]
+        assert result["last_faq_created"].created_at.isoformat().startswith("2025-03-15")
@@ -4,8 +4,10 @@ import pytest
 from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 
+from faq.models import FAQ
 from faq.serializers import (
     DailyTrendSerializer,
+    FAQListSerializer,
     FAQSerializer,
     FAQStatisticsSerializer,
     PdfSerializer,
@@ -67,6 +69,18 @@ class TestFAQSerializer:
             "updated_at",
         }
 
+    def test_faq_list_serialized(self, user, faq_with_qa):
+        """Test that the list serializer only nests question/answers when they are expanded."""
+        faq = FAQ.objects.get_user_faq_list(user, with_question_answers=True).get()
+
+        data = FAQListSerializer(faq).data
+        expanded = FAQListSerializer(faq, context={"expand": {"generated_faqs"}}).data
+
+        assert "content" not in data
+        assert data["question_count"] == 2
+        assert set(expanded) - set(data) == {"generated_faqs"}
+        assert len(expanded["generated_faqs"]) == 2
+
     def test_faq_serializer(self, user):
         data = {"user": user, "title": "Test FAQ", "content": "Test content"}
 
@@ -14,6 +14,7 @@ from faq.exceptions import (
     ScrapeException,
 )
 from faq.helpers.faq_generator import FAQGenerator
+from faq.helpers.llm_scheduler import Priority
 from faq.services import generate_faq, generate_faq_pdf, scrape_and_summarize
 
 
@@ -43,7 +44,9 @@ class TestFAQServices:
             generate_faq("Some Text")
 
         # Verify the mock was called correctly - fix the argument matching
-        mock_instance.generate_faqs.assert_called_once_with("Some Text", 5, "neutral")
+        mock_instance.generate_faqs.assert_called_once_with(
+            "Some Text", 5, "neutral", use_cache=True, user_id=None, priority=Priority.BATCH
+        )
 
         # Optional: Verify the error was logged
         assert str(exc_info.value.__cause__) == "Test error"
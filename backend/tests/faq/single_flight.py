@@ -0,0 +1,226 @@
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from faq.helpers.faq_generator import FAQGenerator
+from faq.helpers.single_flight import AsyncSingleFlight, SingleFlight, generation_flights
+
+PAIRS = [{"question": "What is SmartFAQ?", "answer": "A FAQ generator."}]
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that callers arriving while a call runs get its result."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return "result"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("key", fn)))
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=lambda: results.append(flight.do("key", fn))) for _ in range(3)]
+        for follower in followers:
+            follower.start()
+        # Followers only count as joined once they are registered on the flight
+        while flight.stats()["joined"] < 3:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join()
+
+        assert results == ["result"] * 4
+        assert len(calls) == 1
+        assert flight.stats() == {"executed": 1, "joined": 3, "in_flight": 0}
+
+    def test_exception_is_shared_and_key_released(self):
+        """Test that a failure reaches the caller and the next call runs again."""
+        flight = SingleFlight()
+
+        with pytest.raises(ValueError):
+            flight.do("key", lambda: (_ for _ in ()).throw(ValueError("boom")))
+
+        assert flight.do("key", lambda: "retried") == "retried"
+
+
+class TestAsyncSingleFlight:
+    def test_late_subscriber_replays_and_follows(self):
+        """Test that a subscriber joining mid-stream gets every item."""
+        flight = AsyncSingleFlight()
+        produced = []
+
+        async def run():
+            halfway = asyncio.Event()
+            resume = asyncio.Event()
+
+            async def produce(notify):
+                for i in range(4):
+                    if i == 2:
+                        halfway.set()
+                        await resume.wait()
+                    produced.append(i)
+                    yield i
+
+            async def collect():
+                return [item async for item in flight.subscribe("key", produce)]
+
+            first = asyncio.create_task(collect())
+            await halfway.wait()
+            second = asyncio.create_task(collect())
+            await asyncio.sleep(0)
+            resume.set()
+            return await asyncio.gather(first, second)
+
+        first, second = asyncio.run(run())
+
+        assert first == second == [0, 1, 2, 3]
+        assert produced == [0, 1, 2, 3]
+        assert flight.stats() == {"executed": 1, "joined": 1, "in_flight": 0}
+
+    def test_error_reaches_every_subscriber(self):
+        """Test that a failing producer raises in all subscribers."""
+        flight = AsyncSingleFlight()
+
+        async def produce(notify):
+            yield 1
+            raise RuntimeError("Ollama is down")
+
+        async def collect():
+            return [item async for item in flight.subscribe("key", produce)]
+
+        async def run():
+            return await asyncio.gather(collect(), collect(), return_exceptions=True)
+
+        results = asyncio.run(run())
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_producer_cancelled_when_all_subscribers_leave(self):
+        """Test that abandoning the stream stops the underlying generation."""
+        flight = AsyncSingleFlight()
+        cancelled = []
+
+        async def produce(notify):
+            try:
+                while True:
+                    yield 1
+                    await asyncio.sleep(0.001)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def run():
+            stream = flight.subscribe("key", produce)
+            await stream.__anext__()
+            await stream.aclose()
+            await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+
+        assert cancelled == [True]
+
+    def test_events_stop_reaching_a_subscriber_that_left(self):
+        """Test that when the leader stops, the producer keeps notifying the follower and no longer the leader."""
+        flight = AsyncSingleFlight()
+        events = {"leader": [], "follower": []}
+
+        def listener(name):
+            async def receive(event):
+                events[name].append(event)
+
+            return receive
+
+        async def run():
+            gates = [asyncio.Event(), asyncio.Event()]
+
+            async def produce(notify):
+                for i in range(3):
+                    if i:
+                        await gates[i - 1].wait()
+                    await notify(i)
+                    yield i
+
+            leader = flight.subscribe("key", produce, listener("leader"))
+            assert await leader.__anext__() == 0
+            follower = asyncio.create_task(_collect(flight.subscribe("key", produce, listener("follower"))))
+            await asyncio.sleep(0.01)
+            gates[0].set()
+            assert await leader.__anext__() == 1
+            await leader.aclose()
+            gates[1].set()
+            return await follower
+
+        assert asyncio.run(run()) == [0, 1, 2]
+        assert events == {"leader": [0, 1], "follower": [1, 2]}
+
+    def test_failing_listener_does_not_stop_the_stream(self):
+        """Test that a subscriber whose listener raises does not break the stream for the others."""
+        flight = AsyncSingleFlight()
+
+        async def produce(notify):
+            await notify("progress")
+            yield 1
+
+        async def broken(event):
+            raise ConnectionError("Socket closed")
+
+        async def run():
+            return await asyncio.gather(
+                _collect(flight.subscribe("key", produce, broken)), _collect(flight.subscribe("key", produce))
+            )
+
+        assert asyncio.run(run()) == [[1], [1]]
+
+
+async def _collect(stream):
+    return [item async for item in stream]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCoalescedGeneration:
+    @pytest.fixture(autouse=True)
+    def disable_cache(self, settings):
+        settings.FAQ_GENERATION_CACHE_ENABLED = False
+
+    def test_identical_requests_share_one_chat_call(self):
+        """Test that concurrent identical requests call the model once but get their own instances."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def chat(**_kwargs):
+            started.set()
+            release.wait()
+            return SimpleNamespace(message=SimpleNamespace(content=json.dumps({"generated_faqs": PAIRS})))
+
+        results = []
+
+        def generate():
+            results.append(FAQGenerator().generate_faqs("Shared text", 1, "neutral"))
+
+        joined = generation_flights.stats()["joined"]
+        with patch("ollama.Client.chat", side_effect=chat) as mock_chat:
+            threads = [threading.Thread(target=generate) for _ in range(3)]
+            threads[0].start()
+            started.wait()
+            for thread in threads[1:]:
+                thread.start()
+            while generation_flights.stats()["joined"] < joined + 2:
+                threading.Event().wait(0.001)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        assert mock_chat.call_count == 1
+        assert [[qa.question for qa in result] for result in results] == [["What is SmartFAQ?"]] * 3
+        assert len({id(result[0]) for result in results}) == 3
@@ -0,0 +1,130 @@
+import pytest
+from django.core.cache import cache
+
+from faq.helpers.statistics_cache import StatisticsCache
+from faq.models import FAQ, QuestionAnswer
+from faq.selectors.statistics_selector import StatisticsSelector
+
+
+class Computation:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"calls": self.calls}
+
+
+@pytest.fixture
+def statistics_cache():
+    cache.clear()
+    yield StatisticsCache("default", ttl=60, lock_ttl=30)
+    cache.clear()
+
+
+class TestStatisticsCache:
+    def test_computed_once_until_invalidated(self, statistics_cache):
+        """Test that statistics are computed on the first request and after each invalidation only."""
+        compute = Computation()
+
+        assert statistics_cache.get(1, compute) == {"calls": 1}
+        assert statistics_cache.get(1, compute) == {"calls": 1}
+        statistics_cache.invalidate(1)
+        assert statistics_cache.get(1, compute) == {"calls": 2}
+        # Other users are untouched
+        assert statistics_cache.get(2, compute) == {"calls": 3}
+        statistics_cache.invalidate(1)
+        assert statistics_cache.get(2, compute) == {"calls": 3}
+
+    def test_stale_statistics_served_while_recomputing(self, statistics_cache):
+        """Test that only one request recomputes stale statistics and the others get the stale ones."""
+        compute = Computation()
+        statistics_cache.get(1, compute)
+        statistics_cache.invalidate(1)
+
+        def recompute():
+            # Another request arriving meanwhile
+            assert statistics_cache.get(1, compute) == {"calls": 1}
+            return compute()
+
+        assert statistics_cache.get(1, recompute) == {"calls": 2}
+        assert statistics_cache.get(1, compute) == {"calls": 2}
+
+    def test_lost_version_makes_statistics_stale(self, statistics_cache):
+        """Test that statistics are recomputed when their version token was evicted."""
+        compute = Computation()
+        statistics_cache.get(1, compute)
+
+        cache.delete("faq:stats:version:1")
+
+        assert statistics_cache.get(1, compute) == {"calls": 2}
+
+
+@pytest.mark.django_db
+class TestStatisticsInvalidation:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    def totals(self, user):
+        statistics = StatisticsSelector.get_user_statistics(user)
+        return statistics["total_faqs"], statistics["total_questions"]
+
+    def test_faq_changes(self, user, django_capture_on_commit_callbacks):
+        """Test that creating and deleting FAQs and adding question/answers refresh the statistics."""
+        assert self.totals(user) == (0, 0)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            faq = FAQ.objects.create(user=user, title="FAQ", content="Content")
+        assert self.totals(user) == (1, 0)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            FAQ.objects.add_question_answers(faq, [QuestionAnswer(question="Q?", answer="A.")])
+        assert self.totals(user) == (1, 1)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            faq.delete()
+        assert self.totals(user) == (0, 0)
+
+    def test_question_answer_changes(self, user, basic_faq, django_capture_on_commit_callbacks):
+        """Test that creating, editing, moving and deleting question/answers refresh the statistics."""
+        assert self.totals(user) == (1, 0)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            question_answer = QuestionAnswer.objects.create(faq=basic_faq, question="Q?", answer="A.")
+        assert self.totals(user) == (1, 1)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            question_answer.question = "Edited?"
+            question_answer.save()
+        last_faq = StatisticsSelector.get_user_statistics(user)["last_faq_created"]
+        assert [qa.question for qa in last_faq.generated_faqs.all()] == ["Edited?"]
+
+        other = type(user).objects.create_user(email="other@mail.com", password="testpass")
+        with django_capture_on_commit_callbacks(execute=True):
+            question_answer.faq = FAQ.objects.create(user=other, title="Other", content="Content")
+            question_answer.save()
+        assert self.totals(user) == (1, 0)
+        assert self.totals(other) == (1, 1)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            question_answer.faq = basic_faq
+            question_answer.save()
+        assert self.totals(user) == (1, 1)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            question_answer.delete()
+        assert self.totals(user) == (1, 0)
+
+    def test_other_users_keep_their_statistics(self, user, basic_faq, django_capture_on_commit_callbacks):
+        """Test that one user's changes do not invalidate another user's statistics."""
+        other = type(user).objects.create_user(email="other@mail.com", password="testpass")
+        StatisticsSelector.get_user_statistics(other)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            FAQ.objects.create(user=user, title="FAQ", content="Content")
+
+        versions = cache.get_many([f"faq:stats:{other.id}", f"faq:stats:version:{other.id}"])
+        assert versions[f"faq:stats:{other.id}"]["version"] == versions[f"faq:stats:version:{other.id}"]
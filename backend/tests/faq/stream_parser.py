@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from faq.helpers.stream_parser import FAQStreamParser
+
+PAIRS = [
+    {"question": 'What is "SmartFAQ"?', "answer": "A tool.\nIt writes FAQs."},
+    {"question": "Does it support café menus?", "answer": "Yes \U0001f600, and back\\slashes."},
+]
+
+
+def feed_in_chunks(text, size):
+    parser = FAQStreamParser()
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(parser.feed(text[start : start + size]))
+    return items
+
+
+class TestFAQStreamParser:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 10_000])
+    @pytest.mark.parametrize("ensure_ascii", [True, False])
+    def test_parses_escapes_across_chunk_boundaries(self, chunk_size, ensure_ascii):
+        """Test that pairs survive any split point, including inside escape sequences."""
+        text = json.dumps({"generated_faqs": PAIRS}, ensure_ascii=ensure_ascii, indent=2)
+
+        items = feed_in_chunks(text, chunk_size)
+
+        assert [item.model_dump() for item in items] == PAIRS
+
+    def test_emits_each_pair_as_soon_as_it_closes(self):
+        """Test that a pair is returned by the feed call that closes it."""
+        parser = FAQStreamParser()
+
+        assert parser.feed('{"generated_faqs": [{"question": "Q1", "answer": "A1"') == []
+        assert [item.question for item in parser.feed('}, {"question": "Q2"')] == ["Q1"]
+        assert [item.question for item in parser.feed(', "answer": "A2"}]}')] == ["Q2"]
+
+    def test_accepts_any_key_order(self):
+        """Test that answer may precede question."""
+        items = FAQStreamParser().feed('{"generated_faqs": [{"answer": "A", "question": "Q"}]}')
+
+        assert items[0].question == "Q"
+        assert items[0].answer == "A"
+
+    def test_skips_incomplete_objects(self):
+        """Test that objects missing a field are dropped."""
+        items = FAQStreamParser().feed('{"generated_faqs": [{"question": "Q"}, {"question": "Q2", "answer": "A2"}]}')
+
+        assert [item.question for item in items] == ["Q2"]
+
+    def test_ignores_non_string_values(self):
+        """Test that numbers, literals and nested values do not confuse the parser."""
+        text = '{"generated_faqs": [{"rank": 1, "question": "Q", "tags": ["a", {"b": null}], "answer": "A"}]}'
+
+        items = FAQStreamParser().feed(text)
+
+        assert [(item.question, item.answer) for item in items] == [("Q", "A")]
+
+    def test_partial_shows_text_being_streamed(self):
+        """Test that the pair being streamed is exposed, including a value still being read."""
+        parser = FAQStreamParser()
+
+        assert parser.partial() is None
+        parser.feed('{"generated_faqs": [{"question": "What is')
+        assert parser.partial() == {"question": "What is"}
+        parser.feed(' it?", "answer": "A t\\u00e9')
+        assert parser.partial() == {"question": "What is it?", "answer": "A té"}
+        parser.feed('st"}')
+        assert parser.partial() is None
@@ -1,4 +1,5 @@
 import os
+from unittest.mock import patch
 
 import pytest
 from django.conf import settings
@@ -7,7 +8,9 @@ from django.urls import reverse
 from rest_framework import status
 
 from auths.models import User
+from faq.helpers.llm_scheduler import Priority
 from faq.models import FAQ
+from faq.services import generate_faq
 
 
 @pytest.mark.django_db
@@ -27,6 +30,31 @@ class TestFAQViewSet:
         assert data["results"][0]["id"] == basic_faq.id
         assert other_faq.id not in [faq["id"] for faq in data["results"]]
 
+    def test_list_is_lightweight(self, user, faq_with_qa, authenticated_client, django_assert_num_queries):
+        """Test that listed FAQs carry their number of question/answers instead of the content and QAs."""
+        for i in range(5):
+            FAQ.objects.create(user=user, title=f"FAQ {i}", content="Content " * 1000)
+
+        # Page count + page
+        with django_assert_num_queries(2):
+            response = authenticated_client.get(reverse("faq-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        listed = response.data["results"][-1]
+        assert listed["id"] == faq_with_qa.id
+        assert listed["question_count"] == 2
+        assert "content" not in listed
+        assert "generated_faqs" not in listed
+        assert [faq["question_count"] for faq in response.data["results"][:-1]] == [0] * 5
+
+    def test_list_expand_generated_faqs(self, faq_with_qa, question_answers, authenticated_client):
+        """Test that ?expand=generated_faqs nests the question/answers in generation order."""
+        response = authenticated_client.get(reverse("faq-list"), {"expand": "generated_faqs"})
+
+        listed = response.data["results"][0]
+        assert [qa["id"] for qa in listed["generated_faqs"]] == [qa.id for qa in question_answers]
+        assert "content" not in listed
+
     def test_get_queryset_unauthenticated(self, api_client):
         """Test that unauthenticated users cannot access FAQs."""
         response = api_client.get(reverse("faq-list"))
@@ -56,6 +84,41 @@ class TestFAQViewSet:
         assert response.data["number_of_faqs"] == payload["number_of_faqs"]
         assert len(response.data["generated_faqs"]) == payload["number_of_faqs"]
 
+    def test_create_faq_rejected_under_load(self, authenticated_client, fake_llm, settings):
+        """Test that a generation over the user's rate is turned away with 429 and Retry-After."""
+        settings.FAQ_ADMISSION_USER_BURST = 1
+        settings.FAQ_ADMISSION_USER_RATE = 0.1
+        payload = {"content": "content", "number_of_faqs": 1}
+
+        assert authenticated_client.post(reverse("faq-list"), payload, format="json").status_code == 201
+        response = authenticated_client.post(reverse("faq-list"), {**payload, "content": "other"}, format="json")
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response["Retry-After"] == "10"
+        assert response.data["errors"][0]["code"] == "generation_rejected"
+        assert FAQ.objects.count() == 1
+
+    def test_cached_generation_is_not_rate_limited(self, authenticated_client, fake_llm, settings):
+        """Test that repeating a generation the cache answers does not use up the user's allowance."""
+        settings.FAQ_ADMISSION_USER_BURST = 1
+        settings.FAQ_ADMISSION_USER_RATE = 0.1
+        payload = {"content": "content", "number_of_faqs": 1}
+
+        for _ in range(3):
+            assert authenticated_client.post(reverse("faq-list"), payload, format="json").status_code == 201
+        assert fake_llm.calls == 1
+
+        # Bypassing the cache calls the model, which the allowance no longer covers
+        response = authenticated_client.post(reverse("faq-list") + "?regenerate=true", payload, format="json")
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_create_faq_is_interactive(self, authenticated_client, fake_llm):
+        """Test that a synchronous create, which a client waits on, is scheduled as interactive."""
+        with patch("faq.views.generate_faq", wraps=generate_faq) as mock_generate:
+            authenticated_client.post(reverse("faq-list"), {"content": "content", "number_of_faqs": 1}, format="json")
+
+        assert mock_generate.call_args.kwargs["priority"] == Priority.INTERACTIVE
+
     def test_download_faq(self, basic_faq, authenticated_client):
         """Test downloading FAQ as pdf."""
         url = reverse("faq-download", kwargs={"pk": basic_faq.id})
@@ -122,7 +122,7 @@ export default function Dashboard() {
                                             <div>
                                                 <h3 className="text-sm font-semibold">{faq.title}</h3>
                                                 <p className="text-xs text-muted-foreground">
-                                                    {faq.generated_faqs.length} questions • Created{' '}
+                                                    {faq.question_count} questions • Created{' '}
                                                     {formatDistance(new Date(faq.created_at), new Date(), {
                                                         addSuffix: true,
                                                     })}
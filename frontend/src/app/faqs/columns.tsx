@@ -2,7 +2,7 @@ import { ColumnDef } from "@tanstack/react-table"
 import { ArrowUpDown, MoreHorizontal, Download, Edit } from "lucide-react"
 import { Button } from "@/components/ui/button"
 import Link from "next/link"
-import { FAQ } from "@/types/api"
+import { FAQListItem } from "@/types/api"
 import { toast } from "sonner"
 import {
     DropdownMenu,
@@ -35,7 +35,7 @@ const handleDownload = async (id: number) => {
     }
 };
 
-export const columns: ColumnDef<FAQ>[] = [
+export const columns: ColumnDef<FAQListItem>[] = [
     {
         accessorKey: "title",
         header: ({ column }) => {
@@ -65,7 +65,7 @@ export const columns: ColumnDef<FAQ>[] = [
         },
     },
     {
-        accessorKey: "generated_faqs",
+        accessorKey: "question_count",
         header: ({ column }) => {
             return (
                 <Button
@@ -77,7 +77,6 @@ export const columns: ColumnDef<FAQ>[] = [
                 </Button>
             )
         },
-        cell: ({ row }) => row.original.generated_faqs.length,
     },
     {
         accessorKey: "created_at",
@@ -1,6 +1,6 @@
 import { useState, useEffect, useCallback } from 'react'
 import { useInView } from 'react-intersection-observer'
-import { FAQ, PaginatedResponse } from '@/types/api'
+import { FAQListItem, PaginatedResponse } from '@/types/api'
 import { AppError } from '@/lib/errors'
 import { toast } from 'sonner'
 import { faqService } from '@/services/faqService'
@@ -19,7 +19,7 @@ export function useFAQs({
     search = '',
     ordering
 }: UseFAQsParams = {}) {
-    const { data, isLoading, error } = useQuery<PaginatedResponse<FAQ>>({
+    const { data, isLoading, error } = useQuery<PaginatedResponse<FAQListItem>>({
         queryKey: ['faqs', page, pageSize, search, ordering],
         queryFn: () => faqService.getFAQPage(page, {
             page_size: pageSize,
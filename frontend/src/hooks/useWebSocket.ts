@@ -39,6 +39,17 @@ export function useWebSocket() {
             // Do not clear socketRef here to keep the connection reference
         };
 
+        // Answer the server's heartbeat so idle but live sockets are not closed
+        ws.addEventListener("message", (event) => {
+            try {
+                if (JSON.parse(event.data).type === "ping") {
+                    ws.send(JSON.stringify({ type: "pong" }));
+                }
+            } catch {
+                // Not JSON; nothing to answer
+            }
+        });
+
         ws.onerror = (event) => {
             console.error("WebSocket error:", event);
             setError("WebSocket error occurred");
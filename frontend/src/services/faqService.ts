@@ -1,5 +1,5 @@
 import { AppError } from '@/lib/errors'
-import { FAQ, FAQStatistics, PaginatedResponse } from '@/types/api'
+import { FAQListItem, FAQStatistics, PaginatedResponse } from '@/types/api'
 
 interface FAQQueryParams {
     page_size?: number;
@@ -26,7 +26,7 @@ export const faqService = {
         return result
     },
 
-    async getFAQPage(pageNumber: number, params: FAQQueryParams = {}): Promise<PaginatedResponse<FAQ>> {
+    async getFAQPage(pageNumber: number, params: FAQQueryParams = {}): Promise<PaginatedResponse<FAQListItem>> {
         const searchParams = new URLSearchParams({
             page: pageNumber.toString(),
             ...(params.page_size && { page_size: params.page_size.toString() }),
@@ -65,6 +65,19 @@ export type FAQ = {
     updated_at: string;
 }
 
+export type FAQListItem = {
+    id: number;
+    user: number;
+    title: string;
+    tone?: string;
+    category: string;
+    number_of_faqs: number;
+    question_count: number;
+    generated_faqs?: QuestionAnswer[];
+    created_at: string;
+    updated_at: string;
+}
+
 export type FAQRequestBody = {
     content: string;
     number_of_faqs: number;
@@ -1,12 +1,30 @@
 import { FAQ } from "./api";
 
 export interface WebSocketMessage {
-    type: 'faq' | 'status' | 'error';
-    status?: 'generating' | 'complete' | 'stopped';
+    type: 'faq' | 'partial' | 'status' | 'error' | 'ping' | UserEventType;
+    status?: 'started' | 'generating' | 'progress' | 'resumed' | 'complete' | 'stopped';
     question?: string;
     answer?: string;
     id?: string;
     faqId?: string;
     message?: string;
+    // Error frames of generations turned away under load
+    code?: string;
+    retryAfter?: number;
+    estimatedWait?: number;
     faq?: FAQ;
+    requestId?: string;
+    sessionId?: string;
+    sequence?: number;
+    count?: number;
+    totalFaqs?: number;
+    totalQuestions?: number;
 }
+
+// Pushed to every socket of the user when their FAQs or statistics change
+export type UserEventType =
+    | 'faq.created'
+    | 'faq.updated'
+    | 'faq.deleted'
+    | 'faq.question_answers_added'
+    | 'statistics.changed';